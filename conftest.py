@@ -4,11 +4,80 @@ import pytest
 # I import 'os' to access environment variables (like "CI") and make environment decisions.
 import os
 
-# I import 'Path' to create and manage file paths (e.g., to robustly create the screenshots folder).
+# I import 'Path' to create and manage file paths (e.g., the folders of the failure artifacts).
 from pathlib import Path  
 
-# I import Playwright's 'expect'. This is what allows me to make verifications (asserts) and wait for elements (which makes tests stable).
-from playwright.sync_api import expect
+# I import 'warnings' to report performance budgets in warn mode (and artifacts that could not be written).
+import warnings
+
+# I import Playwright's errors (a page that is already gone when I save its artifacts).
+from playwright.sync_api import Error as PlaywrightError
+
+# I import the site facts (environment URLs) shared with the standalone tools.
+from palato_qa.site import ENVIRONMENTS
+
+# I import my pool of warm browser contexts (used by the parallel mode).
+from palato_qa.context_pool import ContextPool
+
+# I import the HAR record/replay helpers (used by '--record' and '--env=replay').
+from palato_qa import har
+
+# I import the local stand-in site (used by '--env=local').
+from palato_qa.local_site import LocalSite
+
+# I import the pre-seeded cookie consent helpers (so tests don't click the banner every time).
+from palato_qa import consent
+
+# I import my page layout helpers (header, footer, batched checklists, readiness waits), shared with the monitor.
+from palato_qa.layout import PageLayout
+
+# I import the locator-strategy cache (remembers which fallback works on each page).
+from palato_qa.strategies import CACHE_KEY as STRATEGY_CACHE_KEY, StrategyCache
+
+# I import the per-page performance metrics recorder and its JSON report.
+from palato_qa.performance import PageMetricsRecorder, PerformanceReport
+
+# I import the performance budgets (limits per page, enforced after each test).
+from palato_qa.budgets import BUDGET_MODES, PerformanceBudgetWarning, check_page, resolve_budget
+
+# I import the page-manifest cache (one navigation per URL with '--manifest').
+from palato_qa.manifest import PageCache
+
+# I import the HTTP-only tier client (static-content checks without a browser).
+from palato_qa.http_tier import HttpClient
+
+# I import the broken-link checker (run once at the end, on every link the tests saw).
+from palato_qa.links import PAGE_LINKS_JS, LinkCache, LinkCheckStage
+
+# I import the incremental mode (only re-run the browser tests of pages that changed).
+from palato_qa.incremental import INCREMENTAL_CACHE_KEY, IncrementalRun
+
+# I import the failure-artifact pipeline (screenshot, DOM and trace of failed tests, written in the background).
+from palato_qa.artifacts import ARTIFACTS_DIR, ArtifactWriter, ArtifactWriteWarning, TraceChunks, artifact_dir, safe_file_name
+
+# I import the impact map (which plugin provides which site feature, for '--changed').
+from palato_qa import impact
+
+# I import the environment x browser matrix (several '--env' and '--browser' values in one run).
+from palato_qa import matrix
+
+# I import the warm browser server helpers ('--browser-server' connects to it instead of launching a browser).
+from palato_qa import browser_server
+
+# I import the duration-aware scheduler (test order and time budget from the timing history).
+from palato_qa import scheduler
+
+# I import the network waterfall profiler (per-page requests, compared with a baseline per URL with '--waterfall').
+from palato_qa.waterfall import WATERFALL_CACHE_KEY, WATERFALL_MODES, NetworkRecorder, WaterfallReport
+
+# I import the visual snapshots (full-page captures compared with a baseline per page, with '--visual').
+from palato_qa import visual
+
+# I import the spec-driven checks (the '## Checks' sections of specs/*.md, run with '--specs').
+from palato_qa import specs
+
+# I import the resource-blocking profiles (used by '--resources' and '@pytest.mark.resources').
+from palato_qa.resources import DEFAULT_PROFILE, RESOURCE_PROFILES, ResourceBlocker
 
 
 # --- 1. My Custom PyTest Option ---
@@ -20,157 +89,1154 @@ def pytest_addoption(parser):
         "--env",
         action="store",
         default="stag",
-        help="The environment my tests should run against (example: 'stag' or 'prod')"
+        help="The environment my tests should run against (example: 'stag', 'prod', 'local' or 'replay'), or several: 'stag,prod'"
+    )
+
+    # Record every test's network traffic into 'har/' (replayed later with --env=replay).
+    parser.addoption(
+        "--record",
+        action="store_true",
+        default=False,
+        help="Record each test's traffic to a compressed HAR in 'har/' for offline replay"
+    )
+
+    # Default resource-blocking profile for tests without a 'resources' marker.
+    parser.addoption(
+        "--resources",
+        action="store",
+        default=DEFAULT_PROFILE,
+        choices=list(RESOURCE_PROFILES),
+        help="Resource-blocking profile for all tests (default: 'full', nothing blocked)"
+    )
+
+    # How the cookie consent is pre-seeded into every context.
+    parser.addoption(
+        "--consent",
+        action="store",
+        default="synthesize",
+        choices=consent.CONSENT_MODES,
+        help="Cookie consent: 'synthesize' the cookie (default), 'click' the real banner once per session, or 'off' (click it in every test)"
+    )
+
+    # The performance JSON report is written for every run unless I switch it off.
+    parser.addoption(
+        "--no-perf-report",
+        action="store_true",
+        default=False,
+        help="Don't collect page performance metrics or write 'reports/performance-<env>-<time>.json'"
+    )
+
+    # What happens when a page goes over its performance budget.
+    parser.addoption(
+        "--budget-mode",
+        action="store",
+        default="fail",
+        choices=BUDGET_MODES,
+        help="Performance budgets: 'fail' the test (default), only 'warn', or 'off'"
+    )
+
+    # Manifest mode: read-only checks grouped by URL, one page load per URL.
+    parser.addoption(
+        "--manifest",
+        action="store_true",
+        default=False,
+        help="Run the page manifest (one navigation per URL) instead of the tests it covers"
+    )
+
+    # Spec mode: the same kind of checks, generated from the specs.
+    parser.addoption(
+        "--specs",
+        action="store_true",
+        default=False,
+        help="Run the checks generated from the '## Checks' sections of specs/*.md (one navigation per URL) instead of the tests they cover"
+    )
+
+    # Which tier of checks to run: the browser tests, the fast HTTP-only checks, or both.
+    parser.addoption(
+        "--tier",
+        action="store",
+        default="browser",
+        choices=["browser", "http", "all"],
+        help="'browser' tests (default), 'http' static-content checks without a browser, or 'all'"
+    )
+
+    # Link-checking stage: every href of the visited pages is checked at the end of the run.
+    parser.addoption(
+        "--check-links",
+        action="store_true",
+        default=False,
+        help="Check every link found on the visited pages (needs the performance recorder, i.e. no --no-perf-report)"
+    )
+
+    # Links checked OK less than this ago are not checked again.
+    parser.addoption(
+        "--link-cache-ttl",
+        action="store",
+        type=float,
+        default=24,
+        help="Hours a link checked OK stays in the on-disk link cache (default: 24)"
+    )
+
+    # Incremental mode: conditional GETs first, then only the browser tests of changed (or failing) pages.
+    parser.addoption(
+        "--incremental",
+        action="store_true",
+        default=False,
+        help="Only run the browser tests whose pages changed (or that failed) since the last incremental/full run"
+    )
+
+    # Forces every test in incremental mode, and remembers the result for the next incremental run.
+    parser.addoption(
+        "--full",
+        action="store_true",
+        default=False,
+        help="Run every test and refresh the page fingerprints used by --incremental"
+    )
+
+    # Network waterfall of every page, compared with the baseline of its URL.
+    parser.addoption(
+        "--waterfall",
+        action="store",
+        default="off",
+        choices=WATERFALL_MODES,
+        help="Record the network waterfall of every page and 'diff' it with its baseline (pages without one become it), or 'update' the baselines (default: 'off')"
+    )
+
+    # Visual regression: every page is captured and compared with its baseline screenshot.
+    parser.addoption(
+        "--visual",
+        action="store",
+        default="off",
+        choices=visual.VISUAL_MODES,
+        help="Capture every page and 'compare' it with its baseline in 'snapshots/' (pages without one become it), or 'update' the baselines (default: 'off'). Needs numpy and Pillow."
+    )
+
+    # What is kept when a test fails.
+    parser.addoption(
+        "--artifacts",
+        action="store",
+        default="on-failure",
+        choices=["on-failure", "off"],
+        help="Save a screenshot, DOM snapshot and Playwright trace of failed tests to 'artifacts/' (default), or 'off'"
+    )
+
+    # Plugin-update runs: only the tests of the features the plugin provides, plus the smoke set.
+    parser.addoption(
+        "--changed",
+        action="store",
+        default=None,
+        help="Only run the tests affected by an update of these WordPress plugins (comma separated, e.g. 'contact-form-7'), plus the smoke tests"
+    )
+
+    # Test order: from the timing history (recently failed first, then longest first), or file order.
+    parser.addoption(
+        "--schedule",
+        action="store",
+        default="history",
+        choices=["history", "file"],
+        help="Order tests by their 'history' (recently failed first, then longest first; default) or in 'file' order"
+    )
+
+    # Only run the most valuable tests that fit in this much wall time.
+    parser.addoption(
+        "--time-budget",
+        action="store",
+        type=scheduler.parse_duration,
+        default=None,
+        help="Run only the most valuable tests that fit in this wall time, from the timing history (example: '60s', '5m')"
+    )
+
+    # In replay mode I warn when the recording is older than this.
+    parser.addoption(
+        "--har-max-age",
+        action="store",
+        type=float,
+        default=7,
+        help="Warn when the HAR recording used by --env=replay is older than N days (default: 7)"
+    )
+
+    # Parallel mode: one worker process (and one browser) per CPU core.
+    parser.addoption(
+        "--workers",
+        action="store",
+        default=None,
+        help="Run the suite in N worker processes, one browser each (example: '4' or 'auto'). Requires pytest-xdist."
+    )
+
+    # Connect to the warm browser server (python -m palato_qa.browser_server start) instead of launching a browser.
+    parser.addoption(
+        "--browser-server",
+        action="store_true",
+        default=False,
+        help="Use the running warm browser server (python -m palato_qa.browser_server start); launches a browser when none answers"
+    )
+
+    # How many warm contexts each browser keeps. 0 = a fresh context per test (Playwright default).
+    parser.addoption(
+        "--context-pool",
+        action="store",
+        type=int,
+        default=None,
+        help="Number of warm browser contexts kept per browser. Defaults to 1 when --workers is used, 0 otherwise."
+    )
+
+
+# --- 1.1 Parallel Mode (--workers) ---
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    """
+    I translate '--workers' into pytest-xdist's '-n' before xdist reads it.
+    Each xdist worker is its own process, so each one launches its own browser.
+    """
+    workers = config.getoption("--workers")
+
+    # Workers receive the same options as the controller, they must not fan out again.
+    if hasattr(config, "workerinput"):
+        return
+
+    # A matrix run (several environments and/or browsers) gets one worker per cell, each with its own browser.
+    if not workers and is_matrix_pool(config):
+        config.option.numprocesses = matrix.cell_count(config)
+        config.option.dist = "loadgroup"
+        return
+
+    if not workers:
+        return
+
+    if not config.pluginmanager.hasplugin("xdist"):
+        raise pytest.UsageError("--workers requires pytest-xdist (pip install pytest-xdist)")
+
+    if workers not in ("auto", "logical"):
+        try:
+            workers = int(workers)
+        except ValueError:
+            raise pytest.UsageError(f"--workers must be a number or 'auto', got '{workers}'")
+
+    config.option.numprocesses = workers
+
+    # In manifest and spec modes all the checks of a URL must run on the same worker (they share the page).
+    if config.getoption("--manifest") or config.getoption("--specs"):
+        config.option.dist = "loadgroup"
+
+
+def is_matrix_pool(config):
+    """True when the cells of a matrix run go to their own worker (several cells, pytest-xdist, no '--workers'/'-n')."""
+    return (
+        matrix.cell_count(config) > 1
+        and config.pluginmanager.hasplugin("xdist")
+        and not config.getoption("--workers")
+        and config.getoption("numprocesses", default=None) in (None, matrix.cell_count(config))
     )
 
 
+# --- 1.2 Environment x Browser Matrix ---
+def pytest_generate_tests(metafunc):
+    """With several environments ('--env=stag,prod'), every test of the site runs once per environment."""
+    envs = matrix.env_names(metafunc.config.getoption("--env"))
+    if "env_name" in metafunc.fixturenames and len(envs) > 1:
+        metafunc.parametrize("env_name", envs, scope="session", indirect=True)
+
+
+@pytest.fixture(scope="session")
+def env_name(request):
+    """The environment of this test: its matrix parameter, or the single '--env'."""
+    if hasattr(request, "param"):
+        return request.param
+    return matrix.env_names(request.config.getoption("--env"))[0]
+
+
+# --- 1.3 Spec-Driven Checks (--specs) ---
+def pytest_collect_file(file_path, parent):
+    """With '--specs', every 'specs/*.md' is collected as a module of generated checks (see palato_qa/specs.py)."""
+    if parent.config.getoption("--specs") and file_path.suffix == ".md" and file_path.parent == specs.SPECS_DIR:
+        return specs.SpecModule.from_parent(parent, path=file_path)
+
+
 # --- 2. My Base URL Fixture ---
 @pytest.fixture(scope="session")
-def base_url(request):
+def base_url(request, env_name):
     """This fixture will read my '--env' option from the terminal and return the correct URL"""
     
-    # I read the environment value the user passed (e.g., "stag")
-    env = request.config.getoption("--env")
+    # I read the environment of this test (e.g., "stag"; one of the '--env' values in a matrix run)
+    env = env_name
+
+    # Local mode: a stand-in copy of the site served from this machine (no real form submissions).
+    if env == "local":
+        return request.getfixturevalue("local_site").url
+
+    # Replay mode: the recorded pages keep their original URLs, so I reuse the recorded base URL.
+    if env == "replay":
+        manifest = har.read_manifest()
+        if manifest is None:
+            raise ValueError("No HAR recording found in 'har/'. Record one first: pytest --env=stag --record")
+        return manifest["base_url"]
     
-    # I define my URLs in a dictionary
-    urls = {
-        "stag": "https://stag.palatodigital.com",
-        "prod": "https://palatodigital.com"
-    }
+    # My URLs are defined in a dictionary (palato_qa/site.py)
+    urls = ENVIRONMENTS
     
     # I check if the environment is valid. This ensures robustness.
     if env not in urls:
-        raise ValueError(f"Environment '{env}' unknown. Valid: {list(urls.keys())}")
+        raise ValueError(f"Environment '{env}' unknown. Valid: {list(urls.keys()) + ['local', 'replay']}")
+
+    # When recording, I remember which site the HARs belong to.
+    if request.config.getoption("--record"):
+        har.write_manifest(env, urls[env])
     
     # I return the correct URL to the test.
     return urls[env]
 
 
-# --- 3. Browser Context Arguments (Viewport) ---
+# --- 2.1 Local Stand-in Site ---
 @pytest.fixture(scope="session")
-def browser_context_args():
+def local_site():
+    """
+    Starts the local mirror of the site (multi-threaded HTTP server on a free port) for the whole session.
+    'local_site.submissions' lists the Contact Form 7 payloads it received.
     """
-    I override the default browser context arguments to set the viewport size.
-    This ensures that the desktop menu is visible and avoids 'hamburger menu' issues.
+    site = LocalSite().start()
+    yield site
+    site.stop()
+
+
+# --- 2.2 End of Run Summary ---
+def pytest_configure(config):
+    """I register my custom markers so PyTest doesn't warn about them, and the run reports."""
+    config.addinivalue_line(
+        "markers",
+        "resources(profile): resource-blocking profile for this test (" + ", ".join(RESOURCE_PROFILES) + ")"
+    )
+    config.addinivalue_line("markers", "http_tier: static-content check without a browser (runs with --tier=http or --tier=all)")
+    config.addinivalue_line("markers", "page_manifest: check of the page manifest (only runs with --manifest)")
+    config.addinivalue_line("markers", "covered_by_manifest: test whose checks are in the page manifest (skipped with --manifest)")
+    config.addinivalue_line("markers", "spec_check: check generated from specs/*.md (only runs with --specs)")
+    config.addinivalue_line("markers", "features(*names): site features this test covers (selected by --changed, see palato_qa/impact.py)")
+    config.addinivalue_line("markers", "smoke: always-on test, also run by --changed")
+    config.addinivalue_line(
+        "markers",
+        "visual(mask=[selectors], regions=[(x, y, width, height)], max_diff_ratio=0.001): dynamic content to ignore in the visual snapshots of this test"
+    )
+    config.addinivalue_line(
+        "markers",
+        "budget(**limits): performance budget for the pages of this test (e.g. transfer_bytes=2_000_000, lcp_ms=2500)"
+    )
+    config.addinivalue_line("markers", "http_status(code): HTTP status the shared page of this check answers with (default: 200)")
+
+    # The visual snapshots hook into the performance recorder (it sees every page) and need NumPy and Pillow.
+    if config.getoption("--visual") != "off":
+        if not visual.is_available():
+            raise pytest.UsageError("--visual requires numpy and Pillow (pip install numpy pillow)")
+        if config.getoption("--no-perf-report"):
+            raise pytest.UsageError("--visual needs the performance recorder, it can't be combined with --no-perf-report")
+
+    # Both modes replace the same tests, so only one of them runs.
+    if config.getoption("--manifest") and config.getoption("--specs"):
+        raise pytest.UsageError("--manifest and --specs replace the same tests, use one of them")
+
+    # Record and replay work on one recording, so they take a single environment.
+    envs = matrix.env_names(config.getoption("--env"))
+    if len(envs) > 1 and (config.getoption("--record") or "replay" in envs):
+        raise pytest.UsageError("--record and --env=replay take a single environment")
+
+    # The performance report is built by the main process only (parallel workers send it their results).
+    if not config.getoption("--no-perf-report") and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(
+            PerformanceReport("+".join(envs), ",".join(matrix.browser_names(config))), "palato-performance-report"
+        )
+
+    # A matrix run gets one merged report with the results of every cell.
+    if matrix.cell_count(config) > 1 and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(matrix.MatrixReport(), "palato-matrix-report")
+
+    # The link-checking stage also runs on the main process, so links are de-duplicated across workers.
+    # Without the PyTest cache, every link is checked again (nothing is kept on disk).
+    if config.getoption("--check-links") and not hasattr(config, "workerinput"):
+        cache_path = config.cache.mkdir("palato-links") / "links.json" if getattr(config, "cache", None) is not None else None
+        cache = LinkCache(cache_path, config.getoption("--link-cache-ttl") * 3600)
+        config.pluginmanager.register(LinkCheckStage(cache), "palato-link-check")
+
+    # The waterfalls are compared with their baselines on the main process (one baseline set per environment).
+    # The baselines are in the PyTest cache: without it, the waterfalls are recorded but not compared.
+    if config.getoption("--waterfall") != "off" and not hasattr(config, "workerinput"):
+        cache = getattr(config, "cache", None)
+        config.pluginmanager.register(
+            WaterfallReport(
+                config.getoption("--waterfall"),
+                lambda env: cache.get(f"{WATERFALL_CACHE_KEY}/{env}", {}) if cache is not None else {},
+                lambda env, baselines: cache.set(f"{WATERFALL_CACHE_KEY}/{env}", baselines) if cache is not None else None,
+            ),
+            "palato-waterfall",
+        )
+
+    # The timing history is recorded on the main process, which sees the reports of every worker
+    # (and kept in the PyTest cache, so not with '-p no:cacheprovider').
+    if not hasattr(config, "workerinput") and getattr(config, "cache", None) is not None:
+        history = scheduler.TimingHistory(config.cache.get(scheduler.DURATIONS_CACHE_KEY, {}))
+        recorder = scheduler.DurationRecorder(history, lambda entries: config.cache.set(scheduler.DURATIONS_CACHE_KEY, entries))
+        config.pluginmanager.register(recorder, "palato-duration-recorder")
+
+    # The incremental plan is made once, on the main process, and sent to the parallel workers.
+    if (config.getoption("--incremental") or config.getoption("--full")) and not hasattr(config, "workerinput"):
+        env = config.getoption("--env")
+        if any(name not in ENVIRONMENTS for name in envs):
+            raise pytest.UsageError(f"--incremental/--full need real environments ({', '.join(ENVIRONMENTS)}), got '{env}'")
+        if getattr(config, "cache", None) is None:
+            raise pytest.UsageError("--incremental/--full keep their state in the PyTest cache, which '-p no:cacheprovider' disables")
+        cache_key = f"{INCREMENTAL_CACHE_KEY}/{env}"
+        incremental = IncrementalRun(
+            config.cache.get(cache_key, {}),
+            HttpClient(),
+            lambda state: config.cache.set(cache_key, state),
+            full=config.getoption("--full"),
+        )
+        incremental.plan()
+        config.pluginmanager.register(incremental, "palato-incremental")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
     """
-    return {
-        "viewport": {
-            "width": 1920,
-            "height": 1080,
-        },
+    I select the tests of the requested tier and mode:
+    - '--tier=http' keeps only the HTTP-only checks, '--tier=browser' (default) leaves them out.
+    - Manifest mode swaps tests: with '--manifest' I deselect the tests the manifest covers,
+      without it I deselect the manifest checks (so nothing is checked twice).
+    - Spec mode is the same swap, with the checks generated from the specs ('--specs').
+    - '--incremental' deselects the tests that passed last time and whose pages didn't change.
+    - '--changed=<plugin>' keeps only the tests of the features the plugin provides, and the smoke tests.
+    Then I order them (and apply the time budget) from the timing history.
+    I run first, so pytest-xdist sees the matrix cell groups I add.
+    """
+    tier = config.getoption("--tier")
+    if config.getoption("--manifest"):
+        skipped_markers = ["covered_by_manifest", "spec_check"]
+    elif config.getoption("--specs"):
+        skipped_markers = ["covered_by_manifest", "page_manifest"]
+    else:
+        skipped_markers = ["page_manifest", "spec_check"]
+    unchanged = incremental_skip(config)
+    changed_features = impact_features(config)
+
+    def is_selected(item):
+        if item.nodeid in unchanged:
+            return False
+        if changed_features is not None and not impact.is_affected(item, changed_features):
+            return False
+        is_http = item.get_closest_marker("http_tier") is not None
+        if tier == "http":
+            return is_http
+        if tier == "browser" and is_http:
+            return False
+        return not any(item.get_closest_marker(marker) for marker in skipped_markers)
+
+    selected = [item for item in items if is_selected(item)]
+    deselected = [item for item in items if not is_selected(item)]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+    tag_matrix_cells(config, items)
+    schedule_items(config, items)
+
+
+def tag_matrix_cells(config, items):
+    """
+    In a matrix run, every test carries its cell ('prod/firefox') to the merged report,
+    and in the per-cell process pool the cell is also its xdist group (one worker, one browser per cell).
+    """
+    if matrix.cell_count(config) <= 1:
+        return
+    group_by_cell = is_matrix_pool(config) and hasattr(config, "workerinput")
+    for item in items:
+        cell = matrix.cell_of(item)
+        if cell is None:
+            continue
+        item.user_properties.append(("cell", cell))
+        if group_by_cell:
+            item.add_marker(pytest.mark.xdist_group(cell))
+
+
+def schedule_items(config, items):
+    """
+    I order the tests from the timing history and apply '--time-budget'.
+    Parallel workers read the same history, so they all end up with the same list (pytest-xdist requires it).
+    Without the PyTest cache there is no history: the tests keep their file order.
+    """
+    if getattr(config, "cache", None) is None:
+        return
+    history = scheduler.TimingHistory(config.cache.get(scheduler.DURATIONS_CACHE_KEY, {}))
+
+    budget = config.getoption("--time-budget")
+    if budget:
+        workers = getattr(config, "workerinput", {}).get("workercount", 1)
+        kept, dropped = scheduler.fit_budget(items, history, budget, workers)
+        if dropped:
+            config.hook.pytest_deselected(items=dropped)
+            items[:] = kept
+
+    if config.getoption("--schedule") == "history":
+        items[:] = scheduler.order(items, history)
+
+
+def impact_features(config):
+    """The features '--changed' selects, or None to run everything (no '--changed', or a plugin I don't know)."""
+    changed = config.getoption("--changed")
+    if not changed:
+        return None
+    plugins, unknown = impact.resolve_plugins(changed)
+    if unknown or not plugins:
+        return None
+    return impact.affected_features(plugins)
+
+
+def incremental_skip(config):
+    """The node ids '--incremental' leaves out: planned here, or received from the main process on a worker."""
+    if not config.getoption("--incremental"):
+        return set()
+    if hasattr(config, "workerinput"):
+        return set(config.workerinput.get("palato_incremental_skip", []))
+    return config.pluginmanager.get_plugin("palato-incremental").unchanged_tests
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """I print my extra reports after the PyTest summary."""
+    warn_stale_recording(terminalreporter, config)
+    report_blocked_resources(terminalreporter)
+    report_avoided_timeouts(terminalreporter)
+    report_manifest_navigations(terminalreporter)
+    report_failure_artifacts(terminalreporter)
+    report_visual_snapshots(terminalreporter)
+    report_impact(terminalreporter, config)
+
+
+def warn_stale_recording(terminalreporter, config):
+    """At the end of a replay run, I warn if the recording is old (it may no longer match the live site)."""
+    if config.getoption("--env") != "replay":
+        return
+
+    manifest = har.read_manifest()
+    if manifest is None:
+        return
+
+    age = har.recording_age_days(manifest)
+    if age > config.getoption("--har-max-age"):
+        terminalreporter.write_line(
+            f"[ ⚠️ Replay ] The HAR recording is {age:.0f} days old. "
+            f"Check it with 'python -m palato_qa.har --check' or record again with '--record'.",
+            yellow=True,
+        )
+
+
+def report_blocked_resources(terminalreporter):
+    """I list how many requests (and roughly how many bytes) each test saved with its resource profile."""
+    lines = []
+    total_requests, total_bytes = 0, 0
+
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            if getattr(report, "when", None) != "teardown":
+                continue
+            summary = dict(report.user_properties).get("resources")
+            if not summary or not summary["blocked_requests"]:
+                continue
+
+            total_requests += summary["blocked_requests"]
+            total_bytes += summary["bytes_saved"]
+            lines.append(
+                f"  {report.nodeid} [{summary['profile']}]: "
+                f"{summary['blocked_requests']} requests blocked, ~{summary['bytes_saved'] / 1024:.0f} KB saved"
+            )
+
+    if lines:
+        terminalreporter.section("blocked resources")
+        for line in lines:
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"[ 🚫 Resources ] Total: {total_requests} requests blocked, ~{total_bytes / 1024:.0f} KB saved")
+
+
+def report_avoided_timeouts(terminalreporter):
+    """I sum up the fallback timeouts skipped thanks to the locator-strategy cache."""
+    total_ms = 0
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            if getattr(report, "when", None) == "teardown":
+                total_ms += dict(report.user_properties).get("avoided_timeout_ms", 0)
+
+    if total_ms:
+        terminalreporter.write_line(f"[ ⚡ Locators ] The strategy cache avoided {total_ms / 1000:.1f} s of fallback timeouts.")
+
+
+def report_manifest_navigations(terminalreporter):
+    """In manifest mode, I show how many checks ran against how many page loads."""
+    checks, navigations = 0, 0
+    for report in terminalreporter.stats.get("passed", []) + terminalreporter.stats.get("failed", []):
+        if report.when == "call" and "::test_page_check[" in report.nodeid:
+            checks += 1
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            if getattr(report, "when", None) == "teardown":
+                navigations += dict(report.user_properties).get("manifest_navigation", 0)
+
+    if navigations:
+        terminalreporter.write_line(f"[ 🧭 Manifest ] {checks} checks ran against {navigations} page loads.")
+
+
+def report_impact(terminalreporter, config):
+    """With '--changed', I show which features were tested and which specs to review."""
+    changed = config.getoption("--changed")
+    if not changed:
+        return
+    features = impact_features(config)
+    if features is None:
+        terminalreporter.write_line(
+            f"[ 🎯 Impact ] Unknown plugin in '{changed}': ran the whole suite. Map it in palato_qa/impact.py."
+        )
+        return
+    terminalreporter.write_line(f"[ 🎯 Impact ] '{changed}' affects: {', '.join(features)} (plus the smoke tests)")
+    terminalreporter.write_line(f"[ 🎯 Impact ] Specs to review: {', '.join(impact.affected_specs(features))}")
+
+
+def report_failure_artifacts(terminalreporter):
+    """I list where the artifacts of the failed tests were saved."""
+    folders = {}
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            paths = dict(getattr(report, "user_properties", [])).get("artifacts")
+            if getattr(report, "when", None) == "teardown" and paths:
+                folders[report.nodeid] = str(Path(paths[0]).parent)
+    if not folders:
+        return
+
+    terminalreporter.write_line(f"[ 📸 Artifacts ] Screenshot, DOM and trace of {len(folders)} failed tests in '{ARTIFACTS_DIR}/':")
+    for nodeid, folder in folders.items():
+        terminalreporter.write_line(f"  {nodeid} -> {folder}")
+
+
+# --- 3. Browser Context Arguments (Viewport + Cookie Consent) ---
+# I set the viewport size so the desktop menu is visible and avoid 'hamburger menu' issues.
+VIEWPORT = {
+    "width": 1920,
+    "height": 1080,
+}
+
+
+@pytest.fixture(scope="session")
+def consent_storage_state(request, pytestconfig, base_url, tmp_path_factory):
+    """
+    I build the "cookies accepted" state once per session and save it to disk (PyTest cache).
+    Without the PyTest cache ('-p no:cacheprovider') it goes to a temporary directory of this run.
+    Returns the path of the storage state file, or None with '--consent=off'.
+    """
+    mode = pytestconfig.getoption("--consent")
+    if mode == "off":
+        return None
+
+    cache = getattr(pytestconfig, "cache", None)
+    state_dir = Path(cache.mkdir("palato-consent")) if cache is not None else tmp_path_factory.mktemp("palato-consent")
+    state_path = state_dir / f"{safe_file_name(base_url)}-{mode}.json"
+
+    # A clicked consent is reused between runs while the cookie is valid. Synthesizing is free, so I always redo it.
+    state = consent.load_state(state_path) if mode == "click" else None
+    if state is None:
+        if mode == "click":
+            state = consent.click_consent_state(request.getfixturevalue("browser"), {"viewport": VIEWPORT}, base_url)
+        else:
+            state = consent.synthesize_consent_state(base_url)
+        consent.save_state(state_path, state)
+
+    return str(state_path)
+
+
+@pytest.fixture(scope="session")
+def browser_context_args(consent_storage_state):
+    """
+    I override the default browser context arguments to set the viewport size
+    and to load the pre-seeded cookie consent into every new context.
+    """
+    args = {
+        "viewport": VIEWPORT,
     }
+    if consent_storage_state:
+        args["storage_state"] = consent_storage_state
+    return args
+
+
+# --- 3.0 Warm Browser Server ---
+@pytest.fixture(scope="session")
+def connect_options(pytestconfig, browser_name):
+    """
+    I override pytest-playwright's 'connect_options'. With '--browser-server' and a server listening
+    on the browser's port, the 'browser' fixture connects to it over its websocket endpoint;
+    otherwise (None) it launches a browser as usual.
+    """
+    if not pytestconfig.getoption("--browser-server"):
+        return None
 
+    port = browser_server.DEFAULT_PORTS.get(browser_name)
+    if port is None or not browser_server.is_listening(port):
+        warnings.warn(f"No warm {browser_name} server on port {port}, launching a browser instead")
+        return None
+    return {"ws_endpoint": browser_server.ws_endpoint(browser_name), "timeout": 10_000}
 
-# --- 3. Automatic Screenshot Hook on Failure ---
-# This hook is called by PyTest after the execution of each test.
-@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+
+# --- 3.1 Warm Context Pool ---
+@pytest.fixture(scope="session")
+def context_pool(pytestconfig, browser, browser_context_args):
+    """
+    One pool per browser (so one per worker process).
+    The contexts are created once with my 'browser_context_args' (viewport) and reused by every test.
+    """
+    size = pytestconfig.getoption("--context-pool")
+    if size is None:
+        size = 1 if pytestconfig.getoption("--workers") else 0
+
+    # HARs are attached to a context and written when it closes, so record/replay needs fresh contexts.
+    if pytestconfig.getoption("--record") or pytestconfig.getoption("--env") == "replay":
+        size = 0
+
+    if size <= 0:
+        yield None
+        return
+
+    pool = ContextPool(browser, browser_context_args, size)
+    pool.warm()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def context(request, context_pool):
+    """
+    I override pytest-playwright's 'context' fixture.
+    With a pool I borrow a warm context and give it back (reset) after the test,
+    otherwise I keep the default behaviour of one fresh context per test.
+    """
+    if context_pool is None:
+        fresh_context = request.getfixturevalue("new_context")()
+        har_path = har.HAR_DIR / f"{safe_file_name(request.node.nodeid)}.zip"
+
+        if request.config.getoption("--record"):
+            har.record(fresh_context, har_path)
+        elif request.config.getoption("--env") == "replay":
+            if not har_path.exists():
+                pytest.skip(f"No HAR recording for this test ({har_path}). Run with --record first.")
+            har.replay(fresh_context, har_path)
+
+        yield fresh_context
+        return
+
+    pooled_context = context_pool.acquire()
+    yield pooled_context
+    context_pool.release(pooled_context)
+
+
+# --- 3.2 Resource-Blocking Profiles ---
+@pytest.fixture(scope="session")
+def resource_sizes(pytestconfig):
+    """
+    URL -> size in bytes, remembered between runs (in the PyTest cache, or for this run only without it).
+    I use it to estimate how many bytes a blocked request would have cost.
+    """
+    cache = getattr(pytestconfig, "cache", None)
+    sizes = cache.get("palato/resource-sizes", {}) if cache is not None else {}
+    yield sizes
+    if cache is not None:
+        cache.set("palato/resource-sizes", sizes)
+
+
+@pytest.fixture(autouse=True)
+def resource_blocking(request, pytestconfig):
+    """
+    I apply the resource profile to every browser test: the 'resources' marker wins,
+    otherwise the '--resources' option is used. Tests without a browser are left alone.
+    """
+    if "context" not in request.fixturenames:
+        yield None
+        return
+
+    marker = request.node.get_closest_marker("resources")
+    profile = marker.args[0] if marker else pytestconfig.getoption("--resources")
+
+    browser_context = request.getfixturevalue("context")
+    blocker = ResourceBlocker(profile, request.getfixturevalue("base_url"), request.getfixturevalue("resource_sizes"))
+    blocker.install(browser_context)
+
+    yield blocker
+
+    blocker.uninstall(browser_context)
+    request.node.user_properties.append(("resources", blocker.summary()))
+
+
+# --- 3.3 Page Performance Metrics ---
+# The recorder of the pages a test loaded, kept on the test item for the budget checks after its body.
+PAGE_RECORDER = pytest.StashKey[PageMetricsRecorder]()
+# The HTTP status of the shared page, kept on the manifest check that loaded it.
+PAGE_STATUS = pytest.StashKey[int]()
+
+
+@pytest.fixture(autouse=True)
+def page_metrics(request, pytestconfig):
+    """
+    I record the performance metrics of every page a browser test loads (after each 'page.goto',
+    plus the page the test ends on) and the duration of its steps.
+    Tests can time their own steps with: 'with page_metrics.step("Fill form"): ...'
+    """
+    if pytestconfig.getoption("--no-perf-report") or "page" not in request.fixturenames:
+        yield None
+        return
+
+    recorder = PageMetricsRecorder(request.getfixturevalue("page"))
+    recorder.install()
+    request.node.stash[PAGE_RECORDER] = recorder
+    links = collect_links(recorder, pytestconfig)
+    comparisons = collect_visual_snapshots(recorder, request, pytestconfig)
+
+    yield recorder
+
+    recorder.finish()
+    request.node.user_properties.append(("performance", recorder.result()))
+    if links:
+        request.node.user_properties.append(("links", sorted(links)))
+    if comparisons:
+        request.node.user_properties.append(("visual", [comparison.to_dict() for comparison in comparisons]))
+
+
+def collect_links(recorder, pytestconfig):
+    """With '--check-links', I gather the hrefs of every page the recorder sees. Returns the (growing) set."""
+    links = set()
+    if pytestconfig.getoption("--check-links"):
+        recorder.on_collect.append(lambda page: links.update(page.eval_on_selector_all("a[href]", PAGE_LINKS_JS)))
+    return links
+
+
+# --- 3.4 Performance Budgets ---
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """
+    After the test body passes, I check every page it loaded against its budget (when it declares one)
+    and, with '--visual', against its baseline screenshot.
+    Going over budget fails the test (or only warns with '--budget-mode=warn').
+    With shared pages, the item that loaded the page is the one checked, and it also checks the page's HTTP status.
+    """
+    result = yield
+
+    check_status(item)
+    recorder = item.stash.get(PAGE_RECORDER, None)
+    if recorder is None:
+        return result
+
+    recorder.finish()
+    check_budgets(item, recorder)
+    check_visual_snapshots(item)
+    return result
+
+
+def check_status(item):
+    if PAGE_STATUS not in item.stash:
+        return
+    marker = item.get_closest_marker("http_status")
+    expected = marker.args[0] if marker else 200
+    status = item.stash[PAGE_STATUS]
+    if status != expected:
+        path = item.callspec.params["path"]
+        raise AssertionError(f"{path}: HTTP {status if status is not None else 'no response'} (expected {expected})")
+
+
+def check_budgets(item, recorder):
+    mode = item.config.getoption("--budget-mode")
+    if mode == "off":
+        return
+
+    budget = resolve_budget(item)
+    if not budget:
+        return
+    violations = [violation for metrics in recorder.pages for violation in check_page(metrics, budget)]
+
+    if violations:
+        message = "Performance budget exceeded:\n  - " + "\n  - ".join(violations)
+        if mode == "fail":
+            raise AssertionError(message)
+        warnings.warn(PerformanceBudgetWarning(message))
+
+
+# --- 3.5 Page Manifest (Shared Pages) ---
+@pytest.fixture(scope="session")
+def page_cache(browser, browser_context_args, base_url, pytestconfig, resource_sizes):
+    """
+    One context for all the manifest checks of this worker, and the page of the URL being checked.
+    The '--resources' profile applies to the whole context.
+    """
+    manifest_context = browser.new_context(**browser_context_args)
+    ResourceBlocker(pytestconfig.getoption("--resources"), base_url, resource_sizes).install(manifest_context)
+
+    cache = PageCache(manifest_context)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def shared_page(request, page_cache, base_url, pytestconfig):
+    """
+    The page of this manifest check's URL: loaded by the first check of the URL, reused by the others.
+    The check that loads it also carries the page's HTTP status and performance metrics (and its budget and visual checks).
+    """
+    path = request.node.callspec.params["path"]
+    recorders = []
+    link_sets = []
+    comparison_lists = []
+    network_recorders = []
+
+    def prepare(new_page):
+        if pytestconfig.getoption("--waterfall") != "off":
+            network_recorder = NetworkRecorder(new_page.context)
+            network_recorder.install()
+            network_recorders.append(network_recorder)
+        if not pytestconfig.getoption("--no-perf-report"):
+            recorder = PageMetricsRecorder(new_page)
+            recorder.install()
+            link_sets.append(collect_links(recorder, pytestconfig))
+            comparison_lists.append(collect_visual_snapshots(recorder, request, pytestconfig))
+            recorders.append(recorder)
+
+    shared, loaded_now = page_cache.get(f"{base_url}{path}", prepare)
+    if loaded_now:
+        request.node.stash[PAGE_STATUS] = page_cache.status
+    if loaded_now and recorders:
+        request.node.stash[PAGE_RECORDER] = recorders[0]
+
+    yield shared
+
+    if loaded_now:
+        request.node.user_properties.append(("manifest_navigation", 1))
+        if recorders:
+            request.node.user_properties.append(("performance", recorders[0].result()))
+        if link_sets and link_sets[0]:
+            request.node.user_properties.append(("links", sorted(link_sets[0])))
+        if comparison_lists and comparison_lists[0]:
+            request.node.user_properties.append(("visual", [comparison.to_dict() for comparison in comparison_lists[0]]))
+        # The shared context's requests are recorded until the check that loaded the page ends.
+        for network_recorder in network_recorders:
+            network_recorder.finish()
+            network_recorder.uninstall()
+            request.node.user_properties.append(
+                ("waterfall", {"env": request.getfixturevalue("env_name"), "pages": network_recorder.result()})
+            )
+
+
+@pytest.fixture
+def shared_layout(shared_page, locator_strategies):
+    """A PageLayout for the shared page (cookie consent is pre-seeded in the context)."""
+    return PageLayout(shared_page, locator_strategies)
+
+
+# --- 3.6 HTTP-only Tier ---
+@pytest.fixture(scope="session")
+def http_client():
+    """One pooled 'requests' Session (with a thread pool) for the HTTP-only checks."""
+    client = HttpClient()
+    yield client
+    client.close()
+
+
+# --- 3.7 Incremental Health Check ---
+@pytest.fixture(autouse=True)
+def visited_urls(request, pytestconfig):
+    """
+    With '--incremental' or '--full', I note the URLs each browser test loads,
+    so the next incremental run knows which tests a changed page affects.
+    """
+    if not (pytestconfig.getoption("--incremental") or pytestconfig.getoption("--full")):
+        yield None
+        return
+
+    urls = set()
+    if "page" in request.fixturenames:
+        page = request.getfixturevalue("page")
+        page.on("load", lambda loaded: urls.add(loaded.url))
+    if "shared_page" in request.fixturenames:
+        urls.add(request.getfixturevalue("shared_page").url)
+
+    yield urls
+
+    request.node.user_properties.append(("visited_urls", sorted(urls)))
+
+
+# --- 3.8 Failure Artifacts ---
+# I keep the report of each phase on the test item, so the artifact fixture knows in its teardown whether the test failed.
+PHASE_REPORTS = pytest.StashKey[dict]()
+
+
+@pytest.hookimpl(wrapper=True)
 def pytest_runtest_makereport(item, call):
-    
-    # 1. I get the result of the test execution (passed, failed, skipped)
-    outcome = yield
-    report = outcome.get_result()
+    report = yield
+    item.stash.setdefault(PHASE_REPORTS, {})[report.when] = report
+    return report
 
-    # 2. I check if the test failed and if it was during the main execution step
-    if report.when == "call" and report.failed:
-        try:
-            # 3. I access the 'page' fixture from the failing test item
-            page = item.funcargs["page"]
-
-            # 4. I define the path and filename
-            # I ensure the 'screenshots' directory exists (using pathlib for robustness)
-            screenshots_dir = Path("screenshots")
-            screenshots_dir.mkdir(exist_ok=True)
-            
-            # I create a unique filename using the test name
-            screenshot_path = screenshots_dir / f"{item.name}.png"
-            
-            # 5. I take the screenshot
-            # I use the Playwright 'page.screenshot' method directly
-            page.screenshot(path=str(screenshot_path))
-            
-            # I print a message to the terminal for confirmation
-            print(f"\n[ 📸 Screenshot ] Saved screenshot to: {screenshot_path}")
-
-        except Exception as e:
-            # I handle the error gracefully if the page or browser wasn't available
-            print(f"\n[ ❌ Screenshot Error ] Could not take screenshot: {e}")
+
+@pytest.fixture(scope="session")
+def artifact_writer():
+    """
+    The background thread that writes the artifacts of this process (waits for the last files at the end).
+    Files it could not write are reported as a warning, so a missing screenshot or DOM doesn't go unnoticed.
+    """
+    writer = ArtifactWriter()
+    yield writer
+    writer.close()
+    if writer.errors:
+        warnings.warn(ArtifactWriteWarning(
+            f"{len(writer.errors)} failure artifact(s) could not be written:\n  - " + "\n  - ".join(writer.errors)
+        ))
 
 
-# --- 4. Page Layout Fixture (DRY Refactor) ---
-class PageLayout:
+@pytest.fixture(scope="session")
+def trace_chunks():
+    return TraceChunks()
+
+
+@pytest.fixture(autouse=True)
+def failure_artifacts(request, pytestconfig):
     """
-    Encapsulates common page interactions to avoid code duplication (DRY).
-    Includes methods for footer verification, cookie acceptance, and header checks.
+    I trace every browser test in cheap mode and, only when it fails, keep its trace,
+    a full-page screenshot and the DOM under 'artifacts/<env>/<browser>/<test>/'.
+    Passing tests only pay for the (dropped) trace chunk.
     """
-    def __init__(self, page):
-        self.page = page
+    page_fixture = "page" if "page" in request.fixturenames else "shared_page"
+    if pytestconfig.getoption("--artifacts") == "off" or page_fixture not in request.fixturenames:
+        yield None
+        return
 
-    def accept_cookies(self):
-        """
-        Checks for the cookie banner and accepts it if visible.
-        This prevents random timeouts and elements being covered.
-        """
-        try:
-            # "Aceite tudo" button
-            cookie_button = self.page.get_by_role("button", name="Aceite tudo")
-            if cookie_button.is_visible(timeout=2000):
-                cookie_button.click()
-                expect(cookie_button).to_be_hidden()
-        except Exception:
-            # Ignore if not found or already accepted
-            pass
-
-    def verify_footer(self):
-        """
-        Robustly verifies that the footer is visible.
-        1. Scrolls to the bottom using JS (handles lazy loading).
-        2. Asserts #footer-outer is visible.
-        3. Fallback: Checks for 'Palato Digital' text if wrapper has 0 height.
-        """
-        self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        
-        # Primary check: The container
-        footer = self.page.locator("#footer-outer")
-        
-        # We try to assert visibility. 
-        # Known issue: On some pages (Privacy/Cookie Policy), #footer-outer has 0 height.
-        # We handle this by checking opacity/display or falling back to content check.
-        try:
-            expect(footer).to_be_visible(timeout=3000)
-        except AssertionError:
-            # Fallback for 0-height containers: Check for Copyright Text or other common footer elements
-            # We try multiple common footer strings to be robust
-            try:
-                expect(self.page.get_by_text("Palato Digital").last).to_be_visible(timeout=2000)
-            except AssertionError:
-                 expect(self.page.get_by_text("Todos os direitos reservados", exact=False).first).to_be_visible(timeout=2000)
-
-    def verify_header(self):
-        """
-        Verifies that the header elements are visible.
-        1. Checks for Logo (via ID or Alt Text).
-        2. Checks for Menu navigation links.
-        """
-        # 1. Logo
-        # Tries checking by alt text first (accessibility best practice), falls back to ID/Class
-        try:
-            expect(self.page.get_by_alt_text("Palato Digital").first).to_be_visible()
-        except AssertionError:
-            expect(self.page.locator("#logo").or_(self.page.locator(".custom-logo-link"))).to_be_visible()
+    page = request.getfixturevalue(page_fixture)
+    writer = request.getfixturevalue("artifact_writer")
+    folder = artifact_dir(request.getfixturevalue("env_name"), request.getfixturevalue("browser_name"), request.node.nodeid)
+
+    # Shared pages outlive the test, and pytest-playwright's own '--tracing' already traces the context.
+    chunks = None
+    if page_fixture == "page" and pytestconfig.getoption("--tracing", default="off") == "off":
+        chunks = request.getfixturevalue("trace_chunks")
+        chunks.begin(page.context, title=request.node.nodeid)
+
+    yield folder
+
+    reports = request.node.stash.get(PHASE_REPORTS, {})
+    failed = any(report.failed for report in reports.values())
+    if not failed:
+        if chunks:
+            chunks.end(page.context)
+        return
+
+    saved = []
+    try:
+        saved.append(writer.submit(folder / "screenshot.png", page.screenshot(full_page=True, timeout=5000)))
+        saved.append(writer.submit(folder / "dom.html", page.content().encode("utf-8"), compress=True))
+    except PlaywrightError:
+        # The page (or browser) is already gone: the trace still shows what happened.
+        pass
+    if chunks:
+        chunks.end(page.context, folder / "trace.zip")
+        saved.append(folder / "trace.zip")
+    request.node.user_properties.append(("artifacts", [str(path) for path in saved]))
+
+
+# --- 3.9 Network Waterfall ---
+@pytest.fixture(autouse=True)
+def network_waterfall(request, pytestconfig):
+    """
+    With '--waterfall', I record every request of a browser test (timing, size, type, domain, cache status),
+    grouped by page. The main process compares each page with its baseline at the end of the run.
+    Shared pages ('--manifest', '--specs') are recorded by the 'shared_page' fixture.
+    """
+    if pytestconfig.getoption("--waterfall") == "off" or "page" not in request.fixturenames:
+        yield None
+        return
+
+    recorder = NetworkRecorder(request.getfixturevalue("page").context)
+    recorder.install()
 
-        # 2. Main Navigation Links
-        # We check for key pages to ensure the menu is rendered
-        nav_pages = ["Serviços", "Sobre", "Vamos falar"]
-        for name in nav_pages:
-             expect(self.page.get_by_role("link", name=name, exact=False).first).to_be_visible()
+    yield recorder
+
+    recorder.finish()
+    recorder.uninstall()
+    request.node.user_properties.append(("waterfall", {"env": request.getfixturevalue("env_name"), "pages": recorder.result()}))
+
+
+# --- 3.10 Visual Snapshots ---
+VISUAL_COMPARISONS = pytest.StashKey[list]()
+
+
+@pytest.fixture(scope="session")
+def visual_snapshots(pytestconfig, env_name, browser_name):
+    """The baselines of this environment and browser ('snapshots/<env>/<browser>/'), decoded once per worker."""
+    return visual.SnapshotStore(env_name, browser_name, update=pytestconfig.getoption("--visual") == "update")
+
+
+def collect_visual_snapshots(recorder, request, pytestconfig):
+    """With '--visual', I compare every page the recorder sees with its baseline. Returns the (growing) list of comparisons."""
+    comparisons = []
+    if pytestconfig.getoption("--visual") != "off":
+        marker = request.node.get_closest_marker("visual")
+        options = marker.kwargs if marker else {}
+        masks = visual.DEFAULT_MASKS + list(options.get("mask", []))
+        regions = options.get("regions", ())
+        max_ratio = options.get("max_diff_ratio", visual.MAX_DIFF_RATIO)
+        snapshots = request.getfixturevalue("visual_snapshots")
+        recorder.on_collect.append(lambda page: comparisons.append(snapshots.check(page, masks, regions, max_ratio)))
+    request.node.stash[VISUAL_COMPARISONS] = comparisons
+    return comparisons
+
+
+def check_visual_snapshots(item):
+    """A page that changed more than its allowed ratio fails the test (the diff image is in 'reports/visual/')."""
+    changed = [comparison for comparison in item.stash.get(VISUAL_COMPARISONS, []) if not comparison.passed]
+    if changed:
+        raise AssertionError("Visual snapshot changed:\n  - " + "\n  - ".join(comparison.describe() for comparison in changed))
+
+
+def report_visual_snapshots(terminalreporter):
+    """I count the pages compared with their baseline, the new baselines and the pages that changed."""
+    counts = {"same": 0, "new": 0, "changed": 0}
+    changed = set()
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            if getattr(report, "when", None) != "teardown":
+                continue
+            for comparison in dict(report.user_properties).get("visual", []):
+                counts[comparison["status"]] += 1
+                if not comparison["passed"]:
+                    changed.add(comparison["diff"])
+    if not any(counts.values()):
+        return
+
+    terminalreporter.write_line(
+        f"[ 🖼️ Visual ] {counts['same'] + counts['changed']} snapshots compared, "
+        f"{counts['new']} new baselines, {len(changed)} changed pages"
+    )
+    for path in sorted(filter(None, changed)):
+        terminalreporter.write_line(f"  diff: {path}", red=True)
+
+
+# --- 4. Page Layout Fixture (DRY Refactor) ---
+# The PageLayout class itself is in palato_qa/layout.py (the monitor uses it too).
+@pytest.fixture(scope="session")
+def locator_strategies(pytestconfig):
+    """The locator-strategy cache, loaded from and saved to the PyTest cache (for this run only without it)."""
+    cache = getattr(pytestconfig, "cache", None)
+    strategies = StrategyCache(cache.get(STRATEGY_CACHE_KEY, {}) if cache is not None else {})
+    yield strategies
+    if cache is not None:
+        strategies.save(cache)
 
 
 @pytest.fixture
-def layout(page):
+def layout(request, page, pytestconfig, locator_strategies):
     """
     Returns a PageLayout instance.
-    Automatically attempts to accept cookies when instantiated.
+    The cookie consent is pre-seeded in the context (see 'browser_context_args'),
+    so I only click the banner here when that is switched off with '--consent=off'.
     """
-    page_layout = PageLayout(page)
-    page_layout.accept_cookies()
-    return page_layout
\ No newline at end of file
+    page_layout = PageLayout(page, locator_strategies)
+    if pytestconfig.getoption("--consent") == "off":
+        page_layout.accept_cookies()
+
+    yield page_layout
+
+    # I report how much fallback timeout the strategy cache saved in this test.
+    if page_layout.avoided_timeout_ms:
+        request.node.user_properties.append(("avoided_timeout_ms", page_layout.avoided_timeout_ms))
\ No newline at end of file
@@ -0,0 +1,6 @@
+"""
+Support code for the Palato Digital QA framework.
+
+The fixtures and hooks live in 'conftest.py'. The heavier machinery behind them
+lives here, so the conftest stays a readable index of what the suite does.
+"""
@@ -0,0 +1,103 @@
+"""
+Failure artifacts: full-page screenshot, DOM snapshot and Playwright trace of failed tests.
+
+Passing tests should cost (almost) nothing, failing ones should get the full context:
+  - tracing runs in its cheap mode (DOM snapshots, no screencast frames, no sources)
+    and is split in one chunk per test; a passing test's chunk is simply dropped,
+    a failing test's chunk is saved as 'trace.zip';
+  - pooled contexts keep tracing on across tests ('tracing.start' once, then chunks);
+  - the teardown of a failing test only grabs the bytes (screenshot, HTML); one
+    background thread compresses and writes them, so the next test starts right away
+    (the HTML is gzipped; PNG and trace zip are compressed already).
+
+Files are keyed by environment, browser and test node id:
+
+    artifacts/<env>/<browser>/<node id as a file name>/{screenshot.png, dom.html.gz, trace.zip}
+
+Open a trace with: playwright show-trace artifacts/.../trace.zip
+"""
+
+import gzip
+import queue
+import re
+import threading
+import weakref
+from pathlib import Path
+
+ARTIFACTS_DIR = Path("artifacts")
+
+# Cheap tracing: DOM snapshots are enough to replay the test, screencast frames are not needed.
+TRACE_OPTIONS = {"screenshots": False, "snapshots": True, "sources": False}
+
+
+def safe_file_name(nodeid):
+    """
+    Turns a test node id (e.g. 'tests/test_legal_pages.py::test_x[chromium-/politica/]')
+    into a unique, file-system safe name.
+    """
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid).strip("_")
+
+
+def artifact_dir(env, browser_name, nodeid, root=ARTIFACTS_DIR):
+    return root / env / browser_name / safe_file_name(nodeid)
+
+
+class TraceChunks:
+    """One trace chunk per test, on contexts that may outlive the test (warm context pool)."""
+
+    def __init__(self):
+        self.started = weakref.WeakSet()
+
+    def begin(self, context, title):
+        if context in self.started:
+            context.tracing.start_chunk(title=title)
+        else:
+            context.tracing.start(title=title, **TRACE_OPTIONS)
+            self.started.add(context)
+
+    def end(self, context, path=None):
+        """Saves the chunk to 'path', or drops it (passing test)."""
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        context.tracing.stop_chunk(path=path)
+
+
+class ArtifactWriteWarning(UserWarning):
+    """Artifacts that could not be written (listed in the warnings summary at the end of the session)."""
+
+
+class ArtifactWriter:
+    """
+    Writes artifacts from a background thread. 'submit' only queues the bytes;
+    'close' waits for the queue to be written (end of the session).
+    'errors' lists the files that could not be written.
+    """
+
+    def __init__(self, compress_level=6):
+        self.compress_level = compress_level
+        self.queue = queue.Queue()
+        self.errors = []
+        self.thread = threading.Thread(target=self._run, name="palato-artifact-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, path, data, compress=False):
+        """Queues 'data' (bytes) for 'path'. With 'compress', it's gzipped into 'path.gz'. Returns the final path."""
+        final_path = path.with_name(path.name + ".gz") if compress else path
+        self.queue.put((final_path, data, compress))
+        return final_path
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            path, data, compress = job
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(gzip.compress(data, self.compress_level) if compress else data)
+            except OSError as e:
+                self.errors.append(f"{path}: {e}")
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
@@ -0,0 +1,133 @@
+"""
+Batched content checks.
+
+Checking a list of headings with 'expect(...)' in a loop costs one protocol round
+trip (and one auto-wait) per item, and stops at the first missing one. Here the
+whole checklist is evaluated inside the page in one go: the browser polls it
+until everything is there or the deadline passes, and then I report every
+missing item at once.
+
+Matching follows Playwright's 'exact=False': case-insensitive substring on the
+whitespace-normalized accessible name / text. Visible means a non-empty box and
+no 'visibility: hidden', like 'to_be_visible()'.
+"""
+
+import re
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+DEFAULT_TIMEOUT = 5000
+
+# Python regex flags with a JavaScript equivalent (UNICODE is the default for str patterns in both).
+JS_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s"}
+
+# Python-only syntax: named groups '(?P<name>...)', '(?P=name)' and inline flags like '(?i)'.
+PYTHON_ONLY_SYNTAX = re.compile(r"\(\?(P[<=]|[aiLmsux-]+[):])")
+
+# Returns the list of checklist items that are missing (or not visible) on the page.
+FIND_MISSING_JS = """
+(spec) => {
+    const norm = (s) => (s || "").replace(/\\s+/g, " ").trim().toLowerCase();
+    const visible = (el) => {
+        const box = el.getBoundingClientRect();
+        return box.width > 0 && box.height > 0 && getComputedStyle(el).visibility !== "hidden";
+    };
+    const accessibleName = (el) => {
+        const label = el.getAttribute("aria-label");
+        if (label) return norm(label);
+        const images = Array.from(el.querySelectorAll("img[alt]")).map((img) => img.alt).join(" ");
+        return norm(el.textContent + " " + images);
+    };
+    const missing = [];
+
+    const headings = Array.from(document.querySelectorAll("h1, h2, h3, h4, h5, h6, [role=heading]")).filter(visible);
+    for (const name of spec.headings) {
+        if (!headings.some((el) => accessibleName(el).includes(norm(name)))) missing.push(`heading "${name}"`);
+    }
+
+    const links = Array.from(document.querySelectorAll("a[href], [role=link]")).filter(visible);
+    for (const [name, href, flags] of spec.links) {
+        const pattern = href ? new RegExp(href, flags) : null;
+        const found = links.some((el) =>
+            accessibleName(el).includes(norm(name)) && (!pattern || pattern.test(el.getAttribute("href") || "")));
+        if (!found) missing.push(href ? `link "${name}" -> /${href}/` : `link "${name}"`);
+    }
+
+    for (const text of spec.texts) {
+        const target = norm(text);
+        // The deepest elements containing the text, like get_by_text().
+        const matches = Array.from(document.body.querySelectorAll("*")).filter((el) =>
+            norm(el.textContent).includes(target) &&
+            !Array.from(el.children).some((child) => norm(child.textContent).includes(target)));
+        if (!matches.some(visible)) missing.push(`text "${text}"`);
+    }
+
+    return missing;
+}
+"""
+
+
+def build_spec(headings=None, links=None, texts=None):
+    """
+    Normalizes the checklist for the page script.
+    'links' maps a link name to an href pattern (string or compiled regex), or None to skip the href check.
+    """
+    link_items = []
+    for name, href in (links or {}).items():
+        href, flags = js_regex(href) if href is not None else (None, "")
+        link_items.append([name, href, flags])
+
+    return {
+        "headings": list(headings or []),
+        "links": link_items,
+        "texts": list(texts or []),
+    }
+
+
+def js_regex(pattern):
+    """
+    (source, flags) for JavaScript's 'new RegExp'. The flags of a compiled pattern are carried
+    across; a pattern JavaScript would read differently raises a ValueError.
+    """
+    flags = ""
+    if isinstance(pattern, re.Pattern):
+        unsupported = re.RegexFlag(pattern.flags & ~re.UNICODE & ~sum(JS_FLAGS))
+        if unsupported:
+            raise ValueError(f"Regex flag(s) {unsupported!r} of /{pattern.pattern}/ have no JavaScript equivalent")
+        flags = "".join(letter for flag, letter in JS_FLAGS.items() if pattern.flags & flag)
+        pattern = pattern.pattern
+    if PYTHON_ONLY_SYNTAX.search(pattern):
+        raise ValueError(f"/{pattern}/ uses Python-only regex syntax (named groups or inline flags), use re flags instead")
+    return pattern, flags
+
+
+def verify_all(page, headings=None, links=None, texts=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Waits (up to 'timeout' ms) until every heading, link and text is visible.
+    Raises one AssertionError listing everything that is still missing.
+    """
+    spec = build_spec(headings, links, texts)
+
+    try:
+        page.wait_for_function(
+            f"(spec) => ({FIND_MISSING_JS})(spec).length === 0",
+            arg=spec,
+            timeout=timeout,
+            polling=100,
+        )
+        return
+    except PlaywrightTimeoutError:
+        pass
+
+    # Deadline passed: one last evaluation tells me exactly what is missing.
+    try:
+        missing = page.evaluate(FIND_MISSING_JS, spec)
+    except PlaywrightError as e:
+        raise AssertionError(f"Could not evaluate the checklist on {page.url}: {e}") from e
+
+    if missing:
+        raise AssertionError(
+            f"{len(missing)} item(s) missing or not visible on {page.url} after {timeout} ms:\n  - "
+            + "\n  - ".join(missing)
+        )
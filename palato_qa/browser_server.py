@@ -0,0 +1,239 @@
+"""
+Warm browser server: one long-lived browser, reused by every pytest run.
+
+Each pytest run normally launches its own browser before the first 'page.goto'.
+With the server running, 'pytest --browser-server' connects to the already
+running browser over its websocket endpoint instead (contexts are still created
+per run, so tests stay isolated). When no server answers, the run falls back
+to a normal launch.
+
+    python -m palato_qa.browser_server start [--browser chromium] [--port 9323]
+    python -m palato_qa.browser_server status
+    python -m palato_qa.browser_server stop
+    python -m palato_qa.browser_server run      # same as 'start', in the foreground
+
+The daemon is a small supervisor around 'playwright launch-server':
+  - health check: every '--health-interval' seconds it connects, renders a page
+    and disconnects; two failures in a row count as a crash;
+  - restart policy: a crashed (or exited) browser is restarted with a growing
+    back-off, at most '--max-restarts' times in 10 minutes, then the daemon gives up.
+
+The server is launched once with its own options (headless by default), so
+'--headed' or '--slowmo' of a pytest run don't apply to it.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HOST = "127.0.0.1"
+
+# One port per browser, so a server per browser can run side by side.
+DEFAULT_PORTS = {"chromium": 9323, "firefox": 9324, "webkit": 9325}
+
+RESTART_WINDOW_SECONDS = 600
+
+
+def ws_endpoint(browser_name, port=None):
+    return f"ws://{HOST}:{port or DEFAULT_PORTS[browser_name]}/palato-{browser_name}"
+
+
+def state_path(port, suffix):
+    """Pid and log files of the server on 'port' (in the temp folder, shared by every checkout)."""
+    return Path(tempfile.gettempdir()) / f"palato-browser-server-{port}.{suffix}"
+
+
+def is_listening(port, timeout=0.2):
+    """Cheap check (used before every run): does something accept connections on the port?"""
+    try:
+        with socket.create_connection((HOST, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def probe(browser_name, port, timeout_ms=10_000):
+    """Full health check: connects, renders a page and disconnects. Returns True when the browser works."""
+    from playwright.sync_api import Error, sync_playwright
+
+    try:
+        with sync_playwright() as playwright:
+            browser = getattr(playwright, browser_name).connect(ws_endpoint(browser_name, port), timeout=timeout_ms)
+            try:
+                page = browser.new_page()
+                page.set_content("<p id='health'>ok</p>")
+                return page.text_content("#health", timeout=timeout_ms) == "ok"
+            finally:
+                browser.close()
+    except Error:
+        return False
+
+
+class Supervisor:
+    """Runs 'playwright launch-server' for one browser and keeps it healthy."""
+
+    def __init__(self, browser_name, port, headless=True, health_interval=30, max_restarts=5):
+        self.browser_name = browser_name
+        self.port = port
+        self.headless = headless
+        self.health_interval = health_interval
+        self.max_restarts = max_restarts
+        self.process = None
+        self.restarts = []
+        self.stopping = False
+
+    def launch(self, timeout=60):
+        config_path = state_path(self.port, "json")
+        config_path.write_text(json.dumps({
+            "host": HOST,
+            "port": self.port,
+            "wsPath": f"palato-{self.browser_name}",
+            "headless": self.headless,
+        }), encoding="utf-8")
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "playwright", "launch-server", "--browser", self.browser_name, "--config", str(config_path)],
+            stdout=subprocess.DEVNULL,
+        )
+
+        deadline = time.monotonic() + timeout
+        while not is_listening(self.port):
+            if self.process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"The {self.browser_name} server didn't start (exit code {self.process.poll()})")
+            time.sleep(0.2)
+        log(f"{self.browser_name} server ready at {ws_endpoint(self.browser_name, self.port)} (pid {self.process.pid})")
+
+    def terminate(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    def restart(self, reason):
+        """Restart policy: growing back-off, at most 'max_restarts' in the restart window."""
+        now = time.monotonic()
+        self.restarts = [at for at in self.restarts if now - at < RESTART_WINDOW_SECONDS] + [now]
+        if len(self.restarts) > self.max_restarts:
+            raise RuntimeError(f"{len(self.restarts) - 1} restarts in {RESTART_WINDOW_SECONDS}s, giving up ({reason})")
+
+        delay = min(2 ** (len(self.restarts) - 1), 30)
+        log(f"Restarting the {self.browser_name} server in {delay}s: {reason}")
+        self.terminate()
+        time.sleep(delay)
+        self.launch()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        state_path(self.port, "pid").write_text(str(os.getpid()), encoding="utf-8")
+        try:
+            self.launch()
+            failures = 0
+            while not self.stopping:
+                self._sleep(self.health_interval)
+                if self.stopping:
+                    break
+                if self.process.poll() is not None:
+                    self.restart(f"browser process exited with code {self.process.returncode}")
+                    failures = 0
+                    continue
+                failures = 0 if probe(self.browser_name, self.port) else failures + 1
+                if failures >= 2:
+                    self.restart("health check failed twice")
+                    failures = 0
+        finally:
+            self.terminate()
+            state_path(self.port, "pid").unlink(missing_ok=True)
+            log(f"{self.browser_name} server stopped")
+
+    def _sleep(self, seconds):
+        deadline = time.monotonic() + seconds
+        while not self.stopping and time.monotonic() < deadline:
+            time.sleep(0.5)
+
+    def _stop(self, signum, frame):
+        self.stopping = True
+
+
+def log(message):
+    print(f"[{time.strftime('%H:%M:%S')}] {message}", flush=True)
+
+
+def start_daemon(args):
+    """Starts 'run' in the background (detached, logging to a file) and waits until the server answers."""
+    if is_listening(args.port):
+        print(f"Already running: {ws_endpoint(args.browser, args.port)}")
+        return 0
+
+    log_path = state_path(args.port, "log")
+    command = [sys.executable, "-m", "palato_qa.browser_server", "run", "--browser", args.browser, "--port", str(args.port),
+               "--health-interval", str(args.health_interval), "--max-restarts", str(args.max_restarts)]
+    if args.headed:
+        command.append("--headed")
+    with open(log_path, "ab") as log_file:
+        daemon = subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL, start_new_session=True)
+
+    deadline = time.monotonic() + 60
+    while not is_listening(args.port):
+        if daemon.poll() is not None or time.monotonic() > deadline:
+            print(f"The server didn't start, see {log_path}")
+            return 1
+        time.sleep(0.2)
+    print(f"Started: {ws_endpoint(args.browser, args.port)} (log: {log_path})")
+    return 0
+
+
+def stop_daemon(args):
+    pid_path = state_path(args.port, "pid")
+    if not pid_path.exists():
+        print("Not running")
+        return 0
+    try:
+        os.kill(int(pid_path.read_text(encoding="utf-8")), signal.SIGTERM)
+    except ProcessLookupError:
+        pid_path.unlink(missing_ok=True)
+    print("Stopped")
+    return 0
+
+
+def status(args):
+    if not is_listening(args.port):
+        print("Not running")
+        return 1
+    healthy = probe(args.browser, args.port)
+    print(f"{'Healthy' if healthy else 'Not healthy'}: {ws_endpoint(args.browser, args.port)}")
+    return 0 if healthy else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep a warm browser server running for 'pytest --browser-server'.")
+    parser.add_argument("command", choices=["start", "stop", "status", "run"])
+    parser.add_argument("--browser", default="chromium", choices=list(DEFAULT_PORTS))
+    parser.add_argument("--port", type=int, default=None, help="Default: 9323 (chromium), 9324 (firefox), 9325 (webkit)")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--health-interval", type=float, default=30, help="Seconds between health checks (default: 30)")
+    parser.add_argument("--max-restarts", type=int, default=5, help="Restarts allowed in 10 minutes before giving up (default: 5)")
+    args = parser.parse_args(argv)
+    args.port = args.port or DEFAULT_PORTS[args.browser]
+
+    if args.command == "run":
+        supervisor = Supervisor(args.browser, args.port, not args.headed, args.health_interval, args.max_restarts)
+        try:
+            supervisor.run()
+        except RuntimeError as e:
+            log(str(e))
+            return 1
+        return 0
+    return {"start": start_daemon, "stop": stop_daemon, "status": status}[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
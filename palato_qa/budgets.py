@@ -0,0 +1,55 @@
+"""
+Performance budgets.
+
+A page has a budget only when it declares one: 'budget' markers on the module,
+the test or a 'pytest.param' (closest wins per metric), or a 'budget' line in
+its spec. There are no site-wide limits until they come from recorded
+performance reports; a page without a budget is never checked.
+
+Example, next to the parametrization data:
+
+    pytest.param("patinhasyes", ..., marks=pytest.mark.budget(transfer_bytes=6_000_000))
+
+Metrics the browser can't measure (e.g. LCP outside Chromium) are not checked.
+"""
+
+BUDGET_MODES = ["fail", "warn", "off"]
+
+# The metrics a budget can limit (names as in the performance report).
+BUDGET_METRICS = ["ttfb_ms", "lcp_ms", "cls", "transfer_bytes", "request_count", "dom_nodes"]
+
+
+class PerformanceBudgetWarning(UserWarning):
+    """Raised as a warning (instead of a failure) with '--budget-mode=warn'."""
+
+
+def resolve_budget(item):
+    """Merges the 'budget' markers of a test (closest marker wins). Empty when the test declares none."""
+    budget = {}
+    # iter_markers goes from the closest to the farthest, so I apply them in reverse.
+    for marker in reversed(list(item.iter_markers("budget"))):
+        unknown = set(marker.kwargs) - set(BUDGET_METRICS)
+        if unknown:
+            raise ValueError(f"Unknown budget metric(s) {sorted(unknown)}. Valid: {BUDGET_METRICS}")
+        budget.update(marker.kwargs)
+    return budget
+
+
+def check_page(metrics, budget):
+    """Returns one message per metric of this page that is over budget."""
+    violations = []
+    for metric, limit in budget.items():
+        value = metrics.get(metric)
+        if value is None or limit is None:
+            continue
+        if value > limit:
+            violations.append(f"{metrics['path']}: {metric} {_format(metric, value)} > budget {_format(metric, limit)}")
+    return violations
+
+
+def _format(metric, value):
+    if metric == "transfer_bytes":
+        return f"{value / 1_000_000:.2f} MB"
+    if metric.endswith("_ms"):
+        return f"{value:.0f} ms"
+    return f"{value}"
@@ -0,0 +1,86 @@
+"""
+Pre-seeded cookie consent.
+
+The site uses the CookieYes plugin: the banner stays hidden once the
+'cookieyes-consent' cookie says 'consent:yes'. Instead of clicking "Aceite tudo"
+in every test, I build that state once per session, save it as a Playwright
+'storage_state' file and load it into every new context.
+
+Two ways to build it:
+  - "synthesize": write the cookie directly (no browser, no network).
+  - "click": open the site once, click the real banner and save the result.
+"""
+
+import json
+import time
+import uuid
+from urllib.parse import urlsplit
+
+CONSENT_COOKIE = "cookieyes-consent"
+CONSENT_MODES = ["synthesize", "click", "off"]
+
+# One year, like the plugin itself.
+CONSENT_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def synthesize_consent_state(base_url):
+    """Returns a storage state with the consent cookie CookieYes writes after "Aceite tudo"."""
+    parts = urlsplit(base_url)
+    value = ",".join([
+        f"consentid:{uuid.uuid4().hex}",
+        "consent:yes",
+        "action:yes",
+        "necessary:yes",
+        "functional:yes",
+        "analytics:yes",
+        "performance:yes",
+        "advertisement:yes",
+        "other:yes",
+    ])
+    return {
+        "cookies": [{
+            "name": CONSENT_COOKIE,
+            "value": value,
+            "domain": parts.hostname,
+            "path": "/",
+            "expires": int(time.time()) + CONSENT_MAX_AGE,
+            "httpOnly": False,
+            "secure": parts.scheme == "https",
+            "sameSite": "Lax",
+        }],
+        "origins": [],
+    }
+
+
+def click_consent_state(browser, context_args, base_url):
+    """Accepts the real banner once and returns the resulting storage state (cookies + local storage)."""
+    context = browser.new_context(**context_args)
+    try:
+        page = context.new_page()
+        page.goto(base_url)
+        page.get_by_role("button", name="Aceite tudo").click(timeout=10000)
+        page.wait_for_function(f"document.cookie.includes('{CONSENT_COOKIE}=')")
+        return context.storage_state()
+    finally:
+        context.close()
+
+
+def is_valid(state):
+    """True if the saved state still holds a consent cookie that hasn't expired."""
+    now = time.time()
+    return any(
+        cookie["name"] == CONSENT_COOKIE and (cookie.get("expires", -1) == -1 or cookie["expires"] > now)
+        for cookie in state.get("cookies", [])
+    )
+
+
+def load_state(path):
+    if not path.exists():
+        return None
+    state = json.loads(path.read_text(encoding="utf-8"))
+    return state if is_valid(state) else None
+
+
+def save_state(path, state):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, indent=2), encoding="utf-8")
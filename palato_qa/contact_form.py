@@ -0,0 +1,105 @@
+"""
+The Contact Form 7 form of the contact page: fields, filling steps and result.
+
+Shared by 'test_contact_full' (sync API) and the load test (async API), so both
+fill the form the same way. The steps are data ('FIELDS'); 'fill_form' and
+'fill_form_async' only walk through them.
+
+Fill modes:
+  - 'auto' (default): every field is filled at once ('fill'), the page gets two
+    animation frames to run its input handlers, and only the fields whose value
+    was reset by the site's scripts are typed again. When the reset doesn't
+    happen (the form was bound before filling, see 'readiness'), no key is typed;
+  - 'type': every field is typed key by key ('press_sequentially' with per-key
+    delays), like a visitor.
+"""
+
+CONTACT_PATH = "/contacto/"
+
+# Field name -> (value, per-key typing delay in ms)
+FIELDS = {
+    "your-name": ("Automated Test Playwright", 100),
+    "your-email": ("automacao_palato@mailinator.com", 50),
+    "your-phone": ("932001002", 50),
+    "your-message": ("This is an automated test message sent by a script during Sanity Test.", 10),
+}
+INTEREST = "Desenvolvimento Web"
+
+SUBMIT = 'input[type="submit"]'
+RESPONSE_OUTPUT = ".wpcf7-response-output"
+
+# Texts of the response box (Portuguese site).
+SUCCESS_TEXT = "enviada com sucesso"
+ERROR_TEXT = "Ocorreu um erro"
+
+FILL_MODES = ["auto", "type"]
+
+# Resolves after two animation frames: the page's input/change handlers have run by then.
+SETTLE_JS = "() => new Promise((resolve) => requestAnimationFrame(() => requestAnimationFrame(resolve)))"
+
+
+def field(page, name):
+    return page.locator(f'[name="{name}"]')
+
+
+def fill_form(page, mode="auto"):
+    """
+    Fills every field, picks the interest and accepts the policies (sync API). Doesn't submit.
+    Returns the names of the fields that were typed (all of them with mode='type').
+    """
+    typed = list(FIELDS)
+    if mode == "auto":
+        for name, (value, _) in FIELDS.items():
+            field(page, name).fill(value)
+        page.evaluate(SETTLE_JS)
+        typed = [name for name, (value, _) in FIELDS.items() if field(page, name).input_value() != value]
+
+    for name in typed:
+        value, delay = FIELDS[name]
+        locator = field(page, name)
+        locator.scroll_into_view_if_needed()
+        locator.fill("")
+        locator.click()
+        locator.press_sequentially(value, delay=delay)
+    field(page, "your-interest").select_option(value=INTEREST)
+    field(page, "acceptance-policies").check()
+    return typed
+
+
+async def fill_form_async(page, mode="auto"):
+    """Same steps as 'fill_form', with the async API."""
+    typed = list(FIELDS)
+    if mode == "auto":
+        for name, (value, _) in FIELDS.items():
+            await field(page, name).fill(value)
+        await page.evaluate(SETTLE_JS)
+        typed = [name for name, (value, _) in FIELDS.items() if await field(page, name).input_value() != value]
+
+    for name in typed:
+        value, delay = FIELDS[name]
+        locator = field(page, name)
+        await locator.scroll_into_view_if_needed()
+        await locator.fill("")
+        await locator.click()
+        await locator.press_sequentially(value, delay=delay)
+    await field(page, "your-interest").select_option(value=INTEREST)
+    await field(page, "acceptance-policies").check()
+    return typed
+
+
+def is_feedback_response(response):
+    """The CF7 REST call made by the submit button."""
+    return response.request.method == "POST" and "/contact-form-7/v1/contact-forms/" in response.url and "/feedback" in response.url
+
+
+def classify(http_status, feedback):
+    """
+    Maps a CF7 feedback answer to 'success', 'spam' or 'error'.
+    'feedback' is the JSON body ({"status": "mail_sent" | "spam" | "validation_failed" | "mail_failed" | ...}) or None.
+    """
+    status = (feedback or {}).get("status")
+    if http_status == 200 and status == "mail_sent":
+        return "success"
+    if status == "spam":
+        return "spam"
+    return "error"
@@ -0,0 +1,105 @@
+"""
+A pool of warm Playwright browser contexts.
+
+Creating a context is cheap compared to launching a browser, but it is not free:
+every 'new_context' call is a protocol round trip plus the viewport setup. In
+parallel mode each worker keeps one browser and hands the same few contexts to
+its tests, resetting them between uses instead of throwing them away.
+"""
+
+import json
+from pathlib import Path
+
+from playwright.sync_api import Browser, BrowserContext
+
+
+class ContextPool:
+    """
+    Keeps a fixed number of BrowserContexts alive for one browser.
+    Contexts are reset on release (pages closed, cookies and storage cleared),
+    so a test never sees state left behind by the previous one.
+    """
+
+    def __init__(self, browser: Browser, context_args: dict, size: int = 1):
+        self.browser = browser
+        self.context_args = context_args
+        self.size = max(1, size)
+        self._idle: list[BrowserContext] = []
+        self._all: list[BrowserContext] = []
+
+        # Cookies from 'storage_state' (e.g. the cookie consent) are put back after every reset.
+        self._seed_cookies = self._load_cookies(context_args.get("storage_state"))
+
+    def warm(self):
+        """Creates the contexts up front, so the first tests don't pay for it."""
+        while len(self._all) < self.size:
+            context = self.browser.new_context(**self.context_args)
+            self._all.append(context)
+            self._idle.append(context)
+
+    def acquire(self) -> BrowserContext:
+        """Returns an idle context, creating a new one only if the pool is empty."""
+        if self._idle:
+            return self._idle.pop()
+
+        context = self.browser.new_context(**self.context_args)
+        self._all.append(context)
+        return context
+
+    def release(self, context: BrowserContext):
+        """
+        Resets the context and puts it back in the pool.
+        If the reset fails (e.g. the context crashed), I drop it and let the pool
+        create a fresh one on the next acquire.
+        """
+        try:
+            self._reset(context)
+        except Exception:
+            self._discard(context)
+            return
+
+        if len(self._idle) < self.size:
+            self._idle.append(context)
+        else:
+            self._discard(context)
+
+    def close(self):
+        """Closes every context the pool has created."""
+        for context in list(self._all):
+            self._discard(context)
+        self._idle.clear()
+
+    def _reset(self, context: BrowserContext):
+        # Local/session storage is per origin and survives 'clear_cookies', so I
+        # wipe it from the pages that are still open before closing them.
+        for page in context.pages:
+            try:
+                page.evaluate("() => { localStorage.clear(); sessionStorage.clear(); }")
+            except Exception:
+                # about:blank and error pages have no storage to clear.
+                pass
+            page.close()
+
+        context.unroute_all(behavior="ignoreErrors")
+        context.clear_cookies()
+        context.clear_permissions()
+        if self._seed_cookies:
+            context.add_cookies(self._seed_cookies)
+
+    @staticmethod
+    def _load_cookies(storage_state):
+        if not storage_state:
+            return []
+        if isinstance(storage_state, dict):
+            return storage_state.get("cookies", [])
+        return json.loads(Path(storage_state).read_text(encoding="utf-8")).get("cookies", [])
+
+    def _discard(self, context: BrowserContext):
+        if context in self._all:
+            self._all.remove(context)
+        if context in self._idle:
+            self._idle.remove(context)
+        try:
+            context.close()
+        except Exception:
+            pass
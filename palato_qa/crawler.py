@@ -0,0 +1,326 @@
+"""
+Concurrent site crawler.
+
+The tests only cover hard-coded URLs. The crawler discovers every page from the
+sitemap and from internal links, visits them with a bounded number of async
+Playwright workers (one browser, one context per worker) and runs on each page:
+  - the HTTP status check (< 400);
+  - the header and footer checks of 'PageLayout' (logo, menu, footer);
+  - a console-error check (console errors and uncaught exceptions);
+  - with '--visual', a full-page snapshot compared with its baseline
+    ('snapshots/crawl/<env>/chromium/', see 'visual').
+
+Every URL is visited once, and all results go to one report:
+
+    python -m palato_qa.crawler --env=prod --concurrency=8
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime, timezone
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright, expect
+
+from palato_qa import consent, visual
+from palato_qa.batch_checks import FIND_MISSING_JS, build_spec
+from palato_qa.layout import FOOTER_STRATEGIES, LOGO_STRATEGIES
+from palato_qa.performance import REPORTS_DIR
+from palato_qa.site import ENVIRONMENTS, HEADER_NAV_LINKS
+
+SITEMAPS = ["/sitemap.xml", "/sitemap_index.xml", "/wp-sitemap.xml"]
+
+# WordPress internals and files that are not pages.
+SKIPPED_PATHS = re.compile(r"^/(wp-admin|wp-json|wp-login|feed|xmlrpc)|/feed/?$")
+SKIPPED_EXTENSIONS = re.compile(r"\.(pdf|jpe?g|png|gif|webp|svg|zip|mp4|xml|css|js)$", re.IGNORECASE)
+
+VIEWPORT = {"width": 1920, "height": 1080}
+
+
+def normalize_url(url, base_url):
+    """
+    Returns the canonical form of an internal page URL (no fragment, no query, lowercase host),
+    or None when the URL is external or not a page.
+    """
+    parts = urlsplit(urljoin(base_url, url))
+    base = urlsplit(base_url)
+    if parts.scheme not in ("http", "https") or (parts.hostname or "") != (base.hostname or ""):
+        return None
+
+    path = parts.path or "/"
+    if SKIPPED_PATHS.search(path) or SKIPPED_EXTENSIONS.search(path):
+        return None
+    return urlunsplit((base.scheme, parts.netloc.lower(), path, "", ""))
+
+
+def parse_sitemap(xml_text):
+    """Returns (page URLs, nested sitemap URLs) from a sitemap or sitemap index."""
+    try:
+        root = ElementTree.fromstring(xml_text)
+    except ElementTree.ParseError:
+        return [], []
+
+    locations = [element.text.strip() for element in root.iter() if element.tag.endswith("loc") and element.text]
+    if root.tag.endswith("sitemapindex"):
+        return [], locations
+    return locations, []
+
+
+class CrawlResult:
+    """The checks of one page."""
+
+    def __init__(self, url):
+        self.url = url
+        self.status = None
+        self.errors = []
+        self.console_errors = []
+        self.visual = None
+        self.duration_ms = None
+
+    @property
+    def ok(self):
+        return not self.errors and not self.console_errors
+
+    def to_dict(self):
+        return {
+            "url": self.url,
+            "ok": self.ok,
+            "status": self.status,
+            "errors": self.errors,
+            "console_errors": self.console_errors,
+            "visual": self.visual,
+            "duration_ms": self.duration_ms,
+        }
+
+
+def error_line(error):
+    """'TimeoutError: Timeout 30000ms exceeded.' (first line of the message only)"""
+    lines = str(error).splitlines()
+    return f"{type(error).__name__}: {lines[0]}" if lines else type(error).__name__
+
+
+class Crawler:
+    """
+    Visits the site with 'concurrency' workers sharing one queue.
+    'seen' de-duplicates URLs across workers, 'max_pages' bounds the crawl.
+    """
+
+    def __init__(self, base_url, concurrency=8, max_pages=500, follow_links=True, timeout=15000, check_console=True, snapshots=None):
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = concurrency
+        self.max_pages = max_pages
+        self.follow_links = follow_links
+        self.timeout = timeout
+        self.check_console = check_console
+        self.snapshots = snapshots
+        self.seen = set()
+        self.results = []
+        self._queue = asyncio.Queue()
+
+    def enqueue(self, url):
+        url = normalize_url(url, self.base_url)
+        if url and url not in self.seen and len(self.seen) < self.max_pages:
+            self.seen.add(url)
+            self._queue.put_nowait(url)
+
+    async def run(self):
+        async with async_playwright() as playwright:
+            await self._discover_sitemaps(playwright)
+            self.enqueue(f"{self.base_url}/")
+
+            browser = await playwright.chromium.launch()
+            try:
+                # One context per worker: isolated, and reused for all the pages that worker visits.
+                contexts = [
+                    await browser.new_context(
+                        viewport=VIEWPORT,
+                        storage_state=consent.synthesize_consent_state(self.base_url),
+                    )
+                    for _ in range(self.concurrency)
+                ]
+                workers = [asyncio.create_task(self._worker(context)) for context in contexts]
+                await self._queue.join()
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+            finally:
+                await browser.close()
+
+        self.results.sort(key=lambda result: result.url)
+        return self.results
+
+    async def _discover_sitemaps(self, playwright):
+        request = await playwright.request.new_context()
+        try:
+            pending = [f"{self.base_url}{path}" for path in SITEMAPS]
+            visited = set()
+            while pending:
+                sitemap_url = pending.pop()
+                if sitemap_url in visited:
+                    continue
+                visited.add(sitemap_url)
+                try:
+                    response = await request.get(sitemap_url, timeout=self.timeout)
+                except Exception:
+                    continue
+                if not response.ok:
+                    continue
+                pages, sitemaps = parse_sitemap(await response.text())
+                for page_url in pages:
+                    self.enqueue(page_url)
+                pending.extend(sitemaps)
+        finally:
+            await request.dispose()
+
+    async def _worker(self, context):
+        while True:
+            url = await self._queue.get()
+            try:
+                self.results.append(await self._visit(context, url))
+            except Exception as e:
+                # A dead context or browser fails the page, never the worker (the queue would wait for it forever).
+                result = CrawlResult(url)
+                result.errors.append(error_line(e))
+                self.results.append(result)
+            finally:
+                self._queue.task_done()
+
+    async def _visit(self, context, url):
+        result = CrawlResult(url)
+        page = None
+        started = asyncio.get_running_loop().time()
+        try:
+            page = await context.new_page()
+            if self.check_console:
+                page.on("console", lambda message: message.type == "error" and result.console_errors.append(message.text))
+                page.on("pageerror", lambda error: result.console_errors.append(str(error)))
+
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout)
+            result.status = response.status if response else None
+            if result.status is None or result.status >= 400:
+                result.errors.append(f"HTTP status {result.status}")
+            else:
+                await self._check_layout(page, result)
+                if self.snapshots is not None:
+                    await self._check_snapshot(page, result)
+
+            if self.follow_links:
+                for href in await page.eval_on_selector_all("a[href]", "links => links.map(a => a.href)"):
+                    self.enqueue(href)
+        except Exception as e:
+            result.errors.append(error_line(e))
+        finally:
+            result.duration_ms = round((asyncio.get_running_loop().time() - started) * 1000)
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+        return result
+
+    async def _check_layout(self, page, result):
+        """The same checks as PageLayout.verify_header / verify_footer (same fallback chains), with the async API."""
+        # Header: logo
+        if not await self._first_visible(page, LOGO_STRATEGIES):
+            result.errors.append("header: logo not visible")
+
+        # Header: menu links, checked in one batch
+        spec = build_spec(links={name: None for name in HEADER_NAV_LINKS})
+        try:
+            await page.wait_for_function(f"(spec) => ({FIND_MISSING_JS})(spec).length === 0", arg=spec, timeout=5000, polling=100)
+        except PlaywrightTimeoutError:
+            missing = await page.evaluate(FIND_MISSING_JS, spec)
+            result.errors.extend(f"header: {item} missing" for item in missing)
+
+        # Footer: #footer-outer, or its texts when the wrapper has 0 height
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        if not await self._first_visible(page, FOOTER_STRATEGIES):
+            result.errors.append("footer: not visible")
+
+    async def _first_visible(self, page, strategies):
+        """Tries a fallback chain of (name, timeout_ms, locator(page)) in order. Returns the name that passed, or None."""
+        for name, timeout, locator in strategies:
+            try:
+                await expect(locator(page)).to_be_visible(timeout=timeout)
+                return name
+            except AssertionError:
+                continue
+        return None
+
+    async def _check_snapshot(self, page, result):
+        png = await page.screenshot(**visual.screenshot_args(page))
+        # The comparison is NumPy work: off the event loop, so the other workers keep going.
+        comparison = await asyncio.to_thread(self.snapshots.compare, visual.snapshot_name(page.url), png)
+        result.visual = comparison.to_dict()
+        if not comparison.passed:
+            result.errors.append(f"visual: {comparison.describe()}")
+
+
+def write_report(results, env, base_url, reports_dir=REPORTS_DIR):
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = reports_dir / f"crawl-{env}-{stamp}.json"
+    data = {
+        "env": env,
+        "base_url": base_url,
+        "pages": len(results),
+        "failed": sum(not result.ok for result in results),
+        "results": [result.to_dict() for result in results],
+    }
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl the Palato Digital site and check every page.")
+    parser.add_argument("--env", default="stag", choices=list(ENVIRONMENTS))
+    parser.add_argument("--base-url", help="Crawl this URL instead of an environment (e.g. the local site)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Pages visited at the same time (default: 8)")
+    parser.add_argument("--max-pages", type=int, default=500, help="Stop discovering after N pages (default: 500)")
+    parser.add_argument("--no-follow", action="store_true", help="Only visit the sitemap URLs, don't follow links")
+    parser.add_argument("--no-console", action="store_true", help="Don't fail pages on console errors")
+    parser.add_argument("--visual", default="off", choices=visual.VISUAL_MODES, help="'compare' every page with its baseline snapshot, or 'update' them (needs numpy and Pillow)")
+    args = parser.parse_args(argv)
+    if args.visual != "off" and not visual.is_available():
+        parser.error("--visual requires numpy and Pillow (pip install numpy pillow)")
+
+    base_url = args.base_url or ENVIRONMENTS[args.env]
+    env = args.env if not args.base_url else "custom"
+    snapshots = None
+    if args.visual != "off":
+        # The crawl scrolls every page before its snapshot, so it keeps its own baselines.
+        snapshots = visual.SnapshotStore(
+            env, "chromium", update=args.visual == "update",
+            root=visual.SNAPSHOTS_DIR / "crawl", diffs_dir=visual.DIFFS_DIR / "crawl",
+        )
+    crawler = Crawler(
+        base_url,
+        concurrency=args.concurrency,
+        max_pages=args.max_pages,
+        follow_links=not args.no_follow,
+        check_console=not args.no_console,
+        snapshots=snapshots,
+    )
+    started = datetime.now(timezone.utc)
+    results = asyncio.run(crawler.run())
+    elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+
+    failed = [result for result in results if not result.ok]
+    for result in failed:
+        print(f"[ ❌ ] {result.url} (status {result.status})")
+        for message in result.errors + [f"console: {text}" for text in result.console_errors]:
+            print(f"       - {message}")
+
+    path = write_report(results, env, base_url)
+    print(f"Crawled {len(results)} pages in {elapsed:.0f} s: {len(results) - len(failed)} ok, {len(failed)} failed.")
+    print(f"Report saved to: {path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
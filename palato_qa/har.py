@@ -0,0 +1,168 @@
+"""
+HAR record/replay for the suite.
+
+'--record' saves every test's network traffic to a compressed HAR ('har/<test>.zip').
+'--env=replay' serves those responses back through Playwright request routing, so
+the suite runs offline and without the live site's latency.
+
+Recordings go stale when the site changes. Running this module checks every
+recorded HTML document against the live site:
+
+    python -m palato_qa.har --check
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+HAR_DIR = Path("har")
+MANIFEST_NAME = "manifest.json"
+
+
+# --- 1. Manifest ---
+def write_manifest(env, base_url, har_dir=HAR_DIR):
+    """Stores which environment was recorded and when (used by replay and the staleness check)."""
+    har_dir.mkdir(exist_ok=True)
+    manifest = {
+        "env": env,
+        "base_url": base_url,
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    (har_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def read_manifest(har_dir=HAR_DIR):
+    """Returns the manifest of the last recording, or None if nothing was recorded yet."""
+    path = har_dir / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def recording_age_days(manifest):
+    """How many days ago the recording was made."""
+    recorded_at = datetime.fromisoformat(manifest["recorded_at"])
+    return (datetime.now(timezone.utc) - recorded_at).total_seconds() / 86400
+
+
+# --- 2. Routing ---
+def record(context, har_path):
+    """
+    Records all traffic of the context into 'har_path'.
+    The '.zip' extension makes Playwright store bodies as compressed attachments.
+    The file is written when the context closes.
+    """
+    har_path.parent.mkdir(parents=True, exist_ok=True)
+    context.route_from_har(str(har_path), update=True, update_content="attach", update_mode="minimal")
+
+
+def replay(context, har_path):
+    """
+    Serves every request of the context from 'har_path'.
+    Requests missing from the recording are aborted, so replay never touches the network.
+    """
+    context.route_from_har(str(har_path), not_found="abort")
+
+
+# --- 3. Staleness Check ---
+def normalize_html(html):
+    """
+    Reduces a page to the content my tests care about.
+    Scripts, styles, comments and WordPress nonces change on every request, so I drop them.
+    """
+    html = re.sub(r"<script\b.*?</script>|<style\b.*?</style>|<!--.*?-->", "", html, flags=re.S | re.I)
+    # Whole attribute/parameter names only: not 'server=' or 'data-nonce='.
+    html = re.sub(r"(?<![\w-])(nonce|ver)=[\"']?[\w.-]+", "", html)
+    return re.sub(r"\s+", " ", html).strip()
+
+
+def fingerprint(html):
+    return hashlib.sha256(normalize_html(html).encode("utf-8")).hexdigest()
+
+
+def recorded_documents(har_path, base_url):
+    """Yields (url, html) for every HTML page of the site stored in one HAR zip."""
+    with zipfile.ZipFile(har_path) as archive:
+        har = json.loads(archive.read(_har_member(archive)))
+        for entry in har["log"]["entries"]:
+            request, response = entry["request"], entry["response"]
+            content = response.get("content", {})
+            if request["method"] != "GET" or not request["url"].startswith(base_url):
+                continue
+            if "text/html" not in content.get("mimeType", ""):
+                continue
+
+            if "_file" in content:
+                body = archive.read(content["_file"]).decode("utf-8", errors="replace")
+            else:
+                body = content.get("text", "")
+            yield request["url"], body
+
+
+def _har_member(archive):
+    return next(name for name in archive.namelist() if name.endswith(".har"))
+
+
+def check_staleness(har_dir=HAR_DIR, timeout=15):
+    """
+    Compares each recorded HTML document with the live page.
+    Returns a list of (url, status) where status is 'ok', 'changed' or an error message.
+    """
+    import requests
+
+    manifest = read_manifest(har_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No recording found in '{har_dir}'. Run: pytest --env=<env> --record")
+
+    # The same page is usually recorded by several tests, I only fetch it once.
+    recorded = {}
+    for har_path in sorted(har_dir.glob("*.zip")):
+        for url, body in recorded_documents(har_path, manifest["base_url"]):
+            recorded.setdefault(url, fingerprint(body))
+
+    results = []
+    with requests.Session() as session:
+        for url, recorded_hash in recorded.items():
+            try:
+                live = session.get(url, timeout=timeout)
+            except requests.RequestException as e:
+                results.append((url, f"error: {e}"))
+                continue
+            status = "ok" if fingerprint(live.text) == recorded_hash else "changed"
+            results.append((url, status))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect the HAR recordings used by '--env=replay'.")
+    parser.add_argument("--check", action="store_true", help="Compare recorded pages with the live site")
+    parser.add_argument("--har-dir", default=str(HAR_DIR))
+    args = parser.parse_args(argv)
+
+    har_dir = Path(args.har_dir)
+    manifest = read_manifest(har_dir)
+    if manifest is None:
+        print(f"No recording found in '{har_dir}'.")
+        return 1
+
+    print(f"Recorded from '{manifest['env']}' ({manifest['base_url']}), {recording_age_days(manifest):.1f} days ago.")
+    if not args.check:
+        return 0
+
+    results = check_staleness(har_dir)
+    for url, status in results:
+        print(f"  [{status}] {url}")
+
+    stale = [url for url, status in results if status != "ok"]
+    print(f"{len(stale)} of {len(results)} recorded pages no longer match the live site.")
+    return 1 if stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+HTTP-only tier: static-content checks without a browser.
+
+Headings, titles, hrefs and status codes are already in the server-rendered HTML.
+I fetch all the pages concurrently through one pooled 'requests' Session, parse
+them with the standard library, and evaluate the same kind of checklist as
+'PageLayout.verify_all' (headings, links, texts), plus status, title and element ids.
+
+This tier checks that content is *served*, not that it is *visible*: anything
+that depends on CSS, JavaScript or interaction stays in the browser tests.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+SKIPPED_TAGS = {"script", "style", "noscript", "template"}
+
+
+def norm(text):
+    """Same normalization as the batched in-page checks: collapsed whitespace, lowercase."""
+    return re.sub(r"\s+", " ", text or "").strip().lower()
+
+
+class PageParser(HTMLParser):
+    """Extracts the title, headings, links (name + href), visible-ish text and element ids of a page."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.headings = []
+        self.links = []
+        self.ids = set()
+        self._text = []
+        self._open_heading = None
+        self._open_link = None
+        self._in_title = False
+        self._skipping = 0
+
+    @property
+    def text(self):
+        return norm(" ".join(self._text))
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if attrs.get("id"):
+            self.ids.add(attrs["id"])
+        if tag in SKIPPED_TAGS:
+            self._skipping += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in HEADING_TAGS or attrs.get("role") == "heading":
+            self._open_heading = (tag, [])
+        elif tag == "a" and "href" in attrs:
+            self._open_link = {"href": attrs["href"], "label": attrs.get("aria-label"), "text": []}
+        elif tag == "img" and self._open_link is not None and attrs.get("alt"):
+            self._open_link["text"].append(attrs["alt"])
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS and self._skipping:
+            self._skipping -= 1
+        elif tag == "title":
+            self._in_title = False
+        elif self._open_heading and tag == self._open_heading[0]:
+            self.headings.append(norm(" ".join(self._open_heading[1])))
+            self._open_heading = None
+        elif tag == "a" and self._open_link is not None:
+            link = self._open_link
+            self.links.append((norm(link["label"] or " ".join(link["text"])), link["href"]))
+            self._open_link = None
+
+    def handle_data(self, data):
+        if self._skipping:
+            return
+        if self._in_title:
+            self.title += data
+            return
+        self._text.append(data)
+        if self._open_heading:
+            self._open_heading[1].append(data)
+        if self._open_link is not None:
+            self._open_link["text"].append(data)
+
+
+class HttpPage:
+    """A fetched and parsed page."""
+
+    def __init__(self, url, status, html, error=None):
+        self.url = url
+        self.status = status
+        self.error = error
+        self.parsed = PageParser()
+        if html:
+            self.parsed.feed(html)
+            self.parsed.close()
+
+    def absolute_links(self):
+        """Every href of the page, resolved against the page URL (for the link checker)."""
+        return sorted({urljoin(self.url, href) for _, href in self.parsed.links})
+
+    def find_missing(self, status=200, title=None, message=None, headings=None, links=None, hrefs=None, texts=None, ids=None):
+        """
+        Returns the list of failed checks (empty when everything is there).
+        Matching is a case-insensitive substring, like 'exact=False'. 'title' and link hrefs are regexes.
+        'message' is a regex that a heading or the title must match (like the spec's 'message').
+        'hrefs' are regexes a link must match, whatever its name.
+        """
+        if self.error:
+            return [f"request failed: {self.error}"]
+
+        missing = []
+        if status is not None and self.status != status:
+            missing.append(f"status {self.status} (expected {status})")
+        if title and not re.search(title, self.parsed.title, re.IGNORECASE):
+            missing.append(f"title /{title}/ (got '{self.parsed.title.strip()}')")
+        if message and not any(re.search(message, text, re.IGNORECASE) for text in [*self.parsed.headings, self.parsed.title]):
+            missing.append(f"message /{message}/ in a heading or the title")
+
+        for name in headings or []:
+            if not any(norm(name) in heading for heading in self.parsed.headings):
+                missing.append(f'heading "{name}"')
+
+        for name, href in (links or {}).items():
+            found = any(
+                norm(name) in link_name and (not href or re.search(href, link_href))
+                for link_name, link_href in self.parsed.links
+            )
+            if not found:
+                missing.append(f'link "{name}" -> /{href}/' if href else f'link "{name}"')
+
+        for href in hrefs or []:
+            if not any(re.search(href, link_href) for _, link_href in self.parsed.links):
+                missing.append(f"link -> /{href}/")
+
+        for text in texts or []:
+            if norm(text) not in self.parsed.text:
+                missing.append(f'text "{text}"')
+
+        for element_id in ids or []:
+            if element_id not in self.parsed.ids:
+                missing.append(f"element #{element_id}")
+
+        return missing
+
+
+class HttpClient:
+    """
+    One pooled Session shared by a thread pool: connections to the site are kept alive and
+    reused, and up to 'max_workers' pages are fetched at the same time.
+    """
+
+    def __init__(self, max_workers=8, timeout=15):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = "PalatoQA-HttpTier/1.0"
+
+    def fetch(self, url):
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            return HttpPage(url, None, None, error=str(e))
+        return HttpPage(url, response.status_code, response.text)
+
+    def fetch_all(self, urls):
+        """Fetches every URL concurrently. Returns {url: HttpPage}."""
+        urls = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(urls, executor.map(self.fetch, urls)))
+
+    def close(self):
+        self.session.close()
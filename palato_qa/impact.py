@@ -0,0 +1,91 @@
+"""
+Impact-based selection: which tests (and specs) a WordPress plugin update affects.
+
+Tests declare the site features they cover with a marker:
+
+    pytestmark = pytest.mark.features("contact-form", "header", "footer")
+
+and this module says which plugin provides which feature. 'pytest --changed=<plugin>'
+then runs only the tests of the affected features, plus the always-on smoke set
+(tests marked 'smoke'). An unknown plugin can affect anything, so it runs everything.
+
+Command line (what would a plugin update run?):
+    python -m palato_qa.impact contact-form-7
+"""
+
+import argparse
+
+# WordPress plugin slug (or 'theme') -> site features it provides.
+PLUGIN_FEATURES = {
+    "contact-form-7": ["contact-form"],
+    "cookie-law-info": ["cookie-consent", "cookie-policy"],
+    "theme": ["header", "footer", "404"],
+}
+
+# Other names the webhook (or a human) may use for the same plugin.
+PLUGIN_ALIASES = {
+    "cf7": "contact-form-7",
+    "cookieyes": "cookie-law-info",
+    "cookie-consent": "cookie-law-info",
+}
+
+# Spec under 'specs/' -> site features it describes (specs to review after an update).
+SPEC_FEATURES = {
+    "01_homepage_sanity.md": ["homepage", "header", "footer"],
+    "02_services_navigation.md": ["services", "header", "footer"],
+    "03_about_navigation.md": ["about", "header", "footer"],
+    "04_contact_full.md": ["contact-form", "header", "footer"],
+    "05_cookie_policy_spec.md": ["legal", "cookie-policy", "header"],
+    "06_portfolio_projects_spec.md": ["portfolio", "header", "footer"],
+    "07_privacy_policy_spec.md": ["legal", "header", "footer"],
+    "08_terms_conditions_spec.md": ["legal", "header", "footer"],
+    "09_404_page_spec.md": ["404", "header", "footer"],
+    "10_cookie_banner_spec.md": ["cookie-consent"],
+}
+
+
+def resolve_plugins(changed):
+    """'cf7, theme' -> (['contact-form-7', 'theme'], unknown plugin names)."""
+    plugins, unknown = [], []
+    for name in (part.strip().lower() for part in changed.split(",")):
+        if not name:
+            continue
+        name = PLUGIN_ALIASES.get(name, name)
+        (plugins if name in PLUGIN_FEATURES else unknown).append(name)
+    return plugins, unknown
+
+
+def affected_features(plugins):
+    return sorted({feature for plugin in plugins for feature in PLUGIN_FEATURES[plugin]})
+
+
+def affected_specs(features):
+    return [spec for spec, covered in SPEC_FEATURES.items() if set(covered) & set(features)]
+
+
+def item_features(item):
+    """Every feature declared on the test, its class, module and parametrization."""
+    return {feature for marker in item.iter_markers("features") for feature in marker.args}
+
+
+def is_affected(item, features):
+    return item.get_closest_marker("smoke") is not None or bool(item_features(item) & set(features))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the features and specs a plugin update affects.")
+    parser.add_argument("changed", help="Plugin slug(s), comma separated (e.g. 'contact-form-7' or 'cf7,theme')")
+    args = parser.parse_args(argv)
+
+    plugins, unknown = resolve_plugins(args.changed)
+    if unknown:
+        print(f"Unknown plugin(s) {', '.join(unknown)}: the whole suite would run. Known: {', '.join(PLUGIN_FEATURES)}")
+        return
+    features = affected_features(plugins)
+    print(f"Features: {', '.join(features)}")
+    print(f"Specs: {', '.join(affected_specs(features))}")
+    print(f"Run: pytest --changed={','.join(plugins)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Incremental health check: only the browser tests of pages that changed run again.
+
+Every incremental (or '--full') run remembers, per environment:
+  - the URLs each browser test loaded, and whether the test passed;
+  - the last-known-good fingerprint of each URL: its ETag / Last-Modified
+    validators and the hash of its normalized HTML (see 'har.normalize_html').
+
+The next incremental run sends a conditional GET for every remembered URL. A 304,
+or a 200 whose normalized HTML hashes the same, means the page didn't change.
+A test is left out when it passed last time and none of its pages changed;
+tests that failed, tests never seen before, and tests of a changed page run.
+
+A page's fingerprint is only saved when every test that loaded it passed, so a
+changed page keeps its tests running until they pass against it.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urldefrag
+
+import pytest
+import requests
+
+from palato_qa.har import fingerprint
+
+INCREMENTAL_CACHE_KEY = "palato/incremental"
+
+
+def probe(session, url, known=None, timeout=15):
+    """
+    Conditional GET of one URL. Returns its current fingerprint
+    {"status", "etag", "last_modified", "hash"}, or None when the request fails.
+    """
+    headers = {}
+    if known and known.get("etag"):
+        headers["If-None-Match"] = known["etag"]
+    if known and known.get("last_modified"):
+        headers["If-Modified-Since"] = known["last_modified"]
+
+    try:
+        response = session.get(url, headers=headers, timeout=timeout)
+    except requests.RequestException:
+        return None
+    if response.status_code == 304 and known:
+        return dict(known)
+    return {
+        "status": response.status_code,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "hash": fingerprint(response.text),
+    }
+
+
+def has_changed(known, current):
+    """Validators may change with the same content (nonces), so I only compare status and content hash."""
+    if known is None or current is None:
+        return True
+    return (known["status"], known["hash"]) != (current["status"], current["hash"])
+
+
+class IncrementalRun:
+    """
+    The incremental mode of a run, registered as a PyTest plugin on the main process.
+
+    'state' is {"pages": {url: fingerprint}, "tests": {nodeid: {"urls": [...], "passed": bool}}}
+    and is saved back to the PyTest cache ('save(state)') at the end of the run.
+    """
+
+    def __init__(self, state, client, save, full=False):
+        self.state = {"pages": state.get("pages", {}), "tests": state.get("tests", {})}
+        self.client = client
+        self.save = save
+        self.full = full
+        self.current = {}
+        self.changed = set()
+        self.unchanged_tests = set()
+        self.checked = 0
+        self.results = {}
+
+    def plan(self):
+        """Probes every remembered URL. Returns the node ids of the tests that don't need to run."""
+        if self.full:
+            return self.unchanged_tests
+        self.fingerprint_all(self.state["pages"])
+        self.checked = len(self.current)
+        self.changed = {url for url in self.current if has_changed(self.state["pages"].get(url), self.current[url])}
+        self.unchanged_tests = {
+            nodeid for nodeid, test in self.state["tests"].items()
+            if test["passed"] and test["urls"] and not self.changed.intersection(test["urls"])
+        }
+        return self.unchanged_tests
+
+    def fingerprint_all(self, urls):
+        urls = [url for url in urls if url not in self.current]
+        with ThreadPoolExecutor(max_workers=self.client.max_workers) as executor:
+            fingerprints = executor.map(
+                lambda url: probe(self.client.session, url, self.state["pages"].get(url), self.client.timeout), urls
+            )
+            self.current.update(zip(urls, fingerprints))
+
+    @staticmethod
+    def visited(user_properties):
+        return sorted({urldefrag(url)[0] for url in dict(user_properties).get("visited_urls", [])})
+
+    @staticmethod
+    def wants_report(report):
+        return report.when == "call" or (report.when == "setup" and not report.passed)
+
+    # --- PyTest hooks ---
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        """Sends the plan to each pytest-xdist worker, so they all deselect the same tests."""
+        node.workerinput["palato_incremental_skip"] = sorted(self.unchanged_tests)
+
+    def pytest_runtest_logreport(self, report):
+        if self.wants_report(report):
+            passed = report.passed or report.skipped
+            self.results[report.nodeid] = {"urls": self.visited(report.user_properties), "passed": passed}
+        elif report.when == "teardown" and report.failed and report.nodeid in self.results:
+            self.results[report.nodeid]["passed"] = False
+
+    def pytest_sessionfinish(self, session):
+        # Nothing changed: every browser test was left out, which is a pass, not "no tests collected".
+        if session.exitstatus == pytest.ExitCode.NO_TESTS_COLLECTED and self.unchanged_tests and not self.results:
+            session.exitstatus = pytest.ExitCode.OK
+        if session.exitstatus not in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED):
+            return
+        self.state["tests"].update(self.results)
+
+        failing_urls = {url for result in self.results.values() if not result["passed"] for url in result["urls"]}
+        tested_urls = {url for result in self.results.values() if result["passed"] for url in result["urls"]}
+        self.fingerprint_all(tested_urls - failing_urls)
+        for url in tested_urls - failing_urls:
+            if self.current.get(url) is not None:
+                self.state["pages"][url] = self.current[url]
+        self.save(self.state)
+
+    def pytest_unconfigure(self):
+        self.client.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.full:
+            terminalreporter.write_line(f"[ 🔁 Incremental ] Full run: {len(self.results)} tests remembered for the next incremental run")
+            return
+        terminalreporter.write_line(
+            f"[ 🔁 Incremental ] {self.checked} pages checked, {len(self.changed)} changed: "
+            f"{len(self.unchanged_tests)} tests unchanged, {len(self.results)} run"
+        )
@@ -0,0 +1,117 @@
+"""
+Page layout helpers: the header and footer checks, batched checklists and readiness waits.
+
+Used by the 'layout' fixture of the tests and by the monitor, so both check the
+pages the same way (see palato_qa/specs.py for the checks themselves).
+"""
+
+from playwright.sync_api import expect
+
+from palato_qa import batch_checks, readiness
+from palato_qa.site import HEADER_NAV_LINKS
+from palato_qa.strategies import StrategyCache
+
+# Fallback chains of the header logo and the footer: (name, timeout_ms, locator(page)) in the default order.
+# The locators work on sync and async pages, so the crawler runs the same chains.
+LOGO_STRATEGIES = [
+    # Alt text first (accessibility best practice), then the ID/class
+    ("alt-text", 5000, lambda page: page.get_by_alt_text("Palato Digital").first),
+    ("id-or-class", 5000, lambda page: page.locator("#logo").or_(page.locator(".custom-logo-link"))),
+]
+
+# Known issue: On some pages (Privacy/Cookie Policy), #footer-outer has 0 height.
+# We handle this by falling back to content checks: brand text or the copyright text.
+FOOTER_STRATEGIES = [
+    ("footer-outer", 3000, lambda page: page.locator("#footer-outer")),
+    ("brand-text", 2000, lambda page: page.get_by_text("Palato Digital").last),
+    ("copyright-text", 2000, lambda page: page.get_by_text("Todos os direitos reservados", exact=False).first),
+]
+
+
+class PageLayout:
+    """
+    Encapsulates common page interactions to avoid code duplication (DRY).
+    Includes methods for footer verification, cookie acceptance, header checks, batched checklists and readiness waits.
+    """
+    def __init__(self, page, strategies=None):
+        self.page = page
+        # Remembers which locator strategy worked on each page (see 'first_working').
+        self.strategies = strategies if strategies is not None else StrategyCache({})
+        self.avoided_timeout_ms = 0
+
+    def accept_cookies(self):
+        """
+        Checks for the cookie banner and accepts it if visible.
+        This prevents random timeouts and elements being covered.
+        """
+        try:
+            # "Aceite tudo" button
+            cookie_button = self.page.get_by_role("button", name="Aceite tudo")
+            if cookie_button.is_visible(timeout=2000):
+                cookie_button.click()
+                expect(cookie_button).to_be_hidden()
+        except Exception:
+            # Ignore if not found or already accepted
+            pass
+
+    def verify_footer(self):
+        """
+        Robustly verifies that the footer is visible.
+        1. Scrolls to the bottom using JS (handles lazy loading).
+        2. Asserts #footer-outer is visible.
+        3. Fallback: Checks for 'Palato Digital' text if wrapper has 0 height.
+        """
+        self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+
+        # The fallbacks are in FOOTER_STRATEGIES; the strategy that worked last time on this page is tried first.
+        self.first_visible("footer", FOOTER_STRATEGIES)
+
+    def verify_header(self):
+        """
+        Verifies that the header elements are visible.
+        1. Checks for Logo (via ID or Alt Text).
+        2. Checks for Menu navigation links.
+        """
+        # 1. Logo
+        # Tries checking by alt text first (accessibility best practice), falls back to ID/Class
+        self.first_visible("logo", LOGO_STRATEGIES)
+
+        # 2. Main Navigation Links
+        # We check for key pages to ensure the menu is rendered (all in one batch)
+        self.verify_all(links={name: None for name in HEADER_NAV_LINKS})
+
+    def verify_all(self, headings=None, links=None, texts=None, timeout=batch_checks.DEFAULT_TIMEOUT):
+        """
+        Verifies a whole checklist in one in-page evaluation (instead of one 'expect' per item).
+        - headings: list of heading names.
+        - links: {link name: href regex or None}.
+        - texts: list of visible texts.
+        Retries the whole batch until 'timeout' and reports every missing item at once.
+        """
+        batch_checks.verify_all(self.page, headings=headings, links=links, texts=texts, timeout=timeout)
+
+    def wait_ready(self, target="page", timeout=readiness.DEFAULT_TIMEOUT):
+        """
+        Waits for the concrete signals a check needs instead of 'networkidle' (see palato_qa/readiness.py).
+        - "page": HTML parsed and web fonts loaded.
+        - "contact-form": the same, plus Contact Form 7's script initialized and bound to the form.
+        """
+        readiness.wait_ready(self.page, target, timeout)
+
+    def first_visible(self, check, strategies):
+        """Runs a fallback chain of (name, timeout_ms, locator(page)): the first visible locator wins."""
+        return self.first_working(check, [
+            (name, timeout, lambda timeout, locator=locator: expect(locator(self.page)).to_be_visible(timeout=timeout))
+            for name, timeout, locator in strategies
+        ])
+
+    def first_working(self, check, strategies):
+        """
+        Runs a fallback chain and returns the name of the strategy that passed.
+        'strategies' is a list of (name, timeout_ms, function(timeout_ms)) in the default order.
+        The strategy that worked last time on this page path is tried first, so a wrong
+        first choice doesn't cost its full timeout on every run.
+        """
+        name, avoided_ms = self.strategies.run(self.page.url, check, strategies)
+        self.avoided_timeout_ms += avoided_ms
+        return name
@@ -0,0 +1,217 @@
+"""
+Broken-link checker.
+
+Collects every anchor href of the pages the run visited, de-duplicates them, and
+checks them concurrently:
+  - one pooled 'requests' Session per host (connections are reused per host);
+  - HEAD first, GET when the server doesn't answer HEAD properly;
+  - a per-host limit of parallel requests and a minimum interval between them,
+    so external sites (and our own) are not hammered;
+  - a JSON cache on disk: links that were OK less than 'ttl' ago are not checked again.
+
+Social networks often answer bots with 429 or 999. Those links are reported as
+'unverified' (not broken) and are never cached.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urldefrag, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from palato_qa.performance import REPORTS_DIR
+
+# Collects the hrefs of a page (absolute URLs, resolved by the browser).
+PAGE_LINKS_JS = "anchors => anchors.map(a => a.href)"
+
+# Answers meaning "this server doesn't do HEAD": retry with GET.
+RETRY_WITH_GET = {400, 403, 404, 405, 406, 429, 500, 501, 503}
+
+# Answers meaning "we're a bot, go away": the link may be fine, I can't tell.
+UNVERIFIABLE = {429, 999}
+
+
+def normalize_link(href):
+    """Returns the URL without its fragment, or None for non-HTTP links (mailto:, tel:, javascript:)."""
+    if not href or urlsplit(href).scheme not in ("http", "https"):
+        return None
+    return urldefrag(href)[0]
+
+
+class LinkCache:
+    """{url: {"status", "checked_at"}} of the links that were OK, kept on disk ('path' None: for this run only)."""
+
+    def __init__(self, path, ttl_seconds):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.entries = json.loads(path.read_text(encoding="utf-8")) if path is not None and path.exists() else {}
+
+    def is_fresh(self, url):
+        entry = self.entries.get(url)
+        return entry is not None and time.time() - entry["checked_at"] < self.ttl_seconds
+
+    def store(self, result):
+        if result["state"] == "ok":
+            self.entries[result["url"]] = {"status": result["status"], "checked_at": time.time()}
+        else:
+            self.entries.pop(result["url"], None)
+
+    def save(self):
+        if self.path is None:
+            return
+        now = time.time()
+        fresh = {url: entry for url, entry in self.entries.items() if now - entry["checked_at"] < self.ttl_seconds}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(fresh, indent=2), encoding="utf-8")
+
+
+class HostLimiter:
+    """At most 'max_parallel' requests to one host at a time, at least 'min_interval' seconds apart."""
+
+    def __init__(self, max_parallel, min_interval):
+        self.semaphore = threading.Semaphore(max_parallel)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def __enter__(self):
+        self.semaphore.acquire()
+        with self._lock:
+            wait = self._next_slot - time.monotonic()
+            self._next_slot = max(self._next_slot, time.monotonic()) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def __exit__(self, *exc_info):
+        self.semaphore.release()
+
+
+class LinkChecker:
+    """Checks a set of URLs concurrently, with a pooled Session and a rate limit per host."""
+
+    def __init__(self, cache, max_workers=16, per_host_parallel=2, per_host_interval=0.25, timeout=10):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.per_host_parallel = per_host_parallel
+        self.per_host_interval = per_host_interval
+        self.timeout = timeout
+        self._sessions = {}
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def check_all(self, urls):
+        """
+        Returns one result dict per URL: {"url", "state", "status", "error", "cached"}.
+        'state' is 'ok', 'broken' or 'unverified'.
+        """
+        urls = sorted(set(urls))
+        cached = [{"url": url, "state": "ok", "status": self.cache.entries[url]["status"], "error": None, "cached": True}
+                  for url in urls if self.cache.is_fresh(url)]
+        pending = [url for url in urls if not self.cache.is_fresh(url)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            checked = list(executor.map(self.check, pending))
+
+        for result in checked:
+            self.cache.store(result)
+        self.cache.save()
+        self.close()
+        return cached + checked
+
+    def check(self, url):
+        host = urlsplit(url).netloc
+        session, limiter = self._for_host(host)
+        result = {"url": url, "state": "broken", "status": None, "error": None, "cached": False}
+
+        try:
+            with limiter:
+                response = session.head(url, allow_redirects=True, timeout=self.timeout)
+            if response.status_code in RETRY_WITH_GET:
+                with limiter:
+                    response = session.get(url, allow_redirects=True, timeout=self.timeout, stream=True)
+                    response.close()
+            result["status"] = response.status_code
+        except requests.RequestException as e:
+            result["error"] = type(e).__name__
+            return result
+
+        if result["status"] in UNVERIFIABLE:
+            result["state"] = "unverified"
+        elif result["status"] < 400:
+            result["state"] = "ok"
+        return result
+
+    def close(self):
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+
+    def _for_host(self, host):
+        with self._lock:
+            if host not in self._sessions:
+                session = requests.Session()
+                session.mount("http://", HTTPAdapter(pool_maxsize=self.per_host_parallel))
+                session.mount("https://", HTTPAdapter(pool_maxsize=self.per_host_parallel))
+                session.headers["User-Agent"] = "Mozilla/5.0 (compatible; PalatoQA-LinkChecker/1.0)"
+                self._sessions[host] = session
+                self._limiters[host] = HostLimiter(self.per_host_parallel, self.per_host_interval)
+            return self._sessions[host], self._limiters[host]
+
+
+class LinkCheckStage:
+    """
+    The link-checking stage of a run, registered as a PyTest plugin on the main process.
+    Tests send the hrefs of their pages in their reports ('links' user property);
+    at the end of the run every unique link is checked once.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.links = {}
+        self.results = []
+        self.path = None
+
+    def pytest_runtest_logreport(self, report):
+        for href in dict(report.user_properties).get("links", []):
+            url = normalize_link(href)
+            if url:
+                self.links.setdefault(url, report.nodeid)
+
+    def pytest_sessionfinish(self, session):
+        if not self.links:
+            return
+        self.results = LinkChecker(self.cache).check_all(self.links)
+        for result in self.results:
+            result["found_in"] = self.links[result["url"]]
+        self.path = self.write()
+
+        if any(result["state"] == "broken" for result in self.results) and session.exitstatus == 0:
+            session.exitstatus = 1
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.results:
+            return
+        broken = [result for result in self.results if result["state"] == "broken"]
+        unverified = [result for result in self.results if result["state"] == "unverified"]
+        cached = sum(result["cached"] for result in self.results)
+
+        if broken:
+            terminalreporter.section("broken links", red=True)
+            for result in broken:
+                reason = result["error"] or f"HTTP {result['status']}"
+                terminalreporter.write_line(f"  {result['url']} ({reason}) - found in {result['found_in']}")
+        terminalreporter.write_line(
+            f"[ 🔗 Links ] {len(self.results)} unique links: {len(broken)} broken, {len(unverified)} unverified, "
+            f"{cached} from cache. Report saved to: {self.path}"
+        )
+
+    def write(self, reports_dir=REPORTS_DIR):
+        reports_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = reports_dir / f"links-{stamp}.json"
+        path.write_text(json.dumps(self.results, indent=2, ensure_ascii=False), encoding="utf-8")
+        return path
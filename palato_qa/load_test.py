@@ -0,0 +1,207 @@
+"""
+Contact-form load test: many visitors submitting the Contact Form 7 form at once.
+
+Every virtual user is its own browser context (one browser for all of them, async
+API), and repeats: open the contact page, wait until Contact Form 7 is bound
+(see 'readiness'), fill the form with the same steps as 'test_contact_full'
+(see 'contact_form'), submit, wait for the CF7 feedback call.
+Users start one after the other over the ramp-up time.
+
+The report gives:
+  - throughput: submissions per second over the whole run;
+  - latency percentiles of the submission (click -> CF7 answer) and of a whole
+    iteration (page load + filling + submission);
+  - the split between success ('mail_sent'), spam block ('spam') and error
+    (validation or mail failures, HTTP errors, timeouts).
+
+Only run it against the local stub or staging: every submission sends a real email.
+
+    python -m palato_qa.load_test --env local --users 20 --submissions 5 --ramp-up 10 --fill auto
+    python -m palato_qa.load_test --env stag --users 5 --submissions 2
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from datetime import datetime, timezone
+
+from playwright.async_api import Error as PlaywrightError, async_playwright
+
+from palato_qa import consent, contact_form, readiness
+from palato_qa.local_site import LocalSite
+from palato_qa.performance import REPORTS_DIR
+from palato_qa.site import ENVIRONMENTS
+
+VIEWPORT = {"width": 1920, "height": 1080}
+
+OUTCOMES = ["success", "spam", "error"]
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def latency_summary(values):
+    return {
+        "p50": percentile(values, 0.50),
+        "p90": percentile(values, 0.90),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": max(values) if values else None,
+    }
+
+
+class LoadTest:
+    def __init__(self, base_url, users=10, submissions=1, ramp_up=0.0, fill_mode="type", timeout=30_000, headless=True):
+        self.base_url = base_url
+        self.users = users
+        self.submissions = submissions
+        self.ramp_up = ramp_up
+        self.fill_mode = fill_mode
+        self.timeout = timeout
+        self.headless = headless
+        self.results = []
+        self.started = None
+        self.finished = None
+
+    async def run(self):
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=self.headless)
+            try:
+                self.started = time.perf_counter()
+                await asyncio.gather(*(self.user(browser, index) for index in range(self.users)))
+                self.finished = time.perf_counter()
+            finally:
+                await browser.close()
+        return self.results
+
+    async def user(self, browser, index):
+        # Users start evenly over the ramp-up time.
+        if self.users > 1:
+            await asyncio.sleep(self.ramp_up * index / (self.users - 1))
+
+        context = await browser.new_context(
+            viewport=VIEWPORT, storage_state=consent.synthesize_consent_state(self.base_url)
+        )
+        context.set_default_timeout(self.timeout)
+        try:
+            for iteration in range(self.submissions):
+                self.results.append(await self.submit_once(context, index, iteration))
+        finally:
+            await context.close()
+
+    async def submit_once(self, context, user, iteration):
+        result = {"user": user, "iteration": iteration, "outcome": "error", "http_status": None,
+                  "cf7_status": None, "submit_ms": None, "iteration_ms": None, "error": None}
+        started = time.perf_counter()
+        page = await context.new_page()
+        try:
+            await page.goto(f"{self.base_url}{contact_form.CONTACT_PATH}")
+            await readiness.wait_ready_async(page, "contact-form", timeout=self.timeout)
+            await contact_form.fill_form_async(page, self.fill_mode)
+
+            submitted = time.perf_counter()
+            async with page.expect_response(contact_form.is_feedback_response) as response_info:
+                await page.locator(contact_form.SUBMIT).click()
+            response = await response_info.value
+            result["submit_ms"] = round((time.perf_counter() - submitted) * 1000, 1)
+
+            result["http_status"] = response.status
+            try:
+                feedback = await response.json()
+            except (PlaywrightError, ValueError):
+                feedback = None
+            result["cf7_status"] = (feedback or {}).get("status")
+            result["outcome"] = contact_form.classify(response.status, feedback)
+        except (PlaywrightError, AssertionError) as e:
+            result["error"] = str(e).splitlines()[0]
+        finally:
+            result["iteration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            await page.close()
+        return result
+
+    def summary(self):
+        elapsed = (self.finished or time.perf_counter()) - (self.started or time.perf_counter())
+        counts = {outcome: sum(result["outcome"] == outcome for result in self.results) for outcome in OUTCOMES}
+        submitted = [result["submit_ms"] for result in self.results if result["submit_ms"] is not None]
+        return {
+            "base_url": self.base_url,
+            "users": self.users,
+            "submissions_per_user": self.submissions,
+            "ramp_up_s": self.ramp_up,
+            "fill_mode": self.fill_mode,
+            "elapsed_s": round(elapsed, 2),
+            "submissions": len(self.results),
+            "throughput_per_s": round(len(self.results) / elapsed, 2) if elapsed > 0 else None,
+            "outcomes": counts,
+            "submit_latency_ms": latency_summary(submitted),
+            "iteration_latency_ms": latency_summary([result["iteration_ms"] for result in self.results]),
+            "cf7_statuses": {
+                status: sum(result["cf7_status"] == status for result in self.results)
+                for status in sorted({str(result["cf7_status"]) for result in self.results})
+                if status != "None"
+            },
+        }
+
+
+def write_report(load_test, env, reports_dir=REPORTS_DIR):
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = reports_dir / f"load-{env}-{stamp}.json"
+    data = {"env": env, "summary": load_test.summary(), "results": load_test.results}
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def print_summary(summary):
+    print(f"{summary['submissions']} submissions by {summary['users']} users in {summary['elapsed_s']} s "
+          f"-> {summary['throughput_per_s']} submissions/s")
+    print("Outcomes: " + ", ".join(f"{outcome} {count}" for outcome, count in summary["outcomes"].items()))
+    for name in ("submit_latency_ms", "iteration_latency_ms"):
+        latency = summary[name]
+        print(f"{name}: " + ", ".join(f"{key} {value}" for key, value in latency.items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the contact form with concurrent browser contexts.")
+    parser.add_argument("--env", default="local", choices=["local", "stag"], help="'local' stub (default) or 'stag' (never production)")
+    parser.add_argument("--base-url", help="Target this URL instead of an environment")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users, one browser context each (default: 10)")
+    parser.add_argument("--submissions", type=int, default=1, help="Submissions per user (default: 1)")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which the users start (default: 0, all at once)")
+    parser.add_argument("--fill", default="type", choices=contact_form.FILL_MODES, help="'type' every field key by key like a visitor (default), or 'auto': fill at once, typing only fields the site resets")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds to wait for each page action (default: 30)")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+
+    site = None
+    if args.base_url:
+        base_url, env = args.base_url, "custom"
+    elif args.env == "local":
+        site = LocalSite().start()
+        base_url, env = site.url, "local"
+    else:
+        base_url, env = ENVIRONMENTS[args.env], args.env
+
+    load_test = LoadTest(base_url, args.users, args.submissions, args.ramp_up, args.fill, args.timeout * 1000, not args.headed)
+    try:
+        asyncio.run(load_test.run())
+    finally:
+        if site is not None:
+            site.stop()
+
+    summary = load_test.summary()
+    print_summary(summary)
+    print(f"Report saved to: {write_report(load_test, env)}")
+    return 0 if summary["outcomes"]["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+A local stand-in for the Palato Digital website.
+
+It serves a static mirror of the pages covered by 'specs/' (from 'site_mirror/')
+with a multi-threaded HTTP server, plus a stub of the Contact Form 7 submit
+endpoint. Form submissions are kept in memory and never leave the machine.
+
+Used by '--env=local', and runnable on its own for manual checks:
+
+    python -m palato_qa.local_site --port 8000
+"""
+
+import argparse
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from string import Template
+from urllib.parse import parse_qs, urlsplit
+
+MIRROR_DIR = Path(__file__).parent / "site_mirror"
+
+# Path -> (mirror file, page title)
+PAGES = {
+    "/": ("home.html", "Palato Digital | Estratégia, Design e Desenvolvimento Web"),
+    "/servicos/": ("servicos.html", "Serviços - Palato Digital"),
+    "/sobre/": ("sobre.html", "Sobre - Palato Digital"),
+    "/contacto/": ("contacto.html", "Contacto - Palato Digital"),
+    "/politica-de-privacidade/": ("politica-de-privacidade.html", "Política de Privacidade - Palato Digital"),
+    "/politica-de-cookies/": ("politica-de-cookies.html", "Política de Cookies - Palato Digital"),
+    "/termos-e-condicoes-de-uso/": ("termos-e-condicoes-de-uso.html", "Termos e Condições - Palato Digital"),
+    "/portfolio/patinhasyes/": ("portfolio-patinhasyes.html", "PatinhasYes - Palato Digital"),
+    "/portfolio/alcmena/": ("portfolio-alcmena.html", "Alcmena - Palato Digital"),
+}
+NOT_FOUND_PAGE = ("404.html", "Página não encontrada - Palato Digital")
+
+CF7_FEEDBACK = re.compile(r"^/wp-json/contact-form-7/v1/contact-forms/(\d+)/feedback/?$")
+CF7_REQUIRED_FIELDS = ["your-name", "your-email", "your-message", "acceptance-policies"]
+
+
+def render(page_file, title):
+    """Wraps a page fragment in the shared header/footer layout."""
+    layout = Template((MIRROR_DIR / "layout.html").read_text(encoding="utf-8"))
+    content = (MIRROR_DIR / page_file).read_text(encoding="utf-8")
+    return layout.substitute(title=title, content=content).encode("utf-8")
+
+
+class LocalSiteHandler(BaseHTTPRequestHandler):
+    """Routes requests like the WordPress site does (trailing slashes, 404 page, CF7 REST endpoint)."""
+
+    server_version = "PalatoLocal/1.0"
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+
+        if path == "/logo.svg":
+            return self._send(200, (MIRROR_DIR / "logo.svg").read_bytes(), "image/svg+xml")
+
+        # WordPress redirects '/sobre' to '/sobre/'
+        if not path.endswith("/") and f"{path}/" in PAGES:
+            return self._redirect(f"{path}/")
+
+        if path in PAGES:
+            return self._send(200, render(*PAGES[path]), "text/html; charset=utf-8")
+
+        return self._send(404, render(*NOT_FOUND_PAGE), "text/html; charset=utf-8")
+
+    def do_POST(self):
+        match = CF7_FEEDBACK.match(urlsplit(self.path).path)
+        if not match:
+            return self._send(404, b"{}", "application/json")
+
+        length = int(self.headers.get("Content-Length", 0))
+        fields = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+        self.server.submissions.append(fields)
+
+        invalid = [name for name in CF7_REQUIRED_FIELDS if not fields.get(name)]
+        if invalid:
+            feedback = {
+                "status": "validation_failed",
+                "message": "Um ou mais campos têm um erro. Por favor verifique e tente de novo.",
+                "invalid_fields": invalid,
+            }
+        else:
+            feedback = {
+                "status": "mail_sent",
+                "message": "Obrigado pela sua mensagem. Foi enviada com sucesso.",
+            }
+
+        feedback["contact_form_id"] = int(match.group(1))
+        self._send(200, json.dumps(feedback).encode("utf-8"), "application/json; charset=utf-8")
+
+    def log_message(self, format, *args):
+        # I keep the pytest output clean, the server logs nothing.
+        pass
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _redirect(self, location):
+        self.send_response(301)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class LocalSite:
+    """
+    Runs the stand-in site in a background thread.
+    'submissions' holds every Contact Form 7 payload received, in order.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.server = ThreadingHTTPServer((host, port), LocalSiteHandler)
+        self.server.daemon_threads = True
+        self.server.submissions = []
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def submissions(self):
+        return self.server.submissions
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="palato-local-site", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the local Palato Digital stand-in site.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    site = LocalSite(args.host, args.port)
+    print(f"Serving the local Palato Digital site on {site.url} (Ctrl+C to stop)")
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Page-manifest mode: one navigation per URL.
+
+The classic tests each load their own page, and several load the same one
+(the homepage, the header/footer on every page). In manifest mode every check is
+a separate test item, the items are grouped by URL, and all the checks of a URL
+run against the same loaded page. Navigations per run drop to the number of
+unique URLs.
+
+Checks must be read-only (no clicks that navigate, no form input), since the next
+check reuses the page.
+"""
+
+
+class PageCache:
+    """
+    Keeps the page of the URL being checked open for the next items.
+    Items are grouped by URL, so I only keep one page: a new URL closes the previous one.
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.url = None
+        self.page = None
+        # HTTP status of the current page's navigation (None when there was no response).
+        self.status = None
+        self.navigations = 0
+
+    def get(self, url, prepare=None):
+        """
+        Returns (page, loaded_now). 'prepare(page)' runs on a new page before the navigation
+        (e.g. to install the performance recorder).
+        """
+        if url == self.url and self.page is not None and not self.page.is_closed():
+            return self.page, False
+
+        self.close_page()
+        page = self.context.new_page()
+        if prepare:
+            prepare(page)
+        response = page.goto(url)
+
+        self.url, self.page = url, page
+        self.status = response.status if response else None
+        self.navigations += 1
+        return page, True
+
+    def close_page(self):
+        if self.page is not None and not self.page.is_closed():
+            self.page.close()
+        self.url, self.page, self.status = None, None, None
+
+    def close(self):
+        self.close_page()
+        self.context.close()
+
+
+def manifest_params(manifest, path_marks=None):
+    """
+    Flattens {path: [(check name, check function), ...]} into (path, check) params,
+    with ids like '/servicos/-headings'. 'path_marks(path)' returns the marks of a URL's checks
+    (e.g. its xdist group, to keep a URL's checks on the same parallel worker, and its features).
+    """
+    import pytest
+
+    params = []
+    for path, checks in manifest.items():
+        marks = path_marks(path) if path_marks else []
+        for name, check in checks:
+            params.append(pytest.param(path, check, id=f"{path}-{name}", marks=marks))
+    return params
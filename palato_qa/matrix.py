@@ -0,0 +1,111 @@
+"""
+Environment x browser matrix in one run.
+
+'--env=stag,prod' with several '--browser' flags runs every test once per cell
+(environment x browser) from a single collection:
+  - the environment becomes a session-scoped parameter ('env_name'), like
+    pytest-playwright does with 'browser_name', so every cell has its own
+    base URL, consent state, context pool and browser;
+  - without '--workers', the cells run concurrently in a pytest-xdist process pool,
+    one worker per cell (each worker launches only its cell's browser);
+  - one merged report lists the results per cell, in the terminal and in
+    'reports/matrix-<timestamp>.json'.
+
+With a single environment and a single browser nothing changes (same test ids).
+"""
+
+import json
+from datetime import datetime, timezone
+
+from palato_qa.performance import REPORTS_DIR
+
+
+def env_names(option):
+    """'stag, prod' -> ['stag', 'prod'] (order kept, duplicates removed)."""
+    return list(dict.fromkeys(name.strip() for name in option.split(",") if name.strip()))
+
+
+def browser_names(config):
+    return config.getoption("--browser", default=None) or ["chromium"]
+
+
+def cell_count(config):
+    return len(env_names(config.getoption("--env"))) * len(browser_names(config))
+
+
+def cell_of(item):
+    """'prod/firefox' for a browser test, 'prod/http' for a test without a browser, None outside the site."""
+    if "env_name" not in item.fixturenames:
+        return None
+    params = getattr(item, "callspec", None)
+    params = params.params if params else {}
+    env = params.get("env_name") or env_names(item.config.getoption("--env"))[0]
+    if "browser_name" not in item.fixturenames:
+        return f"{env}/http"
+    return f"{env}/{params.get('browser_name') or browser_names(item.config)[0]}"
+
+
+class MatrixReport:
+    """
+    Merges the results of all the cells, registered as a PyTest plugin on the main process.
+    The cell of each test travels in its reports ('cell' user property, set at collection).
+    """
+
+    OUTCOMES = ["passed", "failed", "skipped"]
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self.cells = {}
+        self.path = None
+
+    def pytest_runtest_logreport(self, report):
+        cell = dict(report.user_properties).get("cell")
+        if cell is None:
+            return
+        tests = self.cells.setdefault(cell, {})
+        entry = tests.setdefault(report.nodeid, {"outcome": "passed", "duration_s": 0.0})
+        entry["duration_s"] = round(entry["duration_s"] + report.duration, 3)
+        if report.failed:
+            entry["outcome"] = "failed"
+        elif report.skipped and entry["outcome"] == "passed":
+            entry["outcome"] = "skipped"
+
+    def summary(self):
+        """{cell: {"passed": n, "failed": n, "skipped": n, "duration_s": total, "failures": [nodeid, ...]}}"""
+        summary = {}
+        for cell, tests in sorted(self.cells.items()):
+            counts = {outcome: 0 for outcome in self.OUTCOMES}
+            for entry in tests.values():
+                counts[entry["outcome"]] += 1
+            counts["duration_s"] = round(sum(entry["duration_s"] for entry in tests.values()), 1)
+            counts["failures"] = sorted(nodeid for nodeid, entry in tests.items() if entry["outcome"] == "failed")
+            summary[cell] = counts
+        return summary
+
+    def pytest_sessionfinish(self):
+        if self.cells:
+            self.path = self.write()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.cells:
+            return
+        terminalreporter.section("environment x browser matrix")
+        terminalreporter.write_line(f"  {'cell':<20} {'passed':>7} {'failed':>7} {'skipped':>8} {'time (s)':>9}")
+        for cell, counts in self.summary().items():
+            line = f"  {cell:<20} {counts['passed']:>7} {counts['failed']:>7} {counts['skipped']:>8} {counts['duration_s']:>9}"
+            terminalreporter.write_line(line, red=bool(counts["failed"]), green=not counts["failed"])
+            for nodeid in counts["failures"]:
+                terminalreporter.write_line(f"      FAILED {nodeid}")
+        terminalreporter.write_line(f"[ 🧮 Matrix ] Report saved to: {self.path}")
+
+    def write(self, reports_dir=REPORTS_DIR):
+        reports_dir.mkdir(parents=True, exist_ok=True)
+        stamp = self.started_at.strftime("%Y%m%dT%H%M%SZ")
+        path = reports_dir / f"matrix-{stamp}.json"
+        data = {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "cells": self.summary(),
+            "tests": self.cells,
+        }
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        return path
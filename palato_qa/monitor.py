@@ -0,0 +1,359 @@
+"""
+Synthetic monitoring: the site checks on a schedule, from one warm browser.
+
+The daily CI run tells us once a day whether the site works. The monitor runs
+the checks of the '## Checks' sections in 'specs/' (the same ones the tests
+run, see 'specs') continuously instead:
+  - one browser (or the warm browser server, see 'browser_server') and a warm
+    context pool for the whole life of the process: a check costs a page load,
+    not a browser launch;
+  - every check has its own interval (homepage every minute, legal pages hourly),
+    with jitter so the checks don't all hit the site at the same second;
+  - results go to a Prometheus text file (for node_exporter's textfile collector)
+    and to a SQLite history of every run (durations and errors);
+  - alerts fire on state changes only (down after '--fail-threshold' failures in
+    a row, then recovered), to the log and to a Discord webhook when
+    DISCORD_WEBHOOK is set.
+
+    python -m palato_qa.monitor --env prod
+    python -m palato_qa.monitor --env prod --interval homepage=30 --only homepage,contacto
+    python -m palato_qa.monitor --base-url http://127.0.0.1:8000 --once
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import requests
+from playwright.sync_api import Error as PlaywrightError, sync_playwright
+
+from palato_qa import browser_server, consent, specs
+from palato_qa.context_pool import ContextPool
+from palato_qa.layout import PageLayout
+from palato_qa.performance import REPORTS_DIR
+from palato_qa.site import ENVIRONMENTS
+from palato_qa.strategies import StrategyCache
+
+VIEWPORT = {"width": 1920, "height": 1080}
+
+
+# Seconds between two runs of a check; the other spec pages (legal pages, portfolio, 404) run hourly.
+INTERVALS = {"homepage": 60, "contacto": 300, "servicos": 900, "sobre": 900}
+DEFAULT_INTERVAL = 3600
+
+
+class MonitorCheck:
+    """One spec page to load and check (see 'specs'). 'interval' is in seconds."""
+
+    def __init__(self, name, spec, interval):
+        self.name = name
+        self.spec = spec
+        self.interval = interval
+
+    @property
+    def path(self):
+        return self.spec["path"]
+
+    def every(self, interval):
+        return MonitorCheck(self.name, self.spec, interval)
+
+
+def check_name(path):
+    """'/' -> 'homepage', '/portfolio/alcmena/' -> 'portfolio-alcmena'"""
+    return path.strip("/").replace("/", "-") or "homepage"
+
+
+def spec_checks():
+    """One check per URL of the '## Checks' sections in 'specs/', the same checks the tests run."""
+    checks = []
+    for path, sections in specs.pages_by_path(specs.spec_pages()).items():
+        name = check_name(path)
+        checks.append(MonitorCheck(name, specs.merge_pages(sections), INTERVALS.get(name, DEFAULT_INTERVAL)))
+    return checks
+
+
+class History:
+    """SQLite history of every check run."""
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " id INTEGER PRIMARY KEY, started_at REAL NOT NULL, env TEXT NOT NULL, check_name TEXT NOT NULL,"
+            " ok INTEGER NOT NULL, duration_ms REAL NOT NULL, error TEXT)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS runs_by_check ON runs (env, check_name, started_at)")
+        self.db.commit()
+
+    def add(self, env, result):
+        self.db.execute(
+            "INSERT INTO runs (started_at, env, check_name, ok, duration_ms, error) VALUES (?, ?, ?, ?, ?, ?)",
+            (result.started_at, env, result.name, int(result.ok), result.duration_ms, result.error),
+        )
+        self.db.commit()
+
+    def last_results(self, env, check_name, limit):
+        """The 'limit' most recent outcomes of a check (True = ok), most recent first."""
+        rows = self.db.execute(
+            "SELECT ok FROM runs WHERE env = ? AND check_name = ? ORDER BY started_at DESC LIMIT ?",
+            (env, check_name, limit),
+        )
+        return [bool(ok) for (ok,) in rows]
+
+    def close(self):
+        self.db.close()
+
+
+class CheckResult:
+    def __init__(self, name, started_at, duration_ms, error=None):
+        self.name = name
+        self.started_at = started_at
+        self.duration_ms = duration_ms
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class CheckState:
+    """Up/down state of one check, with run counters for the metrics."""
+
+    def __init__(self, fail_threshold, recent=()):
+        self.fail_threshold = fail_threshold
+        self.consecutive_failures = 0
+        for ok in recent:
+            if ok:
+                break
+            self.consecutive_failures += 1
+        self.down = self.consecutive_failures >= fail_threshold
+        self.down_since = None
+        self.runs = {"pass": 0, "fail": 0}
+        self.last = None
+
+    def update(self, result):
+        """Returns 'down', 'recovered' or None (no state change)."""
+        self.last = result
+        self.runs["pass" if result.ok else "fail"] += 1
+        if result.ok:
+            self.consecutive_failures = 0
+            if self.down:
+                self.down = False
+                return "recovered"
+            return None
+
+        self.consecutive_failures += 1
+        if not self.down and self.consecutive_failures >= self.fail_threshold:
+            self.down = True
+            self.down_since = result.started_at
+            return "down"
+        return None
+
+
+def write_metrics(path, env, states):
+    """Prometheus text format, written atomically (node_exporter may read it at any time)."""
+    lines = [
+        "# HELP palato_check_up 1 when the check is up (last runs passed), 0 when it is down.",
+        "# TYPE palato_check_up gauge",
+    ]
+    labels = {name: f'check="{name}",env="{env}"' for name in states}
+    lines += [f"palato_check_up{{{labels[name]}}} {0 if state.down else 1}" for name, state in states.items()]
+
+    lines += ["# HELP palato_check_duration_seconds Duration of the last run.", "# TYPE palato_check_duration_seconds gauge"]
+    lines += [
+        f"palato_check_duration_seconds{{{labels[name]}}} {state.last.duration_ms / 1000:.3f}"
+        for name, state in states.items() if state.last
+    ]
+
+    lines += ["# HELP palato_check_last_run_timestamp_seconds Start of the last run.", "# TYPE palato_check_last_run_timestamp_seconds gauge"]
+    lines += [
+        f"palato_check_last_run_timestamp_seconds{{{labels[name]}}} {state.last.started_at:.0f}"
+        for name, state in states.items() if state.last
+    ]
+
+    lines += ["# HELP palato_check_runs_total Runs since the monitor started.", "# TYPE palato_check_runs_total counter"]
+    lines += [
+        f'palato_check_runs_total{{{labels[name]},result="{outcome}"}} {count}'
+        for name, state in states.items() for outcome, count in state.runs.items()
+    ]
+
+    temp_path = path.with_name(path.name + ".tmp")
+    temp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    temp_path.replace(path)
+
+
+def alert(message, webhook=None):
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+    if webhook:
+        try:
+            requests.post(webhook, json={"content": message}, timeout=10)
+        except requests.RequestException as e:
+            print(f"  (Discord alert failed: {e})", flush=True)
+
+
+class Monitor:
+    """Runs the checks on their schedule against one warm browser and context pool."""
+
+    def __init__(self, env, base_url, checks, history, metrics_path, fail_threshold=2, jitter=0.1,
+                 browser_name="chromium", use_browser_server=False, webhook=None):
+        self.env = env
+        self.base_url = base_url
+        self.checks = checks
+        self.history = history
+        self.metrics_path = metrics_path
+        self.jitter = jitter
+        self.browser_name = browser_name
+        self.use_browser_server = use_browser_server
+        self.webhook = webhook
+        self.states = {
+            check.name: CheckState(fail_threshold, history.last_results(env, check.name, fail_threshold))
+            for check in checks
+        }
+        # Which locator strategy worked on each page, kept for the life of the process.
+        self.strategies = StrategyCache({})
+        self.playwright = None
+        self.browser = None
+        self.pool = None
+
+    # --- browser ---
+
+    def start_browser(self):
+        browser_type = getattr(self.playwright, self.browser_name)
+        port = browser_server.DEFAULT_PORTS[self.browser_name]
+        if self.use_browser_server and browser_server.is_listening(port):
+            self.browser = browser_type.connect(browser_server.ws_endpoint(self.browser_name), timeout=10_000)
+        else:
+            self.browser = browser_type.launch()
+        context_args = {"viewport": VIEWPORT, "storage_state": consent.synthesize_consent_state(self.base_url)}
+        self.pool = ContextPool(self.browser, context_args, size=1)
+        self.pool.warm()
+
+    def stop_browser(self):
+        if self.pool is not None:
+            self.pool.close()
+        if self.browser is not None and self.browser.is_connected():
+            self.browser.close()
+        self.pool, self.browser = None, None
+
+    # --- checks ---
+
+    def run_check(self, check):
+        started_at, started = time.time(), time.perf_counter()
+        context = None
+        try:
+            # Inside the 'try': a crashed browser or a context that fails to start is a failed check,
+            # not the end of the monitor (the browser is restarted before the next check).
+            context = self.pool.acquire()
+            page = context.new_page()
+            response = page.goto(f"{self.base_url}{check.path}")
+            status = response.status if response else "no response"
+            if status != specs.status_of(check.spec):
+                raise AssertionError(f"HTTP {status} (expected {specs.status_of(check.spec)})")
+            specs.verify_page(check.spec, page, PageLayout(page, self.strategies))
+            error = None
+        except (AssertionError, PlaywrightError) as e:
+            error = (str(e).splitlines() or [type(e).__name__])[0][:500]
+        finally:
+            if context is not None:
+                self.pool.release(context)
+        return CheckResult(check.name, started_at, round((time.perf_counter() - started) * 1000, 1), error)
+
+    def record(self, result):
+        self.history.add(self.env, result)
+        change = self.states[result.name].update(result)
+        if change == "down":
+            alert(f"🚨 **{result.name}** is DOWN on {self.env} ({self.base_url}): {result.error}", self.webhook)
+        elif change == "recovered":
+            downtime = ""
+            if self.states[result.name].down_since:
+                downtime = f" after {(result.started_at - self.states[result.name].down_since) / 60:.0f} min"
+            alert(f"✅ **{result.name}** recovered on {self.env}{downtime}", self.webhook)
+        write_metrics(self.metrics_path, self.env, self.states)
+
+    def next_run(self, check, now):
+        return now + check.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def run(self, once=False):
+        with sync_playwright() as self.playwright:
+            self.start_browser()
+            try:
+                # The first runs are spread over the first seconds instead of all starting together.
+                now = time.monotonic()
+                due = {check.name: now + random.uniform(0, min(check.interval * self.jitter, 10)) for check in self.checks}
+                pending = list(self.checks)
+                while pending:
+                    check = min(pending, key=lambda check: due[check.name])
+                    time.sleep(max(0.0, due[check.name] - time.monotonic()))
+
+                    if not self.browser.is_connected():
+                        self.stop_browser()
+                        self.start_browser()
+                    self.record(self.run_check(check))
+
+                    due[check.name] = self.next_run(check, time.monotonic())
+                    if once:
+                        pending.remove(check)
+            finally:
+                self.stop_browser()
+        return all(not state.down and (state.last is None or state.last.ok) for state in self.states.values())
+
+
+def parse_intervals(values):
+    """['homepage=30', 'terms=7200'] -> {'homepage': 30.0, 'terms': 7200.0}"""
+    intervals = {}
+    for value in values:
+        name, _, seconds = value.partition("=")
+        intervals[name.strip()] = float(seconds)
+    return intervals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monitor the Palato Digital site continuously from one warm browser.")
+    parser.add_argument("--env", default="prod", choices=list(ENVIRONMENTS))
+    parser.add_argument("--base-url", help="Monitor this URL instead of an environment (e.g. the local site)")
+    parser.add_argument("--only", help="Comma-separated check names (default: all)")
+    parser.add_argument("--interval", action="append", default=[], help="Override a check's interval: 'homepage=30' (seconds, repeatable)")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Random +/- fraction of each interval (default: 0.1)")
+    parser.add_argument("--fail-threshold", type=int, default=2, help="Failures in a row before a check is down (default: 2)")
+    parser.add_argument("--metrics-file", default=str(REPORTS_DIR / "palato-monitor.prom"))
+    parser.add_argument("--db", default=str(REPORTS_DIR / "monitor.sqlite"))
+    parser.add_argument("--browser", default="chromium", choices=list(browser_server.DEFAULT_PORTS))
+    parser.add_argument("--browser-server", action="store_true", help="Use the warm browser server when it is running")
+    parser.add_argument("--once", action="store_true", help="Run every check once and exit (exit code 1 if one failed)")
+    args = parser.parse_args(argv)
+
+    all_checks = spec_checks()
+    checks = all_checks
+    if args.only:
+        names = {name.strip() for name in args.only.split(",")}
+        checks = [check for check in all_checks if check.name in names]
+    intervals = parse_intervals(args.interval)
+    checks = [check.every(intervals.get(check.name, check.interval)) for check in checks]
+    if not checks:
+        parser.error(f"No checks selected. Available: {', '.join(check.name for check in all_checks)}")
+
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    history = History(args.db)
+    base_url = args.base_url or ENVIRONMENTS[args.env]
+    env = args.env if not args.base_url else "custom"
+    monitor = Monitor(
+        env, base_url, checks, history, Path(args.metrics_file),
+        fail_threshold=args.fail_threshold, jitter=args.jitter, browser_name=args.browser,
+        use_browser_server=args.browser_server, webhook=os.environ.get("DISCORD_WEBHOOK"),
+    )
+    print(f"Monitoring {base_url}: " + ", ".join(f"{check.name} every {check.interval:g}s" for check in checks), flush=True)
+    try:
+        ok = monitor.run(once=args.once)
+    except KeyboardInterrupt:
+        ok = True
+    finally:
+        history.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
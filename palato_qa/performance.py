@@ -0,0 +1,180 @@
+"""
+Per-page performance metrics.
+
+After every 'page.goto' (and for the page a test ends on, e.g. after clicking a
+menu link) I read from the browser:
+  - Navigation Timing: TTFB, DOMContentLoaded, load;
+  - LCP and CLS (PerformanceObserver, Chromium only; None elsewhere);
+  - transferred bytes and request count (Resource Timing);
+  - DOM node count.
+
+Cross-origin resources without 'Timing-Allow-Origin' report a transfer size of 0,
+so 'transfer_bytes' is a lower bound for pages with third-party assets.
+
+The numbers of every test end up in one JSON report per run.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+REPORTS_DIR = Path("reports")
+
+# Registered before any page script runs, so LCP and CLS see the whole page load.
+INIT_SCRIPT = """
+(() => {
+    window.__palatoPerf = { lcp: null, cls: 0 };
+    try {
+        new PerformanceObserver((list) => {
+            const last = list.getEntries().pop();
+            if (last) window.__palatoPerf.lcp = last.renderTime || last.loadTime || last.startTime;
+        }).observe({ type: "largest-contentful-paint", buffered: true });
+        new PerformanceObserver((list) => {
+            for (const entry of list.getEntries()) {
+                if (!entry.hadRecentInput) window.__palatoPerf.cls += entry.value;
+            }
+        }).observe({ type: "layout-shift", buffered: true });
+    } catch (e) {
+        // Browser without LCP / layout-shift support: both stay unset.
+        window.__palatoPerf.cls = null;
+    }
+})();
+"""
+
+COLLECT_JS = """
+() => {
+    const nav = performance.getEntriesByType("navigation")[0];
+    const resources = performance.getEntriesByType("resource");
+    const round = (value) => (value === null || value === undefined) ? null : Math.round(value * 10) / 10;
+    const perf = window.__palatoPerf || { lcp: null, cls: null };
+    return {
+        url: location.href,
+        ttfb_ms: nav ? round(nav.responseStart) : null,
+        dom_content_loaded_ms: nav ? round(nav.domContentLoadedEventEnd) : null,
+        load_ms: nav ? round(nav.loadEventEnd) : null,
+        lcp_ms: round(perf.lcp),
+        cls: perf.cls === null ? null : Math.round(perf.cls * 10000) / 10000,
+        transfer_bytes: (nav ? nav.transferSize : 0) + resources.reduce((sum, r) => sum + (r.transferSize || 0), 0),
+        request_count: resources.length + (nav ? 1 : 0),
+        dom_nodes: document.getElementsByTagName("*").length,
+    };
+}
+"""
+
+
+class PageMetricsRecorder:
+    """
+    Collects the metrics of every page one test visits, plus the duration of its steps.
+    'pages' and 'steps' are plain lists of dicts (they travel with the test report).
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.pages = []
+        self.steps = []
+        # Called with the page after each collection (other per-page collectors hook in here).
+        self.on_collect = []
+        self._original_goto = None
+
+    def install(self):
+        self.page.add_init_script(INIT_SCRIPT)
+
+        # I wrap 'goto' on this page object only, so the tests don't change.
+        self._original_goto = self.page.goto
+
+        def goto(url, **kwargs):
+            started = time.perf_counter()
+            response = self._original_goto(url, **kwargs)
+            self.steps.append({"name": f"goto {urlsplit(url).path or '/'}", "duration_ms": _elapsed_ms(started)})
+            self.collect()
+            return response
+
+        self.page.goto = goto
+
+    def collect(self):
+        """Reads the metrics of the page currently loaded. Returns them (or None if the page is gone)."""
+        try:
+            metrics = self.page.evaluate(COLLECT_JS)
+        except Exception:
+            return None
+        metrics["path"] = urlsplit(metrics["url"]).path or "/"
+        self.pages.append(metrics)
+        for callback in self.on_collect:
+            callback(self.page)
+        return metrics
+
+    def finish(self):
+        """Collects the page the test ended on, if it was reached by a click rather than 'goto'."""
+        if self.page.is_closed():
+            return
+        if not self.pages or self.pages[-1]["url"] != self.page.url:
+            if self.page.url.startswith("http"):
+                self.collect()
+
+    @contextmanager
+    def step(self, name):
+        """Times a named step of a test: 'with page_metrics.step("Fill form"): ...'"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append({"name": name, "duration_ms": _elapsed_ms(started)})
+
+    def result(self):
+        return {"pages": self.pages, "steps": self.steps}
+
+
+class PerformanceReport:
+    """
+    Gathers the per-test results of a run and writes them as JSON.
+    It is registered as a PyTest plugin on the main process, so with '--workers'
+    it receives the reports (and metrics) of every worker.
+    """
+
+    def __init__(self, env, browser):
+        self.env = env
+        self.browser = browser
+        self.started_at = datetime.now(timezone.utc)
+        self.tests = {}
+        self.path = None
+
+    def pytest_runtest_logreport(self, report):
+        """Called with every test report (setup / call / teardown)."""
+        entry = self.tests.setdefault(report.nodeid, {"nodeid": report.nodeid, "outcome": "passed", "phases": {}})
+        entry["phases"][report.when] = round(report.duration * 1000, 1)
+        if report.failed:
+            entry["outcome"] = "failed"
+        elif report.skipped and entry["outcome"] == "passed":
+            entry["outcome"] = "skipped"
+
+        metrics = dict(report.user_properties).get("performance")
+        if metrics:
+            entry.update(metrics)
+
+    def pytest_sessionfinish(self):
+        if self.tests:
+            self.path = self.write()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.path:
+            terminalreporter.write_line(f"[ ⏱️ Performance ] Report saved to: {self.path}")
+
+    def write(self, reports_dir=REPORTS_DIR):
+        reports_dir.mkdir(parents=True, exist_ok=True)
+        stamp = self.started_at.strftime("%Y%m%dT%H%M%SZ")
+        path = reports_dir / f"performance-{self.env}-{stamp}.json"
+        data = {
+            "env": self.env,
+            "browser": self.browser,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "tests": list(self.tests.values()),
+        }
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        return path
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 1)
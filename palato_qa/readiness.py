@@ -0,0 +1,73 @@
+"""
+Readiness waits: wait for what a check needs, not for network silence.
+
+'wait_for_load_state("networkidle")' waits until no request was made for 500 ms,
+and every analytics beacon starts that clock again. A readiness target is a list
+of concrete signals instead, all evaluated in one in-page predicate (polled on
+every animation frame, so it returns on the first frame they all hold):
+  - document: the HTML is parsed;
+  - fonts: no web font is still loading (text metrics and layout are final);
+  - cf7: Contact Form 7's script ran its init and bound the form (it sets
+    'form.wpcf7' on every form it handles).
+
+    layout.wait_ready("contact-form")
+"""
+
+import json
+
+from playwright.async_api import TimeoutError as AsyncPlaywrightTimeoutError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+DEFAULT_TIMEOUT = 10_000
+
+# Signal name -> JS expression, true once the signal holds.
+SIGNALS = {
+    "document": 'document.readyState !== "loading"',
+    "fonts": '!document.fonts || document.fonts.status === "loaded"',
+    "cf7": '!!window.wpcf7 && Array.from(document.querySelectorAll("form.wpcf7-form")).some((form) => !!form.wpcf7)',
+}
+
+# Readiness target -> the signals it waits for.
+TARGETS = {
+    "page": ["document", "fonts"],
+    "contact-form": ["document", "fonts", "cf7"],
+}
+
+
+def signals_of(target):
+    if target not in TARGETS:
+        raise ValueError(f"Readiness target '{target}' unknown. Valid: {list(TARGETS)}")
+    return TARGETS[target]
+
+
+def ready_js(signals):
+    return "() => " + " && ".join(f"({SIGNALS[name]})" for name in signals)
+
+
+def missing_js(signals):
+    """Returns the names of the signals that don't hold yet (for the error message)."""
+    checks = ", ".join(f"({SIGNALS[name]}) ? null : {json.dumps(name)}" for name in signals)
+    return f"() => [{checks}].filter(Boolean)"
+
+
+def wait_ready(page, target, timeout=DEFAULT_TIMEOUT):
+    signals = signals_of(target)
+    try:
+        page.wait_for_function(ready_js(signals), timeout=timeout, polling="raf")
+    except PlaywrightTimeoutError:
+        missing = page.evaluate(missing_js(signals))
+        raise AssertionError(not_ready_message(target, timeout, missing)) from None
+
+
+async def wait_ready_async(page, target, timeout=DEFAULT_TIMEOUT):
+    """Same as 'wait_ready', with the async API."""
+    signals = signals_of(target)
+    try:
+        await page.wait_for_function(ready_js(signals), timeout=timeout, polling="raf")
+    except AsyncPlaywrightTimeoutError:
+        missing = await page.evaluate(missing_js(signals))
+        raise AssertionError(not_ready_message(target, timeout, missing)) from None
+
+
+def not_ready_message(target, timeout, missing):
+    return f"Page not ready for '{target}' after {timeout} ms, still waiting for: {', '.join(missing) or 'nothing (became ready just now)'}"
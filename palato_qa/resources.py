@@ -0,0 +1,124 @@
+"""
+Resource-blocking profiles.
+
+None of the functional checks look at images, fonts, video, analytics or
+third-party embeds, but every page load downloads them. A profile tells the
+context which requests to abort, which to answer with a tiny stub, and which to
+let through. Blocked requests are counted per test, and the bytes saved are
+estimated from the sizes seen on earlier unblocked runs (the bytes received for
+each URL, as Playwright measured them).
+"""
+
+import base64
+from urllib.parse import urlsplit
+
+from playwright.sync_api import Error as PlaywrightError
+
+# 1x1 transparent GIF: keeps <img> elements rendered (and visible) without downloading them.
+TRANSPARENT_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+# Profile name -> what to do with each request.
+#   "abort": Playwright resource types to abort.
+#   "stub": resource types answered with an empty/placeholder body.
+#   "third_party": abort every request outside the site's own domain.
+RESOURCE_PROFILES = {
+    "full": {"abort": set(), "stub": set(), "third_party": False},
+    "no-media": {"abort": {"media", "font"}, "stub": {"image"}, "third_party": False},
+    "no-third-party": {"abort": set(), "stub": set(), "third_party": True},
+    "text-only": {"abort": {"media", "font"}, "stub": {"image"}, "third_party": True},
+}
+
+DEFAULT_PROFILE = "full"
+
+
+def first_party_domain(base_url):
+    """'https://stag.palatodigital.com' -> 'palatodigital.com' (IPs and 'localhost' are kept as they are)."""
+    host = urlsplit(base_url).hostname or ""
+    labels = host.split(".")
+    if host.replace(".", "").isdigit() or len(labels) <= 2:
+        return host
+    return ".".join(labels[-2:])
+
+
+class ResourceBlocker:
+    """
+    Applies one profile to a browser context and keeps the per-test numbers.
+    'known_sizes' maps URL -> bytes received, learned from requests that were not blocked.
+    """
+
+    def __init__(self, profile_name, base_url, known_sizes):
+        if profile_name not in RESOURCE_PROFILES:
+            raise ValueError(f"Resource profile '{profile_name}' unknown. Valid: {list(RESOURCE_PROFILES)}")
+
+        self.profile_name = profile_name
+        self.profile = RESOURCE_PROFILES[profile_name]
+        self.domain = first_party_domain(base_url)
+        self.known_sizes = known_sizes
+        self.blocked_requests = 0
+        self.bytes_saved = 0
+        self.blocked_by_type = {}
+        self._blocked_urls = set()
+
+    def install(self, context):
+        context.on("requestfinished", self._learn_size)
+        if self.profile_name != "full":
+            context.route("**/*", self._handle)
+
+    def uninstall(self, context):
+        # Pooled contexts outlive the test, so I remove everything I attached.
+        context.remove_listener("requestfinished", self._learn_size)
+        if self.profile_name != "full":
+            context.unroute("**/*", self._handle)
+
+    def is_third_party(self, url):
+        host = urlsplit(url).hostname or ""
+        return not (host == self.domain or host.endswith(f".{self.domain}"))
+
+    def summary(self):
+        return {
+            "profile": self.profile_name,
+            "blocked_requests": self.blocked_requests,
+            "bytes_saved": self.bytes_saved,
+            "blocked_by_type": dict(self.blocked_by_type),
+        }
+
+    def _handle(self, route):
+        request = route.request
+        resource_type = request.resource_type
+
+        if request.url.startswith("data:"):
+            return route.fallback()
+
+        if self.profile["third_party"] and self.is_third_party(request.url):
+            self._count(request.url, "third-party")
+            return route.abort()
+
+        if resource_type in self.profile["abort"]:
+            self._count(request.url, resource_type)
+            return route.abort()
+
+        if resource_type in self.profile["stub"]:
+            self._count(request.url, resource_type)
+            return route.fulfill(status=200, content_type="image/gif", body=TRANSPARENT_GIF)
+
+        # 'fallback' (not 'continue_') lets other routes, e.g. HAR replay, handle the request.
+        route.fallback()
+
+    def _count(self, url, kind):
+        self._blocked_urls.add(url)
+        self.blocked_requests += 1
+        self.bytes_saved += self.known_sizes.get(url, 0)
+        self.blocked_by_type[kind] = self.blocked_by_type.get(kind, 0) + 1
+
+    def _learn_size(self, request):
+        # Stubbed responses would overwrite the real size with the placeholder's.
+        if request.url in self._blocked_urls or request.url.startswith("data:"):
+            return
+        # 'content-length' is missing on compressed and chunked responses (most WordPress assets),
+        # so I ask for the body size Playwright measured: one round trip, only for the URLs I don't know yet.
+        if request.url in self.known_sizes:
+            return
+        try:
+            self.known_sizes[request.url] = request.sizes()["responseBodySize"]
+        except PlaywrightError:
+            pass
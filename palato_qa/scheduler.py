@@ -0,0 +1,150 @@
+"""
+Duration-aware scheduling from the timing history of previous runs.
+
+Every run remembers, per test node id, a smoothed duration (setup + call + teardown)
+and its last outcomes. The next run orders the tests:
+  1. tests that failed recently first (fast feedback on what is probably still broken);
+  2. then the longest tests first, so parallel workers finish at about the same time
+     (pytest-xdist hands tests out in collection order).
+
+Tests of the same 'xdist_group' (the page-manifest checks of a URL) stay together,
+in their original order, and move as one block.
+
+With a time budget only the most valuable tests that fit are kept: recently failed
+and never-seen tests first, then the others by value per second.
+"""
+
+import re
+import statistics
+
+import pytest
+
+DURATIONS_CACHE_KEY = "palato/durations"
+
+# How many past outcomes I keep per test, and how much the last duration weighs in the average.
+HISTORY_LENGTH = 5
+SMOOTHING = 0.5
+
+# Duration of a test I have never seen, when there is no history at all (seconds).
+DEFAULT_DURATION = 5.0
+
+
+def parse_duration(text):
+    """'90', '90s', '2m', '1h' or '1m30s' -> seconds."""
+    units = {"h": 3600, "m": 60, "s": 1, "": 1}
+    parts = re.fullmatch(r"(?:\s*(\d+(?:\.\d+)?)\s*([hms]?))+\s*", text or "")
+    if not parts:
+        raise ValueError(f"Invalid duration '{text}' (examples: '60s', '2m', '1m30s')")
+    return sum(float(value) * units[unit] for value, unit in re.findall(r"(\d+(?:\.\d+)?)\s*([hms]?)", text))
+
+
+def group_of(item):
+    marker = item.get_closest_marker("xdist_group")
+    if marker is None:
+        return item.nodeid
+    return marker.args[0] if marker.args else marker.kwargs.get("name", item.nodeid)
+
+
+class TimingHistory:
+    """{nodeid: {"duration": seconds, "outcomes": ["passed", "failed", ...]}} (most recent outcome last)."""
+
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+
+    def record(self, nodeid, duration, failed):
+        entry = self.entries.get(nodeid)
+        if entry is None:
+            entry = self.entries[nodeid] = {"duration": duration, "outcomes": []}
+        else:
+            entry["duration"] = SMOOTHING * duration + (1 - SMOOTHING) * entry["duration"]
+        entry["outcomes"] = (entry["outcomes"] + ["failed" if failed else "passed"])[-HISTORY_LENGTH:]
+
+    def estimate(self, nodeid):
+        entry = self.entries.get(nodeid)
+        if entry is not None:
+            return entry["duration"]
+        known = [entry["duration"] for entry in self.entries.values()]
+        return statistics.median(known) if known else DEFAULT_DURATION
+
+    def is_known(self, nodeid):
+        return nodeid in self.entries
+
+    def recently_failed(self, nodeid):
+        return "failed" in self.entries.get(nodeid, {}).get("outcomes", [])
+
+    def failure_rate(self, nodeid):
+        outcomes = self.entries.get(nodeid, {}).get("outcomes", [])
+        return outcomes.count("failed") / len(outcomes) if outcomes else 0.0
+
+
+def blocks(items):
+    """Groups the items by 'xdist_group' (first appearance order). Returns [[item, ...], ...]."""
+    grouped = {}
+    for item in items:
+        grouped.setdefault(group_of(item), []).append(item)
+    return list(grouped.values())
+
+
+def order(items, history):
+    """Recently failed blocks first, then the longest blocks first."""
+    def key(block):
+        failed = any(history.recently_failed(item.nodeid) for item in block)
+        return (not failed, -sum(history.estimate(item.nodeid) for item in block))
+
+    return [item for block in sorted(blocks(items), key=key) for item in block]
+
+
+def fit_budget(items, history, seconds, workers=1):
+    """
+    Keeps the most valuable blocks whose total estimated time fits in 'seconds' of wall time
+    on 'workers' parallel workers. Returns (kept, dropped), both in the original order.
+    Value: recently failed and new tests are must-runs, then failure rate per second.
+    """
+    def value(block):
+        duration = sum(history.estimate(item.nodeid) for item in block) or 0.001
+        must_run = any(history.recently_failed(item.nodeid) or not history.is_known(item.nodeid) for item in block)
+        rate = sum(history.failure_rate(item.nodeid) for item in block)
+        return (must_run, (1 + rate) * len(block) / duration)
+
+    capacity = seconds * max(workers, 1)
+    kept_blocks, used = set(), 0.0
+    all_blocks = blocks(items)
+    for index in sorted(range(len(all_blocks)), key=lambda index: value(all_blocks[index]), reverse=True):
+        duration = sum(history.estimate(item.nodeid) for item in all_blocks[index])
+        if used + duration <= capacity:
+            kept_blocks.add(index)
+            used += duration
+
+    kept = [item for index, block in enumerate(all_blocks) if index in kept_blocks for item in block]
+    dropped = [item for index, block in enumerate(all_blocks) if index not in kept_blocks for item in block]
+    return kept, dropped
+
+
+class DurationRecorder:
+    """
+    Records the duration and outcome of every test of the run, registered as a PyTest plugin
+    on the main process (parallel workers send it their reports). 'save(entries)' stores the history.
+    """
+
+    def __init__(self, history, save):
+        self.history = history
+        self.save = save
+        self.durations = {}
+        self.failed = set()
+        self.skipped = set()
+
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+        if report.failed:
+            self.failed.add(report.nodeid)
+        elif report.skipped:
+            self.skipped.add(report.nodeid)
+
+    def pytest_sessionfinish(self, session):
+        # Stopped with -x or a failed session still teaches me something, an interrupted one doesn't.
+        if session.exitstatus not in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED):
+            return
+        for nodeid, duration in self.durations.items():
+            if nodeid not in self.skipped:
+                self.history.record(nodeid, duration, nodeid in self.failed)
+        self.save(self.history.entries)
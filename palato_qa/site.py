@@ -0,0 +1,12 @@
+"""
+Facts about the Palato Digital website shared by the suite and the standalone tools.
+"""
+
+# Environment name -> base URL ('--env'). 'local' and 'replay' are resolved at run time.
+ENVIRONMENTS = {
+    "stag": "https://stag.palatodigital.com",
+    "prod": "https://palatodigital.com",
+}
+
+# Menu links every page header must show.
+HEADER_NAV_LINKS = ["Serviços", "Sobre", "Vamos falar"]
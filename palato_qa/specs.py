@@ -0,0 +1,339 @@
+"""
+Spec-driven checks: the '## Checks' sections of 'specs/*.md' are the page data of the suite.
+
+The specs used to describe the same read-only checks that were hand-coded in
+'tests/', and the copies drifted apart. Every spec can end with a machine-readable
+section, and it is the only copy: the classic tests, the page manifest, the
+HTTP tier and the monitor all read it ('spec_pages'), and 'pytest --specs' runs it as generated
+items instead of the tests it covers:
+
+    ## Checks: `/portfolio/{slug}/`
+
+    | slug | title | website |
+    |---|---|---|
+    | alcmena | Alcmena | https://alcmena.pt |
+
+    - headings: `{title}`, `O que fizemos`, `Descrição`
+    - texts: `Explore mais`
+    - link-href: `{website}`
+    - budget: `transfer_bytes=8000000`
+    - header
+    - footer
+
+  - The URL is on the section heading. With a table, the section is a template:
+    one page per row, '{column}' replaced by the row's value.
+  - Values are code spans, inline (comma separated) or as nested bullets.
+  - Kinds: 'title' (page title contains), 'headings', 'texts', 'links' (link names,
+    or 'name -> href regex'), 'link-href' (an <a> with this exact href), 'message'
+    (a heading or the title matches this regex), 'social-links', 'header', 'footer'.
+  - Page properties (not items of their own, checked on the item that loads the
+    page): 'status' (the HTTP status the page answers with, 200 by default) and
+    'budget' ('metric=limit', see budgets.py).
+
+Each page becomes a few items, grouped by URL on the shared page of the manifest
+mode (one navigation per URL): all its headings, texts and links are checked in
+one batched evaluation ('content'), the other kinds are one item each. Adding a
+portfolio project is one table row, and costs one page load.
+
+Each file is parsed once per process ('spec_pages'): every test module, the
+manifest and '--specs' share the same parsed pages.
+"""
+
+import re
+import types
+from pathlib import Path
+
+import pytest
+from playwright.sync_api import expect
+
+from palato_qa.impact import SPEC_FEATURES
+from palato_qa.manifest import manifest_params
+
+SPECS_DIR = Path(__file__).resolve().parent.parent / "specs"
+
+KINDS = ["title", "headings", "texts", "links", "link-href", "message", "social-links", "header", "footer", "status", "budget"]
+
+# Kinds checked together in one in-page evaluation.
+BATCHED_KINDS = ["headings", "texts", "links"]
+
+# Kinds that describe the page instead of checking it (no test item of their own).
+PROPERTY_KINDS = ["status", "budget"]
+
+PROPERTY_FORMATS = {"status": re.compile(r"\d{3}"), "budget": re.compile(r"\w+=[\d_.]+")}
+
+CHECKS_HEADING = re.compile(r"^(#{2,6})\s+Checks:\s*`?([^`\s]+)`?\s*$")
+ANY_HEADING = re.compile(r"^(#{1,6})\s")
+BULLET = re.compile(r"^-\s+([a-z-]+)\s*(?::\s*(.*))?$")
+NESTED_BULLET = re.compile(r"^\s+-\s+(.*)$")
+PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+class SpecError(ValueError):
+    """A '## Checks' section that doesn't follow the grammar (the message has the file and line)."""
+
+
+def parse(text, source="spec"):
+    """
+    Returns the pages of every '## Checks' section:
+    [{"path": "/servicos/", "spec": source, "line": 12, "row": {...}, "checks": [{"kind": "headings", "values": [...]}, ...]}, ...]
+    'row' is the table row of a templated page ({} without a table).
+    """
+    pages = []
+    section = None
+
+    for number, line in enumerate(text.splitlines(), start=1):
+        heading = CHECKS_HEADING.match(line)
+        any_heading = ANY_HEADING.match(line)
+        if section and any_heading and len(any_heading.group(1)) <= section["level"]:
+            pages.extend(expand(section, source))
+            section = None
+        if heading:
+            section = {"level": len(heading.group(1)), "path": heading.group(2), "line": number, "table": [], "checks": []}
+            continue
+        if section is None or not line.strip():
+            continue
+
+        if line.lstrip().startswith("|"):
+            cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+            if not all(re.fullmatch(r":?-+:?", cell) for cell in cells):
+                section["table"].append(cells)
+            continue
+
+        bullet = BULLET.match(line)
+        nested = NESTED_BULLET.match(line)
+        if bullet:
+            kind = bullet.group(1)
+            if kind not in KINDS:
+                raise SpecError(f"{source}:{number}: unknown check '{kind}' (valid: {', '.join(KINDS)})")
+            section["checks"].append({"kind": kind, "values": values_of(bullet.group(2) or "")})
+        elif nested and section["checks"]:
+            section["checks"][-1]["values"].extend(values_of(nested.group(1)) or [nested.group(1).strip()])
+        else:
+            raise SpecError(f"{source}:{number}: expected '- <check>: <values>' or a table row, got: {line.strip()}")
+
+        check = section["checks"][-1]
+        pattern = PROPERTY_FORMATS.get(check["kind"])
+        for value in check["values"]:
+            if pattern and not pattern.fullmatch(value) and not PLACEHOLDER.search(value):
+                raise SpecError(f"{source}:{number}: invalid {check['kind']} '{value}' (expected /{pattern.pattern}/)")
+
+    if section:
+        pages.extend(expand(section, source))
+    return pages
+
+
+def values_of(text):
+    return re.findall(r"`([^`]*)`", text)
+
+
+def expand(section, source):
+    """One page per table row (placeholders filled in), or the section itself without a table."""
+    if not section["table"]:
+        rows = [{}]
+    else:
+        columns, *data = section["table"]
+        rows = [dict(zip(columns, row)) for row in data]
+
+    pages = []
+    for row in rows:
+        def fill(value, row=row):
+            try:
+                return PLACEHOLDER.sub(lambda match: row[match.group(1)], value)
+            except KeyError as e:
+                raise SpecError(f"{source}:{section['line']}: no column {e} in the table") from None
+
+        pages.append({
+            "path": fill(section["path"]),
+            "spec": source,
+            "line": section["line"],
+            "row": row,
+            "checks": [{"kind": check["kind"], "values": [fill(value) for value in check["values"]]} for check in section["checks"]],
+        })
+    return pages
+
+
+def load(path):
+    """The parsed pages of one spec file."""
+    return parse(path.read_text(encoding="utf-8"), source=path.name)
+
+
+_PAGES = {}
+
+
+def spec_pages(name=None):
+    """The pages of one spec file ('06_portfolio_projects_spec.md'), or of every spec, parsed once per process."""
+    names = [name] if name else sorted(path.name for path in SPECS_DIR.glob("*.md"))
+    pages = []
+    for spec_name in names:
+        if spec_name not in _PAGES:
+            _PAGES[spec_name] = load(SPECS_DIR / spec_name)
+        pages.extend(_PAGES[spec_name])
+    return pages
+
+
+def spec_page(name, path=None):
+    """The one page of a spec file (or its page with this path)."""
+    pages = [page for page in spec_pages(name) if path is None or page["path"] == path]
+    if len(pages) != 1:
+        raise SpecError(f"{name}: expected one '## Checks' page{f' for {path}' if path else ''}, found {len(pages)}")
+    return pages[0]
+
+
+def pages_by_path(pages):
+    """{path: [pages]}: the sections that check each URL, in order. They must agree on its status."""
+    grouped = {}
+    for page in pages:
+        sections = grouped.setdefault(page["path"], [])
+        if sections and status_of(sections[0]) != status_of(page):
+            raise SpecError(
+                f"{page['spec']}:{page['line']}: status {status_of(page)} for {page['path']}, "
+                f"but {sections[0]['spec']}:{sections[0]['line']} says {status_of(sections[0])}"
+            )
+        sections.append(page)
+    return grouped
+
+
+def merge_pages(sections):
+    """One page with the checks of every section of the same URL."""
+    return {**sections[0], "checks": [check for page in sections for check in page["checks"]]}
+
+
+def values(page, kind):
+    """Every value of one kind on a page, e.g. values(page, "headings")."""
+    return [value for check in page["checks"] if check["kind"] == kind for value in check["values"]]
+
+
+def has_check(page, kind):
+    return any(check["kind"] == kind for check in page["checks"])
+
+
+def link_patterns(names):
+    """['Serviços -> /servicos/', 'Sobre'] -> {'Serviços': '/servicos/', 'Sobre': None} (hrefs are regexes, searched)"""
+    links = {}
+    for name in names:
+        name, _, href = name.partition(" -> ")
+        links[name.strip()] = href.strip() or None
+    return links
+
+
+def status_of(page):
+    status = values(page, "status")
+    return int(status[-1]) if status else 200
+
+
+def budget_of(page):
+    """{'transfer_bytes': 8000000, ...}: the page's limits (see 'budgets'); a page without any has no budget."""
+    budget = {}
+    for value in values(page, "budget"):
+        metric, _, limit = value.partition("=")
+        limit = limit.replace("_", "")
+        budget[metric] = float(limit) if "." in limit else int(limit)
+    return budget
+
+
+def page_checks(page):
+    """A page's items: [(name, check)]. The batched kinds are merged into one 'content' check."""
+    content = {kind: [] for kind in BATCHED_KINDS}
+    others = []
+    for check in page["checks"]:
+        if check["kind"] in PROPERTY_KINDS:
+            continue
+        if check["kind"] in content:
+            content[check["kind"]].extend(check["values"])
+        else:
+            others.append((check["kind"], check))
+    items = [("content", {"kind": "content", **content})] if any(content.values()) else []
+    return items + others
+
+
+def verify_page(spec, page, layout):
+    """Runs every check of a spec page against a loaded page (the classic tests, after their own navigation)."""
+    for _, check in page_checks(spec):
+        run_check(check, page, layout)
+
+
+def run_check(check, page, layout):
+    kind, check_values = check["kind"], check.get("values", [])
+    if kind == "content":
+        layout.verify_all(headings=check["headings"], texts=check["texts"], links=link_patterns(check["links"]))
+    elif kind == "title":
+        for value in check_values:
+            expect(page).to_have_title(re.compile(re.escape(value)))
+    elif kind == "link-href":
+        for value in check_values:
+            expect(page.locator(f"a[href='{value}']").first).to_be_visible()
+    elif kind == "message":
+        pattern = re.compile("|".join(check_values), re.IGNORECASE)
+        heading = page.get_by_role("heading", name=pattern).first
+        layout.first_working("spec-message", [
+            ("heading", 2000, lambda timeout: expect(heading).to_be_visible(timeout=timeout)),
+            ("title", 5000, lambda timeout: expect(page).to_have_title(pattern, timeout=timeout)),
+        ])
+    elif kind == "social-links":
+        # Accessible name first, fallback to the href (icons without a name)
+        for social in check_values:
+            layout.first_working(f"social-link:{social}", [
+                ("accessible-name", 2000, lambda timeout: expect(page.get_by_role("link", name=social, exact=False).first).to_be_visible(timeout=timeout)),
+                ("href", 5000, lambda timeout: expect(page.locator(f"a[href*='{social.lower()}']").first).to_be_visible(timeout=timeout)),
+            ])
+    elif kind == "header":
+        layout.verify_header()
+    elif kind == "footer":
+        layout.verify_footer()
+
+
+def budget_marks(page):
+    """The page's 'budget' marker, when its spec declares limits."""
+    budget = budget_of(page)
+    return [pytest.mark.budget(**budget)] if budget else []
+
+
+def page_marks(page):
+    """
+    Keeps a URL's checks on the same parallel worker, tags the spec's features, and the homepage is smoke.
+    The page's HTTP status and budget are checked on the item that loads it.
+    """
+    marks = [
+        pytest.mark.xdist_group(page["path"]),
+        pytest.mark.features(*SPEC_FEATURES.get(page["spec"], [])),
+        pytest.mark.http_status(status_of(page)),
+    ]
+    if page["path"] == "/":
+        marks.append(pytest.mark.smoke)
+    return marks + budget_marks(page)
+
+
+def path_marks(pages):
+    """{path: marks}: the marks of every section of a URL added up (features, budgets), so none is lost."""
+    return {path: [mark for page in sections for mark in page_marks(page)] for path, sections in pages_by_path(pages).items()}
+
+
+class SpecModule(pytest.Module):
+    """
+    A spec file collected as a test module: one parametrized 'test_page_check', like the
+    page manifest's, so the generated items get the same fixtures, parameters and shared pages.
+    """
+
+    def _getobj(self):
+        module = types.ModuleType(self.path.stem)
+        module.__file__ = str(self.path)
+
+        manifest = {}
+        try:
+            pages = spec_pages(self.path.name)
+            for page in pages:
+                manifest.setdefault(page["path"], []).extend(page_checks(page))
+            marks = path_marks(pages)
+        except SpecError as e:
+            raise self.CollectError(str(e)) from None
+        if not manifest:
+            return module
+
+        @pytest.mark.spec_check
+        @pytest.mark.parametrize("path, check", manifest_params(manifest, marks.get))
+        def test_page_check(shared_page, shared_layout, path, check):
+            """Runs one check of the spec against the shared page of its URL."""
+            run_check(check, shared_page, shared_layout)
+
+        module.test_page_check = test_page_check
+        return module
@@ -0,0 +1,85 @@
+"""
+Adaptive locator-strategy cache.
+
+Some checks have a fallback chain (e.g. the logo by alt text, then by '#logo').
+When the first strategy is the wrong one for a page, every run pays its full
+timeout before the fallback is tried. The cache remembers, per page path and
+check name, which strategy worked last time and tries it first. If it stops
+working, the entry is dropped and the normal order is used again.
+"""
+
+from urllib.parse import urlsplit
+
+CACHE_KEY = "palato/locator-strategies"
+
+
+class StrategyCache:
+    """
+    {"<page path>::<check name>": "<strategy name>"}, persisted in the PyTest cache.
+    Only the entries changed in this process are written back, so parallel workers don't undo each other.
+    """
+
+    def __init__(self, entries):
+        self.entries = dict(entries)
+        self._changed = {}
+
+    @staticmethod
+    def key(page_url, check):
+        return f"{urlsplit(page_url).path or '/'}::{check}"
+
+    def run(self, page_url, check, strategies):
+        """
+        Runs the first strategy that passes.
+        'strategies' is the default order: a list of (name, timeout_ms, check_function(timeout_ms)).
+        Returns (strategy name, timeout ms avoided thanks to the cache).
+        """
+        if not strategies:
+            raise ValueError(f"No strategy given for '{check}'")
+
+        key = self.key(page_url, check)
+        preferred = self.entries.get(key)
+        ordered = sorted(strategies, key=lambda strategy: strategy[0] != preferred)
+
+        last_error = None
+        for name, timeout, check_function in ordered:
+            try:
+                check_function(timeout)
+            except AssertionError as e:
+                last_error = e
+                if name == preferred:
+                    self._set(key, None)
+                continue
+
+            self._set(key, name)
+            return name, self._avoided_ms(strategies, name) if name == preferred else 0
+
+        raise last_error
+
+    def save(self, cache):
+        """Merges my changes into the stored entries."""
+        stored = cache.get(CACHE_KEY, {})
+        for key, name in self._changed.items():
+            if name is None:
+                stored.pop(key, None)
+            else:
+                stored[key] = name
+        cache.set(CACHE_KEY, stored)
+
+    def _set(self, key, name):
+        if self.entries.get(key) == name:
+            return
+        if name is None:
+            self.entries.pop(key, None)
+        else:
+            self.entries[key] = name
+        self._changed[key] = name
+
+    @staticmethod
+    def _avoided_ms(strategies, name):
+        # Without the cache, every strategy before the working one would have timed out first.
+        avoided = 0
+        for strategy_name, timeout, _ in strategies:
+            if strategy_name == name:
+                break
+            avoided += timeout
+        return avoided
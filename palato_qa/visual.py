@@ -0,0 +1,295 @@
+"""
+Visual regression snapshots: full-page captures compared with a baseline per page.
+
+The other checks only look at texts, so a theme update that keeps the headings
+but wrecks the layout passes them all. With '--visual', every page a browser test
+loads (and every page of a crawl with 'crawler --visual') is captured at the
+1920x1080 viewport and compared with its baseline:
+
+    snapshots/<env>/<browser>/<page>.png
+
+The comparison is tiled, so unchanged areas cost almost nothing:
+  - both images are cut in 64x64 tiles and every tile is hashed (CRC32);
+  - tiles with the same hash are skipped;
+  - only the remaining tiles get the perceptual diff: a colour distance in YIQ
+    space per pixel (the same measure as pixelmatch), vectorized with NumPy, so
+    anti-aliasing noise under the threshold doesn't count;
+  - the page fails when more than 'max_diff_ratio' of its pixels changed, and a
+    diff image (changes in red) is written to 'reports/visual/'.
+
+Baselines are decoded once per process and kept with their tile hashes, so a
+page compared by several tests is read from disk only once.
+
+Dynamic content is masked: elements matching the mask selectors are painted with
+one flat colour by Playwright (in the baseline and the capture alike), and
+'regions' (x, y, width, height) are blanked before the comparison.
+
+NumPy and Pillow are optional: only '--visual' needs them (pip install numpy pillow).
+"""
+
+import io
+import os
+import re
+import time
+import zlib
+from pathlib import Path
+from urllib.parse import urlsplit
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    np = Image = None
+
+from palato_qa.performance import REPORTS_DIR
+
+SNAPSHOTS_DIR = Path("snapshots")
+DIFFS_DIR = REPORTS_DIR / "visual"
+
+VISUAL_MODES = ["off", "compare", "update"]
+
+TILE = 64
+
+# Per-pixel YIQ distance threshold (0..1), as in pixelmatch: below it two colours look the same.
+PIXEL_THRESHOLD = 0.1
+
+# Share of the page's pixels allowed to change before it fails.
+MAX_DIFF_RATIO = 0.001
+
+# Content that changes on every load (embedded maps, videos).
+DEFAULT_MASKS = ["iframe", "video"]
+MASK_COLOR = "#FF00FF"
+
+SCREENSHOT_OPTIONS = {"full_page": True, "animations": "disabled", "caret": "hide", "scale": "css"}
+
+# Largest possible YIQ distance between two colours.
+MAX_YIQ_DELTA = 35215.0
+YIQ = None if np is None else np.array([
+    [0.29889531, 0.59597799, 0.21147017],
+    [0.58662247, -0.27417610, -0.52261711],
+    [0.11448223, -0.32180189, 0.31114694],
+], dtype=np.float32)
+
+
+def is_available():
+    return np is not None
+
+
+def snapshot_name(url):
+    """'https://site.com/' -> 'home', '/politica-de-privacidade/' -> 'politica-de-privacidade'"""
+    path = urlsplit(url).path.strip("/")
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", path) or "home"
+
+
+def screenshot_args(page, masks=DEFAULT_MASKS):
+    return dict(SCREENSHOT_OPTIONS, mask=[page.locator(selector) for selector in masks], mask_color=MASK_COLOR)
+
+
+def decode(png):
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGB"))
+
+
+def blank_regions(pixels, regions):
+    if not regions:
+        return pixels
+    pixels = pixels.copy()
+    for x, y, width, height in regions:
+        pixels[y:y + height, x:x + width] = 0
+    return pixels
+
+
+def tile_grid(pixels):
+    """(height, width, 3) pixels -> (rows, cols, TILE, TILE, 3) tiles, padded with black to whole tiles."""
+    height, width, _ = pixels.shape
+    rows, cols = -(-height // TILE), -(-width // TILE)
+    padded = np.zeros((rows * TILE, cols * TILE, 3), dtype=np.uint8)
+    padded[:height, :width] = pixels
+    return np.ascontiguousarray(padded.reshape(rows, TILE, cols, TILE, 3).swapaxes(1, 2))
+
+
+def tile_hashes(tiles):
+    rows, cols = tiles.shape[:2]
+    flat = tiles.reshape(rows * cols, -1)
+    return np.fromiter((zlib.crc32(tile) for tile in flat), dtype=np.uint32, count=rows * cols).reshape(rows, cols)
+
+
+def changed_pixels(before, after, threshold=PIXEL_THRESHOLD):
+    """Perceptual per-pixel diff of two stacks of tiles (..., 3): True where the colours look different."""
+    # YIQ is linear, so the YIQ of the difference is the difference of the YIQs.
+    delta = (before.astype(np.float32) - after.astype(np.float32)) @ YIQ
+    distance = 0.5053 * delta[..., 0] ** 2 + 0.299 * delta[..., 1] ** 2 + 0.1957 * delta[..., 2] ** 2
+    return distance > MAX_YIQ_DELTA * threshold * threshold
+
+
+class Snapshot:
+    """Decoded page capture, kept as tiles with their hashes."""
+
+    def __init__(self, pixels):
+        self.height, self.width = pixels.shape[:2]
+        self.tiles = tile_grid(pixels)
+        self.hashes = tile_hashes(self.tiles)
+
+    def resized(self, rows, cols):
+        """The same tiles on a bigger grid (black tiles added), to compare pages of different heights."""
+        if self.tiles.shape[:2] == (rows, cols):
+            return self.tiles, self.hashes
+        tiles = np.zeros((rows, cols, TILE, TILE, 3), dtype=np.uint8)
+        old_rows, old_cols = self.tiles.shape[:2]
+        tiles[:old_rows, :old_cols] = self.tiles
+        hashes = np.zeros((rows, cols), dtype=np.uint32)
+        hashes[:old_rows, :old_cols] = self.hashes
+        # An added tile must never match a real one.
+        hashes[old_rows:, :] = hashes[:, old_cols:] = 0xFFFFFFFF
+        return tiles, hashes
+
+
+class Comparison:
+    """Result of one page comparison ('status' is 'same', 'changed' or 'new' for a page without a baseline)."""
+
+    def __init__(self, name, status, changed=0, total=0, changed_tiles=0, tiles=0, duration_ms=0.0, size=None):
+        self.name = name
+        self.status = status
+        self.changed = changed
+        self.total = total
+        self.changed_tiles = changed_tiles
+        self.tiles = tiles
+        self.duration_ms = duration_ms
+        self.size = size
+        self.max_ratio = MAX_DIFF_RATIO
+        self.diff_path = None
+
+    @property
+    def ratio(self):
+        return self.changed / self.total if self.total else 0.0
+
+    @property
+    def passed(self):
+        return self.status != "changed" or self.ratio <= self.max_ratio
+
+    def describe(self):
+        if self.status == "new":
+            return f"{self.name}: new baseline"
+        if self.status == "same":
+            return f"{self.name}: unchanged (compared in {self.duration_ms:.0f} ms)"
+        text = (f"{self.name}: {self.ratio:.2%} of pixels changed "
+                f"({self.changed_tiles}/{self.tiles} tiles differ, compared in {self.duration_ms:.0f} ms)")
+        if self.size:
+            text += f", size {self.size[0]} -> {self.size[1]}"
+        if self.diff_path:
+            text += f", diff: {self.diff_path}"
+        return text
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "status": self.status,
+            "ratio": round(self.ratio, 6),
+            "passed": self.passed,
+            "changed_tiles": self.changed_tiles,
+            "tiles": self.tiles,
+            "duration_ms": self.duration_ms,
+            "diff": str(self.diff_path) if self.diff_path else None,
+        }
+
+
+class SnapshotStore:
+    """
+    Baselines of one environment and browser. 'update=True' replaces them with the new captures;
+    otherwise a page without a baseline gets one, and the others are compared with it.
+    """
+
+    def __init__(self, env, browser_name, update=False, threshold=PIXEL_THRESHOLD, root=SNAPSHOTS_DIR, diffs_dir=DIFFS_DIR):
+        self.directory = root / env / browser_name
+        self.diffs_directory = diffs_dir / env / browser_name
+        self.update = update
+        self.threshold = threshold
+        # Baseline PNG bytes per page, and decoded baselines per (page, blanked regions).
+        self._pngs = {}
+        self._baselines = {}
+
+    def check(self, page, masks=DEFAULT_MASKS, regions=(), max_ratio=MAX_DIFF_RATIO):
+        """Captures the page and compares it with its baseline. Returns a Comparison."""
+        png = page.screenshot(**screenshot_args(page, masks))
+        return self.compare(snapshot_name(page.url), png, regions, max_ratio)
+
+    def compare(self, name, png, regions=(), max_ratio=MAX_DIFF_RATIO):
+        started = time.perf_counter()
+        path = self.directory / f"{name}.png"
+        if self.update or not path.exists():
+            self._save(path, png)
+            self._pngs.pop(name, None)
+            self._baselines = {key: snapshot for key, snapshot in self._baselines.items() if key[0] != name}
+            return Comparison(name, "new")
+
+        # Same encoded bytes: nothing to decode.
+        if png == self._png(name, path):
+            return Comparison(name, "same", duration_ms=round((time.perf_counter() - started) * 1000, 1))
+
+        baseline = self._baseline(name, path, regions)
+        capture = Snapshot(blank_regions(decode(png), regions))
+        comparison, pixels = self._diff(name, baseline, capture, started)
+        comparison.max_ratio = max_ratio
+        if not comparison.passed:
+            comparison.diff_path = self._write_diff(name, capture, pixels)
+        return comparison
+
+    def _png(self, name, path):
+        if name not in self._pngs:
+            self._pngs[name] = path.read_bytes()
+        return self._pngs[name]
+
+    def _baseline(self, name, path, regions):
+        key = (name, tuple(map(tuple, regions)))
+        if key not in self._baselines:
+            self._baselines[key] = Snapshot(blank_regions(decode(self._png(name, path)), regions))
+        return self._baselines[key]
+
+    def _diff(self, name, baseline, capture, started):
+        """Returns the Comparison and the changed pixels, per tile: (rows, cols, TILE, TILE) booleans."""
+        rows = max(baseline.tiles.shape[0], capture.tiles.shape[0])
+        cols = max(baseline.tiles.shape[1], capture.tiles.shape[1])
+        before, before_hashes = baseline.resized(rows, cols)
+        after, after_hashes = capture.resized(rows, cols)
+
+        # Only the tiles whose hashes differ get the pixel diff.
+        differing = before_hashes != after_hashes
+        pixels = np.zeros((rows, cols, TILE, TILE), dtype=bool)
+        if differing.any():
+            pixels[differing] = changed_pixels(before[differing], after[differing], self.threshold)
+
+        changed_tiles = int(pixels.any(axis=(2, 3)).sum())
+        size = None
+        if (baseline.width, baseline.height) != (capture.width, capture.height):
+            size = (f"{baseline.width}x{baseline.height}", f"{capture.width}x{capture.height}")
+        comparison = Comparison(
+            name,
+            "changed" if changed_tiles or size else "same",
+            changed=int(pixels.sum()),
+            total=max(baseline.width * baseline.height, capture.width * capture.height),
+            changed_tiles=changed_tiles,
+            tiles=rows * cols,
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+            size=size,
+        )
+        return comparison, pixels
+
+    def _write_diff(self, name, capture, pixels):
+        """The capture, dimmed, with the changed pixels in red."""
+        rows, cols = pixels.shape[:2]
+        mask = pixels.swapaxes(1, 2).reshape(rows * TILE, cols * TILE)
+        image, _ = capture.resized(rows, cols)
+        image = (image.swapaxes(1, 2).reshape(rows * TILE, cols * TILE, 3) // 3).astype(np.uint8)
+        image[mask] = (255, 0, 0)
+
+        self.diffs_directory.mkdir(parents=True, exist_ok=True)
+        path = self.diffs_directory / f"{name}-diff.png"
+        Image.fromarray(image).save(path, optimize=False)
+        return path
+
+    @staticmethod
+    def _save(path, png):
+        # Parallel workers may save the same page: write aside, then replace in one step.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_bytes(png)
+        os.replace(temporary, path)
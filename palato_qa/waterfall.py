@@ -0,0 +1,311 @@
+"""
+Network waterfall of every page, with a baseline per URL and environment.
+
+With '--waterfall', every request of a browser test's context (all its pages and
+popups) is recorded from the 'request', 'response' and 'requestfinished' /
+'requestfailed' events, and grouped by page (a page starts with each main-frame
+navigation). Each request is one small tuple:
+
+    (url, domain, type, start_ms, duration_ms, bytes, status, cache)
+
+'url' is the domain + path (query dropped), 'start_ms' is relative to the page's
+navigation request, and the strings are interned, so crawling many pages keeps
+one copy of each domain and type. 'bytes' is the 'content-length' (or the body
+size Playwright measured when the header is missing); 'cache' is read from the
+CDN / page-cache headers ('hit', 'miss', 'revalidated' or '-').
+
+At the end of the run, on the main process:
+  - the requests are added up per domain and per resource type;
+  - every page is compared with its baseline (new requests, removed requests,
+    biggest size and time increases, above a noise floor) in a diff table;
+  - pages without a baseline (or all of them with '--waterfall=update') become the
+    new baseline, kept in the PyTest cache;
+  - everything is written to 'reports/waterfall-<timestamp>.json'.
+"""
+
+import json
+import sys
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from playwright.sync_api import Error as PlaywrightError
+
+from palato_qa.performance import REPORTS_DIR
+
+WATERFALL_CACHE_KEY = "palato/waterfall"
+
+WATERFALL_MODES = ["off", "diff", "update"]
+
+# Positions in a request tuple.
+URL, DOMAIN, TYPE, START, DURATION, BYTES, STATUS, CACHE = range(8)
+
+# Response headers that tell if a CDN or page cache served the request.
+CACHE_HEADERS = ["cf-cache-status", "x-cache", "x-litespeed-cache", "x-proxy-cache", "x-cache-status"]
+
+# Rows per change kind in the diff table.
+DIFF_ROWS = 5
+
+# Time increases below this are noise (the same request varies that much between runs).
+MIN_TIME_INCREASE_MS = 100
+
+# A size increase is only reported when it is at least this many bytes and this fraction of the old size
+# (a rebuilt asset or a new nonce changes it by a few bytes).
+MIN_SIZE_INCREASE_BYTES = 2 * 1024
+MIN_SIZE_INCREASE_RATIO = 0.10
+
+
+def request_key(url):
+    """'https://cdn.site.com/a.css?ver=2' -> ('cdn.site.com/a.css', 'cdn.site.com')"""
+    parts = urlsplit(url)
+    domain = sys.intern(parts.hostname or parts.scheme)
+    return f"{domain}{parts.path}", domain
+
+
+def cache_status(status, headers):
+    if status == 304:
+        return "revalidated"
+    for name in CACHE_HEADERS:
+        value = headers.get(name)
+        if value:
+            return "hit" if "hit" in value.lower() else "miss"
+    return "-"
+
+
+class NetworkRecorder:
+    """
+    Records the requests of one test's context, grouped by page.
+    'pages' is a list of {"url": ..., "requests": [tuple, ...]} (it travels with the test report).
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.pages = []
+        # Request -> [page, status, bytes, cache] while it's in flight.
+        self._open = {}
+        # (page, index, request) of finished requests without a 'content-length'.
+        self._unsized = []
+
+    def install(self):
+        self.context.on("request", self._on_request)
+        self.context.on("response", self._on_response)
+        self.context.on("requestfinished", self._on_finished)
+        self.context.on("requestfailed", self._on_failed)
+
+    def uninstall(self):
+        # Pooled contexts outlive the test, so I remove everything I attached.
+        self.context.remove_listener("request", self._on_request)
+        self.context.remove_listener("response", self._on_response)
+        self.context.remove_listener("requestfinished", self._on_finished)
+        self.context.remove_listener("requestfailed", self._on_failed)
+
+    def finish(self):
+        """Measures the bodies sent without 'content-length' (one round trip each, while the pages are open)."""
+        for page, index, request in self._unsized:
+            try:
+                size = request.sizes()["responseBodySize"]
+            except PlaywrightError:
+                continue
+            entry = page["requests"][index]
+            page["requests"][index] = entry[:BYTES] + (size,) + entry[BYTES + 1:]
+        self._unsized.clear()
+        self._open.clear()
+
+    def result(self):
+        return [{"url": page["url"], "requests": page["requests"]} for page in self.pages]
+
+    def _on_request(self, request):
+        if request.url.startswith("data:"):
+            return
+        if request.is_navigation_request() and request.redirected_from is None and self._is_main_frame(request):
+            self.pages.append({"url": request.url, "started": None, "requests": []})
+        if self.pages:
+            self._open[request] = [self.pages[-1], 0, None, "-"]
+
+    def _on_response(self, response):
+        state = self._open.get(response.request)
+        if state is None:
+            return
+        # 'headers' is already known on the Python side, so this costs no extra round trip.
+        headers = response.headers
+        length = headers.get("content-length")
+        state[1] = response.status
+        state[2] = int(length) if length and length.isdigit() else None
+        state[3] = cache_status(response.status, headers)
+
+    def _on_finished(self, request):
+        self._close(request, failed=False)
+
+    def _on_failed(self, request):
+        self._close(request, failed=True)
+
+    def _close(self, request, failed):
+        state = self._open.pop(request, None)
+        if state is None:
+            return
+        page, status, size, cache = state
+
+        timing = request.timing
+        started = timing.get("startTime", -1)
+        if page["started"] is None and started >= 0:
+            page["started"] = started
+        start_ms = round(started - page["started"], 1) if started >= 0 and page["started"] is not None else None
+        duration_ms = round(timing["responseEnd"], 1) if timing.get("responseEnd", -1) >= 0 else None
+
+        url, domain = request_key(request.url)
+        page["requests"].append(
+            (url, domain, sys.intern(request.resource_type), start_ms, duration_ms, size or 0, 0 if failed else status, cache)
+        )
+        if size is None and not failed:
+            self._unsized.append((page, len(page["requests"]) - 1, request))
+
+    @staticmethod
+    def _is_main_frame(request):
+        try:
+            return request.frame.parent_frame is None
+        except PlaywrightError:
+            # Service worker requests have no frame.
+            return False
+
+
+def aggregate(requests, column):
+    """Totals per domain (column=DOMAIN) or resource type (column=TYPE): {key: {"requests", "bytes", "time_ms"}}"""
+    totals = {}
+    for entry in requests:
+        total = totals.setdefault(entry[column], {"requests": 0, "bytes": 0, "time_ms": 0.0})
+        total["requests"] += 1
+        total["bytes"] += entry[BYTES]
+        total["time_ms"] = round(total["time_ms"] + (entry[DURATION] or 0), 1)
+    return dict(sorted(totals.items(), key=lambda item: -item[1]["bytes"]))
+
+
+def baseline_of(requests):
+    """The part of a page's waterfall kept as its baseline: {url: [bytes, duration_ms]} (first request of each URL)."""
+    baseline = {}
+    for entry in requests:
+        baseline.setdefault(entry[URL], [entry[BYTES], entry[DURATION]])
+    return baseline
+
+
+def diff(baseline, requests):
+    """Compares a page with its baseline. Returns {"new", "removed", "bigger", "slower"}, lists of rows."""
+    current = baseline_of(requests)
+    new = sorted(([url, *current[url]] for url in current.keys() - baseline.keys()), key=lambda row: -row[1])
+    removed = sorted(([url, *baseline[url]] for url in baseline.keys() - current.keys()), key=lambda row: -row[1])
+
+    bigger, slower = [], []
+    for url in current.keys() & baseline.keys():
+        (old_bytes, old_ms), (new_bytes, new_ms) = baseline[url], current[url]
+        if new_bytes - old_bytes >= max(MIN_SIZE_INCREASE_BYTES, old_bytes * MIN_SIZE_INCREASE_RATIO):
+            bigger.append([url, old_bytes, new_bytes])
+        if old_ms is not None and new_ms is not None and new_ms - old_ms >= MIN_TIME_INCREASE_MS:
+            slower.append([url, old_ms, new_ms])
+    bigger.sort(key=lambda row: row[1] - row[2])
+    slower.sort(key=lambda row: row[1] - row[2])
+    return {"new": new, "removed": removed, "bigger": bigger[:DIFF_ROWS], "slower": slower[:DIFF_ROWS]}
+
+
+class WaterfallReport:
+    """
+    Gathers the waterfalls of a run (first visit of each URL per environment), registered as
+    a PyTest plugin on the main process. 'load' and 'save' read and write the baselines of one environment.
+    """
+
+    def __init__(self, mode, load, save):
+        self.mode = mode
+        self.load = load
+        self.save = save
+        self.started_at = datetime.now(timezone.utc)
+        # (env, path) -> requests
+        self.pages = {}
+        self.diffs = {}
+        self.path = None
+
+    def pytest_runtest_logreport(self, report):
+        waterfall = dict(report.user_properties).get("waterfall")
+        if not waterfall or report.when != "teardown":
+            return
+        for page in waterfall["pages"]:
+            path = urlsplit(page["url"]).path or "/"
+            self.pages.setdefault((waterfall["env"], path), page["requests"])
+
+    def pytest_sessionfinish(self):
+        if not self.pages:
+            return
+        for env in sorted({env for env, _ in self.pages}):
+            baselines = self.load(env)
+            for (page_env, path), requests in self.pages.items():
+                if page_env != env:
+                    continue
+                if path in baselines and self.mode != "update":
+                    self.diffs[(env, path)] = diff(baselines[path], requests)
+                else:
+                    baselines[path] = baseline_of(requests)
+            self.save(env, baselines)
+        self.path = self.write()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.pages:
+            return
+        terminalreporter.section("network waterfall")
+        all_requests = [entry for requests in self.pages.values() for entry in requests]
+        for title, column in (("domain", DOMAIN), ("type", TYPE)):
+            terminalreporter.write_line(f"  {'per ' + title:<40} {'requests':>9} {'size':>10} {'time (s)':>9}")
+            for key, total in list(aggregate(all_requests, column).items())[:8]:
+                terminalreporter.write_line(
+                    f"  {key:<40} {total['requests']:>9} {format_bytes(total['bytes']):>10} {total['time_ms'] / 1000:>9.1f}"
+                )
+            terminalreporter.write_line("")
+
+        for (env, path), changes in sorted(self.diffs.items()):
+            if not any(changes.values()):
+                continue
+            terminalreporter.write_line(f"  {path} ({env}) vs baseline:", bold=True)
+            for url, size, ms in changes["new"][:DIFF_ROWS]:
+                terminalreporter.write_line(f"      + new      {shorten(url)}  {format_bytes(size)}, {format_ms(ms)}", yellow=True)
+            for url, size, ms in changes["removed"][:DIFF_ROWS]:
+                terminalreporter.write_line(f"      - removed  {shorten(url)}  {format_bytes(size)}, {format_ms(ms)}")
+            for url, old, new in changes["bigger"]:
+                terminalreporter.write_line(
+                    f"      ▲ size     {shorten(url)}  +{format_bytes(new - old)} ({format_bytes(old)} -> {format_bytes(new)})", red=True
+                )
+            for url, old, new in changes["slower"]:
+                terminalreporter.write_line(
+                    f"      ▲ time     {shorten(url)}  +{format_ms(new - old)} ({format_ms(old)} -> {format_ms(new)})", red=True
+                )
+
+        new_baselines = len(self.pages) - len(self.diffs)
+        if new_baselines:
+            terminalreporter.write_line(f"[ 🌊 Waterfall ] {new_baselines} page(s) saved as the new baseline")
+        terminalreporter.write_line(f"[ 🌊 Waterfall ] Report saved to: {self.path}")
+
+    def write(self, reports_dir=REPORTS_DIR):
+        reports_dir.mkdir(parents=True, exist_ok=True)
+        stamp = self.started_at.strftime("%Y%m%dT%H%M%SZ")
+        path = reports_dir / f"waterfall-{stamp}.json"
+        pages = []
+        for (env, page_path), requests in sorted(self.pages.items()):
+            pages.append({
+                "env": env,
+                "path": page_path,
+                "by_domain": aggregate(requests, DOMAIN),
+                "by_type": aggregate(requests, TYPE),
+                "diff": self.diffs.get((env, page_path)),
+                "requests": [dict(zip(("url", "domain", "type", "start_ms", "duration_ms", "bytes", "status", "cache"), entry))
+                             for entry in requests],
+            })
+        data = {"started_at": self.started_at.isoformat(timespec="seconds"), "pages": pages}
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        return path
+
+
+def format_bytes(size):
+    # Always KB, so the sizes of a table or a row compare at a glance.
+    return f"{size / 1024:,.1f} KB"
+
+
+def format_ms(ms):
+    return "? ms" if ms is None else f"{ms:.0f} ms"
+
+
+def shorten(url, width=60):
+    return url if len(url) <= width else "…" + url[-(width - 1):]
@@ -2,8 +2,16 @@ import pytest
 import re
 from playwright.sync_api import Page, expect
 
+from palato_qa import specs
+
+# The content of the page (intro, philosophy cards, ...) comes from the spec: specs/03_about_navigation.md, '## Checks'.
+# Note: The quotes around "moda" might vary (straight vs curly). The spec has “moda”.
+ABOUT_PAGE = specs.spec_page("03_about_navigation.md")
+
 # --- Test -> About Page Navigation ---
 
+pytestmark = [pytest.mark.covered_by_manifest, pytest.mark.features("about", "header", "footer")]
+
 def test_about_page_navigation(page: Page, base_url, layout):
     """
     Test Scenario: Verify navigation to the About page and check its key content.
@@ -27,41 +35,7 @@ def test_about_page_navigation(page: Page, base_url, layout):
     # 3. Verify URL Check
     expect(page).to_have_url(re.compile(r".*/sobre/"))
 
-    # 4. Verify Main Content
-    
-    # 4.1 Check Main Heading (H1) -> 'O "Palato" por trás do Digital'
-    # We use single quotes for the string wrapper to allow double quotes inside.
-    # exact=False helps if there's surrounding whitespace.
-    expect(page.get_by_role("heading", name='O "Palato" por trás do Digital', exact=False)).to_be_visible()
-
-    # 4.2 Verify Intro Text
-    # "O Palato Digital é o seu parceiro especialista..."
-    # We locate by text containing the partial string.
-    expect(page.get_by_text("O Palato Digital é o seu parceiro especialista")).to_be_visible()
-
-    # 5. Verify Philosophy Section
-    
-    # 5.1 Verify Section Title "A nossa filosofia"
-    # Inspecting finding showed this as visible text, possibly a heading or just strong text.
-    expect(page.get_by_text("A nossa filosofia")).to_be_visible()
-
-    # 5.2 Verify Philosophy Cards
-    # Card 1: 'Parceiros, não fornecedores'
-    expect(page.get_by_text("Parceiros, não fornecedores")).to_be_visible()
-
-    # Card 2: 'Performance, não “moda”'
-    # Note: The quotes around "moda" might vary (straight vs curly).
-    # We can use regex to be safe or try strict string if copy-paste from source is exact.
-    # Given the source prompt had “moda”, we use that.
-    expect(page.get_by_text("Performance, não “moda”")).to_be_visible()
-
-    # Card 3: 'Design, não decoração'
-    expect(page.get_by_text("Design, não decoração")).to_be_visible()
-
-    # 6. Verify Layout (Header & Footer)
-    
-    # Header: Check for Logo and Menu
-    layout.verify_header()
-
-    # Footer: Check for footer element or contentinfo
-    layout.verify_footer()
+    # 4. Main Content, 5. Philosophy Section and 6. Layout (Header & Footer)
+    # H1 'O "Palato" por trás do Digital', the intro text, "A nossa filosofia" and its cards
+    # (checked in one batch), then the header and footer, as listed in the spec.
+    specs.verify_page(ABOUT_PAGE, page, layout)
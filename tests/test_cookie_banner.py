@@ -0,0 +1,40 @@
+import pytest
+from playwright.sync_api import expect
+
+# --- Test -> Cookie Banner (real click path) ---
+
+pytestmark = pytest.mark.features("cookie-consent")
+
+def test_cookie_banner_accept(browser, browser_context_args, base_url):
+    """
+    Test Scenario: Verify the cookie banner appears for a new visitor and "Aceite tudo" works.
+    Every other test starts with the consent pre-seeded, so this is the only one that clicks the real banner.
+
+    Steps:
+    1. Open the homepage in a context WITHOUT the pre-seeded consent.
+    2. Verify the banner's "Aceite tudo" button is visible.
+    3. Click it and verify the banner disappears.
+    4. Verify the consent cookie was stored.
+    """
+
+    # 1. New visitor: same viewport, but no storage state
+    context_args = {key: value for key, value in browser_context_args.items() if key != "storage_state"}
+    context = browser.new_context(**context_args)
+
+    try:
+        page = context.new_page()
+        page.goto(base_url)
+
+        # 2. Banner visible
+        cookie_button = page.get_by_role("button", name="Aceite tudo")
+        expect(cookie_button).to_be_visible()
+
+        # 3. Accept and verify it hides
+        cookie_button.click()
+        expect(cookie_button).to_be_hidden()
+
+        # 4. Consent cookie stored
+        cookie_names = [cookie["name"] for cookie in context.cookies()]
+        assert "cookieyes-consent" in cookie_names, f"Consent cookie not found. Cookies: {cookie_names}"
+    finally:
+        context.close()
@@ -1,58 +1,31 @@
 import pytest
-import re
 from playwright.sync_api import Page, expect
 
+from palato_qa import specs
+
+# Title, navigation links (name -> expected href part), social and legal links: specs/01_homepage_sanity.md, '## Checks'.
+HOMEPAGE = specs.spec_page("01_homepage_sanity.md")
+
 # --- Test -> Homepage Sanity Check ---
 
+pytestmark = [pytest.mark.covered_by_manifest, pytest.mark.smoke, pytest.mark.features("homepage", "header", "footer")]
+
 def test_homepage_sanity(page: Page, base_url, layout):
     """
     Verifies that the homepage loads correctly and key elements are visible and functional.
     Scope: Title, Header, Hero CTA, Footer (Social & Legal).
     """
 
-    # 1. Load Homepage & Basic Validation
+    # 1. Load Homepage
     page.goto(base_url)
     
-    # Immediate check to ensure the correct page loaded.
-    # We use re.compile to match "Palato Digital" anywhere in the title.
-    # This makes the test robust against small changes like "Página Principal - Palato Digital".
-    expect(page).to_have_title(re.compile("Palato Digital"))
-    
     # 2. Cookie Banner Handling -> Handled by 'layout' fixture automatically
 
-    # 3. Header Verification
-    
-    # Standard Header Verification (Logo + Menu)
-    layout.verify_header()
-
-    # --- NAVIGATION CHECKS ---
-    
-    # 3.1 Links pointing to OTHER pages (External or Sub-pages)
-    nav_pages = {
-        "Serviços": "/servicos/",
-        "Sobre": "/sobre/",
-        "Vamos falar": "/contacto/"
-    }
-
-    for name, href_part in nav_pages.items():
-        # UPDATE: Changed to exact=False to be less strict 
-        # (accepts "SERVIÇOS", " Serviços ", etc.)
-        link = page.get_by_role("link", name=name, exact=False).first
-        
-        expect(link).to_be_visible()
-        # Verify if the URL contains the specific part
-        expect(link).to_have_attribute("href", re.compile(f".*{href_part}"))
-
-    # 3.2 Portfolio Link (Internal / Homepage Section)
-    # We verify if the link points to the root "/" or an anchor "#"
-    
-    # UPDATE: exact=False here too!
-    portfolio_link = page.get_by_role("link", name="Portfólio", exact=False).first
-    
-    expect(portfolio_link).to_be_visible()
-    
-    # Regex accepts: "https://palatodigital.com/" or "https://palatodigital.com/#portfolio"
-    expect(portfolio_link).to_have_attribute("href", re.compile(r".*(/|#.*)$"))
+    # 3. The spec's checks: the title ("Palato Digital" anywhere in it), the header (Logo + Menu),
+    # the navigation links in one batch (visible, partial name match, href containing the expected part,
+    # e.g. the Portfolio link pointing to the root "/" or an anchor "#"), the footer,
+    # the social media links and the legal links.
+    specs.verify_page(HOMEPAGE, page, layout)
 
     # 4. Body CTA Verification
     cta_heading_text = "Tem um projeto em mente?"
@@ -84,29 +57,4 @@ def test_homepage_sanity(page: Page, base_url, layout):
                     break
         
         if not found_body_cta:
-            pytest.fail("No visible 'Vamos falar' button found in the CTA section.")
-
-    # 5. Footer Verification
-    layout.verify_footer()
-
-    # Social Media Links
-    social_networks = ["Instagram", "Facebook", "LinkedIn", "Behance"]
-    
-    for social in social_networks:
-        social_link = page.get_by_role("link", name=social, exact=False)
-        
-        # Fallback if accessible name is not found
-        if not social_link.count():
-             social_link = page.locator(f"a[href*='{social.lower()}']")
-        expect(social_link.first).to_be_visible()
-
-    # Legal Links
-    legal_links = [
-        "Politica de Privacidade",
-        "Politica de Cookies",
-        "Termos e Condições"
-    ]
-
-    for legal in legal_links:
-        link = page.get_by_role("link", name=legal)
-        expect(link).to_be_visible()
\ No newline at end of file
+            pytest.fail("No visible 'Vamos falar' button found in the CTA section.")
\ No newline at end of file
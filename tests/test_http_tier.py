@@ -0,0 +1,76 @@
+import re
+
+import pytest
+
+from palato_qa import specs
+from palato_qa.site import HEADER_NAV_LINKS
+
+# --- HTTP-only Tier: static-content checks on the server-rendered HTML ---
+# Only runs with 'pytest --tier=http' (or '--tier=all'). No browser is started.
+# The checks come from the '## Checks' sections of specs/*.md (the same data as the browser tests).
+# Format: {path: checks}, where checks are the arguments of HttpPage.find_missing:
+#   status, title (regex), message (regex, heading or title), headings, links ({name: href regex or None}), hrefs, texts, ids
+
+# Every page: header menu and footer wrapper
+LAYOUT = {
+    "links": {name: None for name in HEADER_NAV_LINKS},
+    "ids": ["footer-outer"],
+}
+
+# Server-rendered content that only this tier checks (the browser test only checks it when it is visible).
+HTTP_ONLY = {
+    "/": {"texts": ["Tem um projeto em mente?"]},
+}
+
+
+def http_checks(spec_page):
+    """The checks of a spec page that can be read from the HTML (no visibility, no social icons)."""
+    extra = HTTP_ONLY.get(spec_page["path"], {})
+    return {
+        **LAYOUT,
+        "status": specs.status_of(spec_page),
+        "title": title_pattern(spec_page),
+        # Any of the messages, in a heading or the title (like the browser check)
+        "message": "|".join(specs.values(spec_page, "message")) or None,
+        "headings": specs.values(spec_page, "headings"),
+        "links": {**LAYOUT["links"], **specs.link_patterns(specs.values(spec_page, "links"))},
+        # A link to the exact URL, whatever its name
+        "hrefs": [f"^{re.escape(href)}/?$" for href in specs.values(spec_page, "link-href")],
+        "texts": specs.values(spec_page, "texts") + extra.get("texts", []),
+    }
+
+
+def title_pattern(spec_page):
+    """The page title regex: every expected title part."""
+    titles = [re.escape(title) for title in specs.values(spec_page, "title")]
+    if len(titles) > 1:
+        return "".join(f"(?=.*{title})" for title in titles)
+    return titles[0] if titles else None
+
+
+# Several sections of the same URL are merged into one page, so none of their checks is lost.
+HTTP_CHECKS = {
+    path: http_checks(specs.merge_pages(sections))
+    for path, sections in specs.pages_by_path(specs.spec_pages()).items()
+}
+
+
+@pytest.fixture(scope="module")
+def http_pages(http_client, base_url):
+    """All the pages of this module, fetched concurrently once."""
+    return http_client.fetch_all(f"{base_url}{path}" for path in HTTP_CHECKS)
+
+
+@pytest.mark.http_tier
+@pytest.mark.smoke
+@pytest.mark.parametrize("path", list(HTTP_CHECKS))
+def test_http_content(request, http_pages, base_url, path):
+    """Verifies the server-rendered content of one page and reports every missing item at once."""
+    page = http_pages[f"{base_url}{path}"]
+
+    # The links of the page go to the link-checking stage (--check-links)
+    if request.config.getoption("--check-links"):
+        request.node.user_properties.append(("links", page.absolute_links()))
+    missing = page.find_missing(**HTTP_CHECKS[path])
+
+    assert not missing, f"{len(missing)} item(s) missing on {page.url}:\n  - " + "\n  - ".join(missing)
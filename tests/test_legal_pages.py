@@ -2,50 +2,22 @@ import pytest
 import re
 from playwright.sync_api import Page, expect
 
-# Data for Parametrization
-# Format: (path_suffix, title_text, list_of_sections_to_verify)
-LEGAL_PAGES = [
-    (
-        "/politica-de-privacidade/", 
-        "Política de Privacidade", 
-        [
-            "Informações que Recolhemos",
-            "Finalidade da Utilização dos Dados",
-            "Direito dos Utilizadores",
-            "Contacto sobre a Política de Privacidade"
-        ]
-    ),
-    (
-        "/politica-de-cookies/", 
-        "Política de Cookies", 
-        [
-            "O que são Cookies?",
-            "Como Utilizamos os Cookies?"
-            # "Declaração de cookies" -> Excluded to avoid flakiness (rendering issues)
-        ]
-    ),
-    (
-        "/termos-e-condicoes-de-uso/", 
-        "Termos e Condições do Palato Digital", 
-        [
-            "1. Aceitação dos Termos",
-            "2. Direitos de Propriedade Intelectual",
-            "3. Uso Correto do Website",
-            "4. Limitação de Responsabilidade",
-            "5. Ligações para Websites de Terceiros",
-            "6. Lei Aplicável e Foro",
-            "7. Alterações a estes Termos",
-            "8. Contacto"
-        ]
-    )
-]
+from palato_qa import specs
 
-@pytest.mark.parametrize("path_suffix, title_text, sections", LEGAL_PAGES)
-def test_legal_page_content(page: Page, base_url, layout, path_suffix, title_text, sections):
+# Data for Parametrization: the pages in the '## Checks' of the legal specs.
+# The Cookie Policy spec leaves out the footer (known rendering issue) and "Declaração de cookies" (flaky).
+LEGAL_SPECS = ["07_privacy_policy_spec.md", "05_cookie_policy_spec.md", "08_terms_conditions_spec.md"]
+LEGAL_PAGES = [page for name in LEGAL_SPECS for page in specs.spec_pages(name)]
+
+pytestmark = [pytest.mark.covered_by_manifest, pytest.mark.features("legal", "cookie-policy", "header", "footer")]
+
+@pytest.mark.parametrize("legal_page", LEGAL_PAGES, ids=lambda legal_page: legal_page["path"])
+def test_legal_page_content(page: Page, base_url, layout, legal_page):
     """
     Parametrized test to verify content and layout of all legal pages.
     """
     # 1. Navigation
+    path_suffix = legal_page["path"]
     target_url = f"{base_url}{path_suffix}"
     page.goto(target_url)
     page.wait_for_load_state("domcontentloaded")
@@ -56,23 +28,7 @@ def test_legal_page_content(page: Page, base_url, layout, path_suffix, title_tex
     regex_pattern = f"{re.escape(path_suffix.rstrip('/'))}/?$"
     expect(page).to_have_url(re.compile(regex_pattern))
 
-    # 2. Verify Page Title
-    # Using heading role which is best practice
-    expect(page.get_by_role("heading", name=title_text, exact=False).first).to_be_visible()
-
-    # 3. Verify Key Sections
-    for section in sections:
-        section_locator = page.get_by_role("heading", name=section, exact=False).first
-        
-        # Special handling for Cookies Declaration which is deep in the page
-        if "Declaração de cookies" in section:
-             section_locator.scroll_into_view_if_needed()
-        
-        expect(section_locator).to_be_visible()
-
-    # 4. Verify Layout (Header & Footer)
-    layout.verify_header()
-    
-    # Special Skip: Footer check is disabled for Cookie Policy due to known rendering issue
-    if "cookies" not in path_suffix:
-        layout.verify_footer()
+    # 2. Verify Page Title, 3. Key Sections and 4. Layout (Header & Footer)
+    # All headings are checked in one batch, and every missing one is reported.
+    # The footer is only checked where the spec lists it.
+    specs.verify_page(legal_page, page, layout)
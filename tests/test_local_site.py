@@ -0,0 +1,66 @@
+import json
+import urllib.error
+import urllib.request
+from urllib.parse import urlencode
+
+import pytest
+
+# --- Test -> Local Stand-in Site (used by --env=local) ---
+
+SITE_PAGES = [
+    "/",
+    "/servicos/",
+    "/sobre/",
+    "/contacto/",
+    "/politica-de-privacidade/",
+    "/politica-de-cookies/",
+    "/termos-e-condicoes-de-uso/",
+    "/portfolio/patinhasyes/",
+    "/portfolio/alcmena/",
+]
+
+
+def fetch(url, data=None):
+    """Returns (status, body) without raising on 4xx/5xx."""
+    try:
+        with urllib.request.urlopen(url, data=data, timeout=5) as response:
+            return response.status, response.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode("utf-8")
+
+
+@pytest.mark.parametrize("path", SITE_PAGES)
+def test_local_site_serves_page(local_site, path):
+    """Every page covered by the specs is served with the shared header and footer."""
+    status, body = fetch(f"{local_site.url}{path}")
+
+    assert status == 200
+    assert 'alt="Palato Digital"' in body
+    assert 'id="footer-outer"' in body
+
+
+def test_local_site_not_found(local_site):
+    """Unknown URLs get the 404 page (status and message), like WordPress."""
+    status, body = fetch(f"{local_site.url}/pagina-que-nao-existe-12345")
+
+    assert status == 404
+    assert "Página não encontrada" in body
+
+
+def test_local_site_contact_form_stub(local_site):
+    """The Contact Form 7 stub validates required fields and keeps the submission in memory."""
+    endpoint = f"{local_site.url}/wp-json/contact-form-7/v1/contact-forms/6/feedback"
+    fields = {
+        "your-name": "Automated Test Playwright",
+        "your-email": "automacao_palato@mailinator.com",
+        "your-message": "Local stub test.",
+        "acceptance-policies": "1",
+    }
+
+    status, body = fetch(endpoint, data=urlencode(fields).encode("utf-8"))
+    assert status == 200
+    assert json.loads(body)["status"] == "mail_sent"
+    assert local_site.submissions[-1]["your-name"] == "Automated Test Playwright"
+
+    status, body = fetch(endpoint, data=urlencode({"your-name": "Incomplete"}).encode("utf-8"))
+    assert json.loads(body)["status"] == "validation_failed"
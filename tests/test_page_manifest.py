@@ -0,0 +1,30 @@
+import pytest
+
+from palato_qa import specs
+from palato_qa.manifest import manifest_params
+
+# --- Page Manifest: every read-only check, grouped by URL ---
+# Only runs with 'pytest --manifest' (it replaces the tests marked 'covered_by_manifest').
+# Each check is a separate test item, but all the checks of a URL share one page load.
+# The checks are the '## Checks' sections of specs/*.md (the same data as the classic tests).
+# The page's HTTP status (the spec's 'status', e.g. 404) is checked on the item that loads it.
+# Format: {path: [(check_name, check(page, layout)), ...]}
+
+MANIFEST = {}
+
+for spec_page in specs.spec_pages():
+    MANIFEST.setdefault(spec_page["path"], []).extend(
+        (name, lambda page, layout, check=check: specs.run_check(check, page, layout))
+        for name, check in specs.page_checks(spec_page)
+    )
+
+# Features of the specs, smoke for the homepage, and the page's status and budget (checked on the item that loads it).
+# Several sections of the same URL add up their marks.
+PAGE_MARKS = specs.path_marks(specs.spec_pages())
+
+
+@pytest.mark.page_manifest
+@pytest.mark.parametrize("path, check", manifest_params(MANIFEST, PAGE_MARKS.get))
+def test_page_check(shared_page, shared_layout, path, check):
+    """Runs one check of the manifest against the shared page of its URL."""
+    check(shared_page, shared_layout)
@@ -2,30 +2,27 @@ import pytest
 import re
 from playwright.sync_api import Page, expect
 
-# Data for Portfolio Projects
-# Format: (project_slug, project_title, expected_subsections, website_url)
+from palato_qa import specs
+
+# Data for Portfolio Projects: one row per project in specs/06_portfolio_projects_spec.md
+# (project slug, title, website), with the checks of its '## Checks' section.
+# Project pages are image galleries, so the spec gives them a transfer and request budget.
 PORTFOLIO_PROJECTS = [
-    (
-        "patinhasyes", 
-        "PatinhasYes", 
-        ["O que fizemos", "Tipo de negócio", "Website", "Descrição"],
-        "https://patinhasyes.pt"
-    ),
-    (
-        "alcmena", 
-        "Alcmena", 
-        ["O que fizemos", "Tipo de negócio", "Website", "Descrição"],
-        "https://alcmena.pt"
-    )
+    pytest.param(project, id=project["row"]["slug"], marks=specs.budget_marks(project))
+    for project in specs.spec_pages("06_portfolio_projects_spec.md")
 ]
 
-@pytest.mark.parametrize("project_slug, project_title, expected_subsections, website_url", PORTFOLIO_PROJECTS)
-def test_portfolio_project_content(page: Page, base_url, layout, project_slug, project_title, expected_subsections, website_url):
+pytestmark = [pytest.mark.covered_by_manifest, pytest.mark.features("portfolio", "header", "footer")]
+
+@pytest.mark.parametrize("project", PORTFOLIO_PROJECTS)
+def test_portfolio_project_content(page: Page, base_url, layout, project):
     """
     Parametrized test to verify the content and layout of Portfolio Project pages.
     """
+    project_slug, project_title = project["row"]["slug"], project["row"]["title"]
+
     # 1. Navigation
-    target_url = f"{base_url}/portfolio/{project_slug}/"
+    target_url = f"{base_url}{project['path']}"
     page.goto(target_url)
     page.wait_for_load_state("domcontentloaded")
     
@@ -36,22 +33,6 @@ def test_portfolio_project_content(page: Page, base_url, layout, project_slug, p
     # The project name should be the main heading
     expect(page.get_by_role("heading", name=project_title, exact=True).first).to_be_visible()
 
-    # 3. Verify Key Subsections (H5)
-    for section in expected_subsections:
-        expect(page.get_by_role("heading", name=section, exact=False).first).to_be_visible()
-
-    # 4. Verify External Website Link
-    if website_url:
-        # We look for a link that matches the website URL
-        # Often labeled as the project name or "Website"
-        project_link = page.get_by_role("link", name=re.compile(r"Alcmena\.pt|PatinhasYes", re.IGNORECASE))
-        # Ensure at least one link pointing to the external site exists and is visible
-        external_link = page.locator(f"a[href='{website_url}']").first
-        expect(external_link).to_be_visible()
-
-    # 5. Verify Layout (Header & Footer)
-    layout.verify_header()
-    layout.verify_footer()
-
-    # 6. Verify "Explore mais" Section existence
-    expect(page.get_by_text("Explore mais", exact=False).first).to_be_visible()
+    # 3. Key Subsections (H5), 4. External Website Link, 5. Layout (Header & Footer)
+    # and 6. the "Explore mais" Section, as listed in the spec
+    specs.verify_page(project, page, layout)
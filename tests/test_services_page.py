@@ -2,8 +2,15 @@ import pytest
 import re
 from playwright.sync_api import Page, expect
 
+from palato_qa import specs
+
+# The content of the page (the 5 core services, ...) comes from the spec: specs/02_services_navigation.md, '## Checks'.
+SERVICES_PAGE = specs.spec_page("02_services_navigation.md")
+
 # --- Test -> Services Page Navigation ---
 
+pytestmark = [pytest.mark.covered_by_manifest, pytest.mark.features("services", "header", "footer")]
+
 def test_services_page_navigation(page: Page, base_url, layout):
     """
     Test Scenario: Verify navigation to the Services page and check its key content.
@@ -27,33 +34,10 @@ def test_services_page_navigation(page: Page, base_url, layout):
     # 3. Verify URL Check
     expect(page).to_have_url(re.compile(r".*/servicos/"))
 
-    # 4. Verify Headings
-    # 4.1 Main Heading (H1) -> 'Serviços'
+    # 4. Verify the Main Heading (H1) -> exactly 'Serviços'
     expect(page.get_by_role("heading", name="Serviços", exact=True)).to_be_visible()
 
-    # 4.2 Sub-heading -> 'O que fazemos'
-    # Inspecting the live site, this text is usually a span or a small heading above the simple H1.
-    # We use get_by_text for specific content verification.
-    expect(page.get_by_text("O que fazemos")).to_be_visible()
-
-    # 5. Verify All Service Cards
-    # We verify the presence of all 5 core services listed on the page.
-    services = [
-        "Estratégia e inovação digital",
-        "Identidade e design da marca",
-        "Desenvolvimento Web",
-        "Alojamento e domínios",
-        "Suporte e manutenção contínuos"
-    ]
-
-    for service in services:
-        # Using exact=False to handle potential icons or extra whitespace
-        expect(page.get_by_role("heading", name=service, exact=False).first).to_be_visible()
-
-    # 6. Verify Layout (Header & Footer)
-    # Header: Check for Logo and Menu
-    layout.verify_header()
-
-    # Footer: Check for a unique footer element or link
-    # Using 'contentinfo' role which usually maps to the <footer> tag
-    layout.verify_footer()
+    # 5. Verify All Service Cards, the 'O que fazemos' sub-heading and 6. Layout (Header & Footer)
+    # The spec's headings (all 5 core services), texts, header and footer.
+    # All headings are checked in one batch (partial match handles icons or extra whitespace)
+    specs.verify_page(SERVICES_PAGE, page, layout)